@@ -0,0 +1,4 @@
+"""
+Benchmarks for the maze engine
+Each module can be run on its own with python -m benchmarks.<module>
+"""
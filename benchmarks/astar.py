@@ -0,0 +1,70 @@
+"""
+Benchmarks route_astar on mazes of increasing size
+Run with python -m benchmarks.astar
+"""
+import time
+
+from src.Maze.maze import Maze, distance, manhattan
+
+DIMS = (10, 20, 50, 100, 200, 500)
+HEURISTICS = {"euclidean": distance, "manhattan": manhattan}
+
+
+def serpentine_maze(dim):
+    """
+    Builds a maze whose only route snakes through every other row, which forces
+    the search to expand close to half of the maze
+    @param dim: Dimension of the maze
+    """
+    maze = Maze("benchmark", dim, 0)
+    for row in range(1, dim, 2):
+        # Leave a gap in the wall, alternating between the right and left side
+        gap = dim - 1 if row % 4 == 1 else 0
+        for col in range(dim):
+            if col != gap:
+                maze.grid[row][col] = 1
+    maze.end = (dim - 1 if dim % 2 == 1 else dim - 2, dim - 1)
+    return maze
+
+
+def run(dims=DIMS):
+    """
+    Solves a serpentine maze of each dimension with each heuristic
+    @param dims: Maze dimensions to benchmark
+    @return: List of result rows as dicts
+    """
+    rows = []
+    for dim in dims:
+        maze = serpentine_maze(dim)
+        for name, heuristic in HEURISTICS.items():
+            state = {"nodes": [], "node_from": {}, "g_score": {}, "f_score": {}}
+            begin = time.perf_counter()
+            found = maze.route_astar(
+                maze.start, maze.end, search_path=True, state=state, heuristic=heuristic
+            )
+            elapsed = time.perf_counter() - begin
+            expanded = len(state["closed"])
+            rows.append(
+                {
+                    "dim": dim,
+                    "heuristic": name,
+                    "found": found,
+                    "expanded": expanded,
+                    "seconds": elapsed,
+                    "expansions_per_sec": expanded / elapsed,
+                }
+            )
+    return rows
+
+
+def main():
+    print(f"{'dim':>6} {'heuristic':>10} {'expanded':>10} {'seconds':>9} {'exp/s':>10}")
+    for row in run():
+        print(
+            f"{row['dim']:>6} {row['heuristic']:>10} {row['expanded']:>10} "
+            f"{row['seconds']:>9.4f} {row['expansions_per_sec']:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmarks listing a library of saved mazes with and without the catalog
+Run with python -m benchmarks.catalog
+"""
+import os
+import tempfile
+import time
+
+from src.Maze import maze_file
+from src.Maze.catalog import MazeCatalog
+from src.Maze.maze import Maze
+
+COUNTS = (100, 1000, 3000)
+DIM = 50
+
+
+def scan(directory):
+    """
+    Lists the library the way it was done before the catalog, one file at a time
+    @param directory: Directory of .maze files
+    """
+    names = {}
+    for filename in os.listdir(directory):
+        filename = os.path.join(directory, filename)
+        if filename.endswith(".maze"):
+            names[maze_file.read_header(filename).name] = filename
+    return names
+
+
+def run(counts=COUNTS, dim=DIM):
+    """
+    Times listing libraries of edited mazes by reading every file, by building
+    the catalog, and by refreshing a catalog where nothing changed
+    @param counts: Library sizes to benchmark
+    @param dim: Dimension of every maze
+    @return: List of result rows as dicts
+    """
+    rows = []
+    maze = Maze("benchmark", dim, 0)
+    maze.grid[0, 1] = 1
+    for count in counts:
+        with tempfile.TemporaryDirectory() as root:
+            # The catalog goes beside the mazes, so both are in root
+            directory = os.path.join(root, "mazes")
+            os.mkdir(directory)
+            for number in range(count):
+                maze.name = f"benchmark {number}"
+                maze.save_to_file(filename=os.path.join(directory, f"{number}.maze"))
+            library = MazeCatalog(directory)
+            listings = {
+                "scan": lambda: scan(directory),
+                "catalog build": lambda: (library.refresh(), library.names()),
+                "catalog refresh": lambda: (library.refresh(), library.names()),
+            }
+            for name, listing in listings.items():
+                begin = time.perf_counter()
+                listing()
+                elapsed = time.perf_counter() - begin
+                rows.append({"count": count, "listing": name, "seconds": elapsed})
+            library.close()
+    return rows
+
+
+def main():
+    print(f"{'count':>6} {'listing':>16} {'seconds':>9}")
+    for row in run():
+        print(f"{row['count']:>6} {row['listing']:>16} {row['seconds']:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmarks checking that a maze is solvable after every edit, with the
+connectivity kept up to date through the edits against searching again
+Run with python -m benchmarks.connectivity
+"""
+import random
+import time
+
+from src.Maze.maze import Maze
+
+DIMS = (100, 300, 1000)
+EDITS = 200
+
+
+def run(dims=DIMS, edits=EDITS, seed=0):
+    """
+    Times random wall and path edits each followed by a solvability check,
+    once through the connectivity and once with a fresh distance field
+    @param dims: Maze dimensions to benchmark
+    @param edits: Number of random edits
+    @param seed: Seed for the maze and the edits
+    @return: List of result rows as dicts
+    """
+    rows = []
+    rng = random.Random(seed)
+    for dim in dims:
+        original = Maze("benchmark", dim, 0)
+        original.randomize("backtracker", seed=seed)
+        changes = [
+            ((rng.randrange(dim), rng.randrange(dim)), rng.choice((0, 1)))
+            for _ in range(edits)
+        ]
+        for method in ("connectivity", "search"):
+            maze = original.copy()
+            maze.is_solvable()
+            begin = time.perf_counter()
+            for node, value in changes:
+                if method == "connectivity":
+                    maze.set_node(node, value)
+                    maze.is_solvable()
+                else:
+                    maze.grid[node] = value
+                    maze.distance_field().distance(maze.start)
+            elapsed = time.perf_counter() - begin
+            rows.append(
+                {
+                    "dim": dim,
+                    "method": method,
+                    "usec_per_edit": elapsed / edits * 1e6,
+                    "rebuilds": maze.connectivity().rebuilds
+                    if method == "connectivity"
+                    else edits,
+                }
+            )
+    return rows
+
+
+def main():
+    print(f"{'dim':>6} {'method':>13} {'usec/edit':>12} {'rebuilds':>9}")
+    for row in run():
+        print(
+            f"{row['dim']:>6} {row['method']:>13} {row['usec_per_edit']:>12.1f} "
+            f"{row['rebuilds']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmarks solvability and hint queries with the distance field against A*
+Run with python -m benchmarks.distance_field
+"""
+import random
+import time
+
+from src.Maze.maze import Maze
+
+DIMS = (100, 500, 1000)
+QUERIES = 100
+
+
+def run(dims=DIMS, queries=QUERIES, seed=0):
+    """
+    Times building the distance field once, then answering how far random
+    nodes are from the end with the field and with one A* search per query
+    @param dims: Maze dimensions to benchmark
+    @param queries: Number of random nodes to query
+    @param seed: Seed for the maze and the nodes
+    @return: List of result rows as dicts
+    """
+    rows = []
+    rng = random.Random(seed)
+    for dim in dims:
+        maze = Maze("benchmark", dim, 0)
+        maze.randomize("backtracker", seed=seed)
+        nodes = [(rng.randrange(dim), rng.randrange(dim)) for _ in range(queries)]
+        begin = time.perf_counter()
+        field = maze.distance_field()
+        built = time.perf_counter()
+        for node in nodes:
+            field.distance(node)
+            field.next_step(node)
+        queried = time.perf_counter()
+        rows.append(
+            {
+                "dim": dim,
+                "method": "field",
+                "build_seconds": built - begin,
+                "usec_per_query": (queried - built) / queries * 1e6,
+            }
+        )
+        # A* is slow enough on big mazes that a few queries make the point
+        astar_nodes = nodes[: max(1, queries // 10)]
+        begin = time.perf_counter()
+        for node in astar_nodes:
+            maze.route_astar(node, maze.end, search_path=True)
+        elapsed = time.perf_counter() - begin
+        rows.append(
+            {
+                "dim": dim,
+                "method": "astar",
+                "build_seconds": 0.0,
+                "usec_per_query": elapsed / len(astar_nodes) * 1e6,
+            }
+        )
+    return rows
+
+
+def main():
+    print(f"{'dim':>6} {'method':>8} {'build s':>9} {'usec/query':>12}")
+    for row in run():
+        print(
+            f"{row['dim']:>6} {row['method']:>8} {row['build_seconds']:>9.3f} "
+            f"{row['usec_per_query']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
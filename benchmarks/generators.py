@@ -0,0 +1,52 @@
+"""
+Benchmarks every registered maze generator in cells generated per second
+Run with python -m benchmarks.generators
+"""
+import time
+
+from src.Maze.generators import GENERATORS
+from src.Maze.maze import Maze
+
+DIMS = (20, 50, 100, 200, 500)
+# The snaking generator takes far too long past this size
+SNAKING_MAX_DIM = 100
+
+
+def run(dims=DIMS, seed=0):
+    """
+    Randomizes one maze of each dimension with each generator
+    @param dims: Maze dimensions to benchmark
+    @param seed: Seed to randomize with
+    @return: List of result rows as dicts
+    """
+    rows = []
+    for dim in dims:
+        for name in GENERATORS:
+            if name == "snaking" and dim > SNAKING_MAX_DIM:
+                continue
+            maze = Maze("benchmark", dim, 1)
+            begin = time.perf_counter()
+            maze.randomize(name, seed=seed)
+            elapsed = time.perf_counter() - begin
+            rows.append(
+                {
+                    "dim": dim,
+                    "generator": name,
+                    "seconds": elapsed,
+                    "cells_per_sec": dim * dim / elapsed,
+                }
+            )
+    return rows
+
+
+def main():
+    print(f"{'dim':>6} {'generator':>12} {'seconds':>9} {'cells/s':>10}")
+    for row in run():
+        print(
+            f"{row['dim']:>6} {row['generator']:>12} {row['seconds']:>9.3f} "
+            f"{row['cells_per_sec']:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
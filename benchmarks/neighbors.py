@@ -0,0 +1,100 @@
+"""
+Benchmarks Maze.get_neighbors against the original recursive implementation
+Run with python -m benchmarks.neighbors
+"""
+import random
+import time
+
+from src.Maze.maze import Maze
+
+DIMS = (20, 100, 500)
+CALLS = 20000
+
+
+def legacy_get_neighbors(maze, row, col, path=False):
+    """
+    The original get_neighbors, which calls itself for every candidate neighbor
+    """
+    neighbors = set()
+    delta = ((-1, 0), (0, -1), (0, 1), (1, 0))
+    for d in delta:
+        if 0 <= row + d[0] < maze.dim and 0 <= col + d[1] < maze.dim:
+            neighbor = (row + d[0], col + d[1])
+            neighbor_value = maze.grid[neighbor[0]][neighbor[1]]
+            if path:
+                if neighbor_value == 0 or neighbor_value == 2:
+                    neighbors.add(neighbor)
+            else:
+                path_neighbors_of_neighbor = legacy_get_neighbors(
+                    maze, neighbor[0], neighbor[1], path=True
+                )
+                path_neighbors_of_neighbor = set(
+                    filter(lambda node: node != (row, col), path_neighbors_of_neighbor)
+                )
+                if len(path_neighbors_of_neighbor) == 0 and neighbor_value == 1:
+                    neighbors.add(neighbor)
+    return neighbors
+
+
+def run(dims=DIMS, calls=CALLS, seed=0):
+    """
+    Times get_neighbors calls on random nodes of a randomized maze
+    @param dims: Maze dimensions to benchmark
+    @param calls: Number of calls to time for each implementation
+    @param seed: Seed for the maze and the nodes to look up
+    @return: List of result rows as dicts
+    """
+    rows = []
+    rng = random.Random(seed)
+    for dim in dims:
+        maze = Maze("benchmark", dim, 0)
+        maze.randomize("backtracker", seed=seed)
+        nodes = [(rng.randrange(dim), rng.randrange(dim)) for _ in range(calls)]
+        implementations = {
+            "legacy": lambda node, path: legacy_get_neighbors(
+                maze, node[0], node[1], path
+            ),
+            "table": lambda node, path: maze.get_neighbors(node[0], node[1], path),
+        }
+        for path in (True, False):
+            for name, get_neighbors in implementations.items():
+                begin = time.perf_counter()
+                for node in nodes:
+                    get_neighbors(node, path)
+                elapsed = time.perf_counter() - begin
+                rows.append(
+                    {
+                        "dim": dim,
+                        "path": path,
+                        "implementation": name,
+                        "usec_per_call": elapsed / calls * 1e6,
+                    }
+                )
+            if not path:
+                # The flat index batch API, which skips building node tuples
+                indices = [node[0] * dim + node[1] for node in nodes]
+                begin = time.perf_counter()
+                maze.grid.frontier_batch(indices)
+                elapsed = time.perf_counter() - begin
+                rows.append(
+                    {
+                        "dim": dim,
+                        "path": path,
+                        "implementation": "batch",
+                        "usec_per_call": elapsed / calls * 1e6,
+                    }
+                )
+    return rows
+
+
+def main():
+    print(f"{'dim':>6} {'path':>6} {'implementation':>15} {'usec/call':>10}")
+    for row in run():
+        print(
+            f"{row['dim']:>6} {str(row['path']):>6} {row['implementation']:>15} "
+            f"{row['usec_per_call']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
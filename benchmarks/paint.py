@@ -0,0 +1,83 @@
+"""
+Benchmarks painting a maze after editing one node, drawing just the edited
+area against drawing the whole drawer, as a full redraw after loading,
+resizing or randomizing would, and drawing the whole drawer after panning the
+view a little, as dragging with the middle button does
+Run with python -m benchmarks.paint
+"""
+import os
+import random
+import time
+
+DIMS = (20, 100, 500, 2000, 5000)
+EDITS = 100
+# Size of the drawer in pixels, bigger mazes get a pixel per node and only
+# part of them is in view
+SIZE = 800
+# Pixels the view moves by for every pan
+PAN = 16
+
+
+def run(dims=DIMS, edits=EDITS, seed=0):
+    """
+    Times random edits each followed by painting the drawer, offscreen
+    @param dims: Maze dimensions to benchmark
+    @param edits: Number of random edits
+    @param seed: Seed for the maze and the edits
+    @return: List of result rows as dicts
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtGui import QImage, QRegion
+    from PyQt6.QtWidgets import QApplication
+
+    from src.GUI.Components.maze_drawer import MazeDrawer
+    from src.Maze.maze import Maze
+
+    app = QApplication.instance() or QApplication([])
+    rows = []
+    rng = random.Random(seed)
+    drawer = MazeDrawer()
+    drawer.setFixedSize(SIZE, SIZE)
+    image = QImage(SIZE, SIZE, QImage.Format.Format_ARGB32)
+    for dim in dims:
+        maze = Maze("benchmark", dim, 0)
+        maze.randomize("prim", seed=seed)
+        drawer.set_maze(maze)
+        drawer.render(image)
+        # Edit nodes in view, since those are the ones that can be clicked
+        shown = min(dim, SIZE // drawer.grid_dim)
+        nodes = [(rng.randrange(shown), rng.randrange(shown)) for _ in range(edits)]
+        for method in ("dirty", "full", "pan"):
+            begin = time.perf_counter()
+            for row, col in nodes:
+                index = row * dim + col
+                maze.grid.set(index, 1 - min(maze.grid.cells[index], 1))
+                if method == "dirty":
+                    # The same as a click, which repaints the node's area and
+                    # the minimap if there is one
+                    drawer.update_cells([index])
+                    area = QRegion(drawer.cells_rect([index]))
+                    if drawer.minimap_rect() is not None:
+                        area = area.united(drawer.minimap_rect())
+                    drawer.render(image, area.boundingRect().topLeft(), area)
+                elif method == "full":
+                    drawer.render(image)
+                else:
+                    drawer.move_view(drawer.offset_x + PAN, drawer.offset_y + PAN)
+                    drawer.render(image)
+            elapsed = time.perf_counter() - begin
+            rows.append(
+                {"dim": dim, "method": method, "ms_per_edit": elapsed / edits * 1e3}
+            )
+    app.processEvents()
+    return rows
+
+
+def main():
+    print(f"{'dim':>6} {'method':>7} {'ms/edit':>9}")
+    for row in run():
+        print(f"{row['dim']:>6} {row['method']:>7} {row['ms_per_edit']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
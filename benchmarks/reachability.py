@@ -0,0 +1,45 @@
+"""
+Benchmarks Maze.randomize with each reachability oracle on hard mazes
+Run with python -m benchmarks.reachability
+"""
+import time
+
+from src.Maze.maze import Maze
+from src.Maze.reachability import AStarReachability, UnionFindReachability
+
+DIMS = (20, 50, 100, 200)
+ORACLES = {"astar": AStarReachability, "union-find": UnionFindReachability}
+# The A* oracle takes minutes past this size, so it is skipped there
+ASTAR_MAX_DIM = 100
+
+
+def run(dims=DIMS, seed=0):
+    """
+    Randomizes one hard maze of each dimension with each oracle, from the same
+    random seed so that both build the exact same maze
+    @param dims: Maze dimensions to benchmark
+    @param seed: Seed to randomize with
+    @return: List of result rows as dicts
+    """
+    rows = []
+    for dim in dims:
+        for name, oracle in ORACLES.items():
+            if oracle is AStarReachability and dim > ASTAR_MAX_DIM:
+                continue
+            maze = Maze("benchmark", dim, 2)
+            maze.reachability_oracle = oracle
+            begin = time.perf_counter()
+            maze.randomize(seed=seed)
+            elapsed = time.perf_counter() - begin
+            rows.append({"dim": dim, "oracle": name, "seconds": elapsed})
+    return rows
+
+
+def main():
+    print(f"{'dim':>6} {'oracle':>12} {'seconds':>9}")
+    for row in run():
+        print(f"{row['dim']:>6} {row['oracle']:>12} {row['seconds']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmarks every registered solver on the same mazes
+Run with python -m benchmarks.solvers
+"""
+import time
+
+from src.Maze.maze import Maze
+from src.Maze.solvers import SOLVERS, solve
+
+DIMS = (20, 100, 300)
+GENERATORS = ("snaking", "backtracker")
+
+
+def run(dims=DIMS, generators=GENERATORS, seed=0):
+    """
+    Solves one maze of each dimension and generator with every solver
+    @param dims: Maze dimensions to benchmark
+    @param generators: Generators to make the mazes with
+    @param seed: Seed to randomize with
+    @return: List of result rows as dicts
+    """
+    rows = []
+    for dim in dims:
+        for generator in generators:
+            maze = Maze("benchmark", dim, 0)
+            maze.randomize(generator, seed=seed)
+            for name in SOLVERS:
+                begin = time.perf_counter()
+                result = solve(name, maze)
+                elapsed = time.perf_counter() - begin
+                rows.append(
+                    {
+                        "dim": dim,
+                        "generator": generator,
+                        "solver": name,
+                        "found": result.found,
+                        "length": len(result.path),
+                        "expanded": result.expanded,
+                        "max_frontier": result.max_frontier,
+                        "seconds": elapsed,
+                    }
+                )
+    return rows
+
+
+def main():
+    print(
+        f"{'dim':>5} {'generator':>12} {'solver':>14} {'length':>7} "
+        f"{'expanded':>9} {'frontier':>9} {'seconds':>8}"
+    )
+    for row in run():
+        print(
+            f"{row['dim']:>5} {row['generator']:>12} {row['solver']:>14} "
+            f"{row['length'] if row['found'] else '-':>7} {row['expanded']:>9} "
+            f"{row['max_frontier']:>9} {row['seconds']:>8.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
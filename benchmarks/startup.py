@@ -0,0 +1,105 @@
+"""
+Benchmarks startup time against the size of the maze library
+Every measurement runs in a fresh process with its own home folder, since
+imports and the library are only loaded once per process
+Run with python -m benchmarks.startup
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+LIBRARY_SIZES = (0, 1000, 5000)
+DIM = 20
+
+
+def measure(what):
+    """
+    Runs in the child process and prints the seconds one startup step took
+    @param what: "import" to import the maze module, "library" to load the
+    library on first use, or "paint" to build and paint the main window
+    """
+    begin = time.perf_counter()
+    if what == "import":
+        import src.Maze.maze  # noqa: F401
+    elif what == "library":
+        from src.Maze.maze import Maze
+
+        begin = time.perf_counter()
+        Maze.get_saved_mazes()
+    else:
+        from PyQt6.QtWidgets import QApplication
+
+        app = QApplication([])
+        begin = time.perf_counter()
+        from src.GUI.maze_gui import MazeGUI
+
+        window = MazeGUI()
+        window.show()
+        # Rendering the window to a pixmap waits for the first full paint
+        window.grab()
+        app.quit()
+    print(time.perf_counter() - begin)
+
+
+def make_library(home, size, dim=DIM):
+    """
+    Fills the saved mazes folder of a home folder with edited mazes
+    @param home: Home folder
+    @param size: Number of mazes
+    @param dim: Dimension of every maze
+    """
+    from src.Maze import maze_file
+    from src.Maze.maze import Maze
+
+    directory = os.path.join(home, ".saved_mazes")
+    os.mkdir(directory)
+    maze = Maze("benchmark", dim, 0)
+    maze.grid[0, 1] = 1
+    for number in range(size):
+        maze.name = f"benchmark {number}"
+        with open(os.path.join(directory, f"{number}.maze"), "wb") as file:
+            file.write(maze_file.encode(maze))
+
+
+def run(sizes=LIBRARY_SIZES, steps=("import", "library", "paint")):
+    """
+    Times each startup step in a fresh process for every library size
+    A step that can't run here, such as paint without PyQt, is left out
+    @param sizes: Numbers of saved mazes to benchmark
+    @param steps: Startup steps to time, see measure
+    @return: List of result rows as dicts
+    """
+    rows = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as home:
+            make_library(home, size)
+            env = dict(os.environ, HOME=home)
+            env.setdefault("QT_QPA_PLATFORM", "offscreen")
+            for step in steps:
+                child = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.startup", step],
+                    env=env,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    universal_newlines=True,
+                )
+                if child.returncode != 0:
+                    continue
+                seconds = float(child.stdout.split()[-1])
+                rows.append({"library": size, "step": step, "seconds": seconds})
+    return rows
+
+
+def main():
+    print(f"{'library':>8} {'step':>8} {'seconds':>9}")
+    for row in run():
+        print(f"{row['library']:>8} {row['step']:>8} {row['seconds']:>9.4f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        measure(sys.argv[1])
+    else:
+        main()
@@ -0,0 +1,76 @@
+"""
+Benchmarks saving and loading edited mazes in the binary format against pickle
+Run with python -m benchmarks.storage
+"""
+import os
+import pickle
+import random
+import tempfile
+import time
+
+from src.Maze import maze_file
+from src.Maze.maze import Maze
+
+DIMS = (100, 500, 2000)
+
+
+def edited_maze(dim, seed):
+    """
+    Returns a randomized maze with one node changed, so it has to store its grid
+    @param dim: Maze dimension
+    @param seed: Seed to randomize with
+    """
+    maze = Maze("benchmark", dim, 0)
+    maze.randomize("backtracker", seed=seed)
+    rng = random.Random(seed)
+    node = (rng.randrange(dim), rng.randrange(dim))
+    maze.grid[node] = 1 - (maze.grid[node] & 1)
+    return maze
+
+
+def run(dims=DIMS, seed=0):
+    """
+    Times a save and a load of an edited maze of each dimension in both formats
+    @param dims: Maze dimensions to benchmark
+    @param seed: Seed to randomize with
+    @return: List of result rows as dicts
+    """
+    rows = []
+    formats = {
+        "binary": (maze_file.encode, Maze.load_from_file),
+        "pickle": (pickle.dumps, Maze.load_from_file),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for dim in dims:
+            maze = edited_maze(dim, seed)
+            for name, (encode, load) in formats.items():
+                filename = os.path.join(directory, f"{name}.maze")
+                begin = time.perf_counter()
+                with open(filename, "wb") as file:
+                    file.write(encode(maze))
+                saved = time.perf_counter()
+                load(filename)
+                loaded = time.perf_counter()
+                rows.append(
+                    {
+                        "dim": dim,
+                        "format": name,
+                        "bytes": os.path.getsize(filename),
+                        "save_seconds": saved - begin,
+                        "load_seconds": loaded - saved,
+                    }
+                )
+    return rows
+
+
+def main():
+    print(f"{'dim':>6} {'format':>8} {'bytes':>10} {'save s':>8} {'load s':>8}")
+    for row in run():
+        print(
+            f"{row['dim']:>6} {row['format']:>8} {row['bytes']:>10} "
+            f"{row['save_seconds']:>8.3f} {row['load_seconds']:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
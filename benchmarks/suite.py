@@ -0,0 +1,345 @@
+"""
+Times the hot paths of the maze engine across a sweep of dimensions, and saves
+the times as a JSON baseline or compares them against one, so a slowdown is
+caught before a release
+Run with python -m benchmarks.suite, --save baseline.json to save a baseline
+and --compare baseline.json to check against it, which exits with 1 if any
+case got slower by more than the threshold
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from src.Maze.grid import Grid
+from src.Maze.maze import Maze
+
+DIMS = (10, 50, 100, 200, 500)
+# Every case runs up to REPEAT times, stopping early once it has taken BUDGET
+# seconds, and the fastest run is kept since it has the least noise in it
+REPEAT = 5
+BUDGET = 1.0
+# A case that got this much slower than its baseline, as a fraction, fails
+THRESHOLD = 0.25
+# Cases faster than this in the baseline are too noisy to compare
+MIN_SECONDS = 1e-4
+# Random nodes looked at by each run of the neighbor cases
+NEIGHBOR_CALLS = 10000
+# Size of the drawer in pixels for the paint case
+PAINT_SIZE = 800
+
+
+def random_maze(dim, difficulty=0, seed=0):
+    """
+    Returns a maze randomized with the default generator
+    @param dim: Maze dimension
+    @param difficulty: Maze difficulty, default 0
+    @param seed: Seed to randomize with, default 0
+    """
+    maze = Maze("benchmark", dim, difficulty)
+    maze.randomize(seed=seed)
+    return maze
+
+
+def randomize_case(difficulty):
+    """
+    Returns a case timing randomizing a maze of a difficulty
+    @param difficulty: Maze difficulty
+    """
+
+    def setup(dim):
+        maze = Maze("benchmark", dim, difficulty)
+        return lambda: maze.randomize(seed=0)
+
+    return setup
+
+
+def astar_case(search_path):
+    """
+    Returns a case timing route_astar from the start to the end of a maze
+    Searching walls finds where a new path could be carved without touching
+    other paths, so it is timed on a maze of nothing but walls and its start,
+    the way a generator starts out
+    @param search_path: Whether to route through paths or through walls
+    """
+
+    def setup(dim):
+        if search_path:
+            maze = random_maze(dim)
+        else:
+            maze = Maze("benchmark", dim, 0)
+            maze.grid = Grid(dim, cells=bytes([1]) * (dim * dim))
+            maze.grid[maze.start] = 0
+        return lambda: maze.route_astar(maze.start, maze.end, search_path=search_path)
+
+    return setup
+
+
+def neighbors_case(path):
+    """
+    Returns a case timing get_neighbors on random nodes
+    @param path: Whether to look for path or wall neighbors
+    """
+
+    def setup(dim):
+        maze = random_maze(dim)
+        rng = random.Random(0)
+        nodes = [
+            (rng.randrange(dim), rng.randrange(dim)) for _ in range(NEIGHBOR_CALLS)
+        ]
+
+        def run():
+            for row, col in nodes:
+                maze.get_neighbors(row, col, path=path)
+
+        return run
+
+    return setup
+
+
+def resize_setup(dim):
+    """
+    Sets up timing a maze growing to twice its size and back
+    @param dim: Maze dimension
+    """
+    maze = random_maze(dim)
+
+    def run():
+        maze.resize(dim * 2)
+        maze.resize(dim)
+
+    return run
+
+
+def saved_maze(dim, directory):
+    """
+    Returns an edited maze, so its whole grid is saved rather than its recipe,
+    and the file to save it to
+    @param dim: Maze dimension
+    @param directory: Directory for the file
+    """
+    maze = random_maze(dim)
+    maze.grid[maze.start] = 2
+    return maze, os.path.join(directory, f"{dim}.maze")
+
+
+def save_case(directory):
+    """
+    Returns a case timing saving an edited maze to a file
+    @param directory: Directory for the files
+    """
+
+    def setup(dim):
+        maze, filename = saved_maze(dim, directory)
+        return lambda: maze.save_to_file(filename=filename)
+
+    return setup
+
+
+def load_case(directory):
+    """
+    Returns a case timing loading an edited maze from a file
+    @param directory: Directory for the files
+    """
+
+    def setup(dim):
+        maze, filename = saved_maze(dim, directory)
+        maze.save_to_file(filename=filename)
+        return lambda: Maze.load_from_file(filename)
+
+    return setup
+
+
+def paint_setup(dim):
+    """
+    Sets up timing a full paint of a maze drawer, offscreen
+    @param dim: Maze dimension
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtGui import QImage
+    from PyQt6.QtWidgets import QApplication
+
+    from src.GUI.Components.maze_drawer import MazeDrawer
+
+    # Kept on the function so the application outlives the drawers
+    paint_setup.app = QApplication.instance() or QApplication([])
+    drawer = MazeDrawer()
+    drawer.setFixedSize(PAINT_SIZE, PAINT_SIZE)
+    drawer.set_maze(random_maze(dim))
+    image = QImage(PAINT_SIZE, PAINT_SIZE, QImage.Format.Format_ARGB32)
+
+    def run():
+        # Every run draws every tile again, as after loading a maze
+        drawer.tiles.clear()
+        drawer.render(image)
+
+    return run
+
+
+def make_cases(directory):
+    """
+    Returns every case by name, each a function taking a dimension that sets
+    up the case and returns the function to time
+    @param directory: Directory for files saved by the cases
+    """
+    return {
+        "randomize-easy": randomize_case(0),
+        "randomize-medium": randomize_case(1),
+        "randomize-hard": randomize_case(2),
+        "astar-path": astar_case(True),
+        "astar-walls": astar_case(False),
+        "neighbors-path": neighbors_case(True),
+        "neighbors-walls": neighbors_case(False),
+        "resize": resize_setup,
+        "save": save_case(directory),
+        "load": load_case(directory),
+        "paint": paint_setup,
+    }
+
+
+def measure(run, repeat=REPEAT, budget=BUDGET):
+    """
+    Returns the fastest time of running a function a few times
+    @param run: Function to time
+    @param repeat: Most runs to make
+    @param budget: Seconds after which no more runs are made, there is always
+    at least one
+    """
+    best = None
+    spent = 0.0
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - begin
+        best = elapsed if best is None else min(best, elapsed)
+        spent += elapsed
+        if spent >= budget:
+            break
+    return best
+
+
+def run(dims=DIMS, cases=None, repeat=REPEAT, budget=BUDGET):
+    """
+    Times every case at every dimension
+    Cases that need something missing, like PyQt for painting, are left out
+    @param dims: Maze dimensions to benchmark
+    @param cases: Names of the cases to run, default all of them
+    @param repeat: Most runs of each case
+    @param budget: Seconds after which a case stops repeating
+    @return: List of result rows as dicts
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        all_cases = make_cases(directory)
+        for name in cases or all_cases:
+            setup = all_cases[name]
+            for dim in dims:
+                try:
+                    timed = setup(dim)
+                except ImportError as e:
+                    print(f"Skipping {name}: {e}", file=sys.stderr)
+                    break
+                rows.append(
+                    {
+                        "case": name,
+                        "dim": dim,
+                        "seconds": measure(timed, repeat, budget),
+                    }
+                )
+    return rows
+
+
+def make_baseline(rows):
+    """
+    Returns results as a baseline ready to be dumped as JSON, along with what
+    they were run on, since times from other machines can't be compared
+    @param rows: Result rows from run
+    """
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "results": {f"{row['case']}/{row['dim']}": row["seconds"] for row in rows},
+    }
+
+
+def compare(rows, baseline, threshold=THRESHOLD):
+    """
+    Compares results against a baseline
+    @param rows: Result rows from run
+    @param baseline: Baseline from make_baseline
+    @param threshold: Fraction a case can get slower by before it fails
+    @return: List of rows, each with the baseline time, the change as a fraction
+    and whether it failed, for the cases in the baseline
+    """
+    compared = []
+    for row in rows:
+        before = baseline["results"].get(f"{row['case']}/{row['dim']}")
+        if before is None:
+            continue
+        change = row["seconds"] / before - 1
+        compared.append(
+            dict(
+                row,
+                baseline=before,
+                change=change,
+                failed=before >= MIN_SECONDS and change > threshold,
+            )
+        )
+    return compared
+
+
+def main(argv=None):
+    """
+    Runs the suite
+    @param argv: Arguments to parse, defaults to sys.argv
+    @return: Exit code, 1 if any case got slower than the threshold allows
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    parser.add_argument("--dims", type=int, nargs="+", default=list(DIMS))
+    parser.add_argument("--cases", nargs="+", choices=list(make_cases(None)))
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--budget", type=float, default=BUDGET)
+    parser.add_argument("--save", metavar="FILE", help="Save the times as a baseline")
+    parser.add_argument("--compare", metavar="FILE", help="Baseline to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help="Fraction a case can get slower by, default %(default)s",
+    )
+    args = parser.parse_args(argv)
+    baseline = None
+    if args.compare:
+        # Read first, so a bad baseline fails before the suite runs
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+    rows = run(args.dims, args.cases, args.repeat, args.budget)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(make_baseline(rows), file, indent=2)
+    if baseline is None:
+        print(f"{'case':>16} {'dim':>5} {'ms':>10}")
+        for row in rows:
+            print(f"{row['case']:>16} {row['dim']:>5} {row['seconds'] * 1e3:>10.3f}")
+        return 0
+    compared = compare(rows, baseline, args.threshold)
+    print(f"{'case':>16} {'dim':>5} {'ms':>10} {'baseline':>10} {'change':>8}")
+    for row in compared:
+        print(
+            f"{row['case']:>16} {row['dim']:>5} {row['seconds'] * 1e3:>10.3f} "
+            f"{row['baseline'] * 1e3:>10.3f} {row['change']:>+8.1%}"
+            + ("  SLOWER" if row["failed"] else "")
+        )
+    failed = sum(row["failed"] for row in compared)
+    if failed:
+        print(f"{failed} cases got more than {args.threshold:.0%} slower")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
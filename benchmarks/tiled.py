@@ -0,0 +1,72 @@
+"""
+Benchmarks a maze grid kept in a tiled file: reading the nodes of a screen
+sized region at random places, as a viewer panning around does, and editing
+random nodes then writing the changed tiles back
+Run with python -m benchmarks.tiled
+"""
+import os
+import random
+import tempfile
+import time
+
+from src.Maze.tiled_grid import TiledGrid
+
+DIMS = (1000, 10000, 50000)
+# Nodes along each side of a region, a screen of one pixel nodes
+REGION = 800
+READS = 20
+EDITS = 1000
+
+
+def run(dims=DIMS, reads=READS, edits=EDITS, seed=0):
+    """
+    Times region reads and edits on a new tiled grid of each dimension
+    @param dims: Grid dimensions to benchmark
+    @param reads: Number of regions to read
+    @param edits: Number of random edits
+    @param seed: Seed for the places read and edited
+    @return: List of result rows as dicts
+    """
+    rows = []
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        for dim in dims:
+            filename = os.path.join(directory, f"{dim}.tiled")
+            with TiledGrid.create(filename, dim, fill=1) as grid:
+                size = min(REGION, dim)
+                begin = time.perf_counter()
+                for _ in range(reads):
+                    grid.region(
+                        rng.randrange(dim - size + 1),
+                        rng.randrange(dim - size + 1),
+                        size,
+                        size,
+                    )
+                read = time.perf_counter() - begin
+                begin = time.perf_counter()
+                for _ in range(edits):
+                    grid.set(rng.randrange(dim * dim), 0)
+                grid.flush()
+                edit = time.perf_counter() - begin
+                rows.append(
+                    {
+                        "dim": dim,
+                        "file_mb": os.path.getsize(filename) / 2**20,
+                        "ms_per_region": read / reads * 1e3,
+                        "us_per_edit": edit / edits * 1e6,
+                    }
+                )
+    return rows
+
+
+def main():
+    print(f"{'dim':>6} {'file MB':>8} {'ms/region':>10} {'us/edit':>8}")
+    for row in run():
+        print(
+            f"{row['dim']:>6} {row['file_mb']:>8.1f} {row['ms_per_region']:>10.2f} "
+            f"{row['us_per_edit']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import bisect
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+from src.Maze.maze import MAZE_SAVE_PATH, Maze
+
+# Milliseconds to wait after the last change in the folder before refreshing, so
+# a batch job writing many mazes causes one refresh instead of one per file
+REFRESH_DELAY = 250
+
+watcher = None
+
+
+class LibraryWatcher(QObject):
+    """
+    Watches the saved mazes folder and keeps Maze.saved_mazes up to date
+    Emits mazes_changed with (added, removed) lists of maze names whenever the
+    saved maze names change, whether from this program or another one
+    Extends QObject
+    """
+
+    mazes_changed = pyqtSignal(list, list)
+
+    def __init__(self):
+        """
+        Initializes a LibraryWatcher and starts watching the saved mazes folder
+        """
+        super().__init__()
+        # Makes the folder if it doesn't exist yet, so it can be watched
+        Maze.get_saved_mazes()
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(REFRESH_DELAY)
+        self.refresh_timer.timeout.connect(Maze.load_saved_mazes)
+        self.file_watcher = QFileSystemWatcher([MAZE_SAVE_PATH], self)
+        self.file_watcher.directoryChanged.connect(self.refresh_timer.start)
+        Maze.library_listeners.append(self.mazes_changed.emit)
+
+
+def get_library_watcher():
+    """
+    Returns the LibraryWatcher shared by every screen, starting it the first time
+    """
+    global watcher
+    if watcher is None:
+        watcher = LibraryWatcher()
+    return watcher
+
+
+def sync_maze_list(maze_list, added, removed):
+    """
+    Applies changed maze names to a QComboBox of maze names, keeping it sorted
+    and keeping the current selection where possible
+    @param maze_list: QComboBox of maze names
+    @param added: List of added maze names
+    @param removed: List of removed maze names
+    """
+    for name in removed:
+        index = maze_list.findText(name)
+        if index != -1:
+            maze_list.removeItem(index)
+    names = [maze_list.itemText(index) for index in range(maze_list.count())]
+    listed = set(names)
+    for name in sorted(added):
+        if name in listed:
+            continue
+        index = bisect.bisect(names, name)
+        names.insert(index, name)
+        listed.add(name)
+        maze_list.insertItem(index, name)
@@ -1,9 +1,28 @@
 import math
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import QPointF, QRect, QRectF, Qt, QTimer
 from PyQt6.QtGui import QPainter, QPen
 from PyQt6.QtWidgets import QMessageBox, QWidget
 
+from src.GUI.Components.maze_tiles import (
+    MIN_OUTLINED,
+    TRANSPOSE,
+    TileCache,
+    maze_image,
+)
+from src.Maze.grid import line_nodes
+
+# Milliseconds to collect mouse moves for before applying them, about a frame
+STROKE_INTERVAL = 16
+# Largest node size in pixels when zoomed in
+MAX_ZOOM = 64
+# How much one step of the mouse wheel zooms by
+ZOOM_STEP = 1.25
+# Size of the overview of the whole maze shown when zoomed in, and its distance
+# from the corner of the drawer, in pixels
+MINIMAP_SIZE = 150
+MINIMAP_MARGIN = 10
+
 
 class MazeDrawer(QWidget):
     """
@@ -23,8 +42,40 @@ class MazeDrawer(QWidget):
         # mode 1 = play
         self.mode = 0
         self.draw_end_func = None
+        self.move_func = None
+        self.edit_func = None
+        # Last node the player drew their path to in play mode
+        self.position = None
+        # Node to highlight as the next step, in play mode
+        self.hint = None
+        # Size of a node in pixels, which is the zoom, 0 until the view is fitted
+        # to a maze
+        self.grid_dim = 0
+        # Pixel of the whole maze at the top left of the drawer, when zoomed in
+        self.offset_x = 0
+        self.offset_y = 0
+        # Dimension of the maze the view was fitted to
+        self.view_dim = 0
+        # Last mouse position while panning with the middle button
+        self.pan_from = None
+        # Whether the left button is held down on the minimap
+        self.minimap_pressed = False
+        self.tiles = TileCache()
+        # Overview of the maze for the minimap, and the grid and version it was
+        # made from
+        self.overview = None
+        self.overview_key = None
         self.place_start = False
         self.place_end = False
+        # Nodes the mouse was dragged over since the stroke was last applied,
+        # the last node applied and the value the stroke sets nodes to
+        self.stroke_pending = []
+        self.stroke_last = None
+        self.stroke_value = 0
+        self.stroke_timer = QTimer(self)
+        self.stroke_timer.setSingleShot(True)
+        self.stroke_timer.setInterval(STROKE_INTERVAL)
+        self.stroke_timer.timeout.connect(self.apply_stroke)
         self.show()
 
     def set_draw_end_func(self, func):
@@ -35,62 +86,254 @@ class MazeDrawer(QWidget):
         """
         self.draw_end_func = func
 
+    def set_move_func(self, func):
+        """
+        Sets the function that gets called when the player's position changes
+        @param func: Function to be called after the player draws or erases path
+        """
+        self.move_func = func
+
+    def set_edit_func(self, func):
+        """
+        Sets the function that gets called when the maze is edited in build mode
+        @param func: Function to be called after a wall, path, start or end changes
+        """
+        self.edit_func = func
+
+    def show_hint(self, node):
+        """
+        Highlights a node as the next step for the player
+        @param node: (row, col) to highlight, or None to clear the hint
+        """
+        self.hint = node
+        self.update()
+
     def paintEvent(self, event):
         """
         Called when a paint event occurs on the maze drawe through PyQT
-        @param event: PyQT event causing the repaint, unused
+        Draws the nodes in the repainted area, then the start, end and hint on top
+        @param event: PyQT event causing the repaint
         """
 
         # Do nothing if we don't have a maze yet
         if not self.maze:
             return
         # Show the maze start as path if we are playing maze
-        if self.mode == 1:
-            self.maze.grid[self.maze.start[0]][self.maze.start[1]] = 2
-        # Figure out proper dimensions of grid boxes
-        self.grid_dim = math.floor(min(self.width(), self.height()) / self.maze.dim)
+        # Only set when it isn't already, since every change redraws the minimap
+        if self.mode == 1 and self.maze.grid[self.maze.start] != 2:
+            self.maze.grid[self.maze.start] = 2
+        if self.grid_dim == 0 or self.view_dim != self.maze.dim:
+            self.reset_view()
         # Copy to make it easier to reference
         grid_dim = self.grid_dim
         self.painter = QPainter()
         self.painter.begin(self)
-        for i in range(self.maze.dim):
-            for j in range(self.maze.dim):
-                if self.maze.grid[i][j] == 0:
-                    self.painter.setBrush(Qt.GlobalColor.white)
-                elif self.maze.grid[i][j] == 1:
-                    self.painter.setBrush(Qt.GlobalColor.black)
-                else:
-                    self.painter.setBrush(Qt.GlobalColor.cyan)
-                self.painter.drawRect(i * grid_dim, j * grid_dim, grid_dim, grid_dim)
+        # Everything is drawn at its place in the whole maze, moved by the view
+        self.painter.translate(-self.offset_x, -self.offset_y)
+        self.paint_nodes(event.rect().translated(self.offset_x, self.offset_y))
+        # Hint for the next step, if the player asked for one
+        if self.hint is not None:
+            self.painter.setBrush(Qt.GlobalColor.yellow)
+            self.painter.drawEllipse(
+                QRectF(
+                    (self.hint[0] + 0.3) * grid_dim,
+                    (self.hint[1] + 0.3) * grid_dim,
+                    grid_dim * 0.4,
+                    grid_dim * 0.4,
+                )
+            )
         # Circle for start of maze
         self.painter.setBrush(Qt.GlobalColor.green)
         self.painter.drawEllipse(
-            (self.maze.start[0] + 0.2) * grid_dim,
-            (self.maze.start[1] + 0.2) * grid_dim,
-            grid_dim * 0.65,
-            grid_dim * 0.65,
+            QRectF(
+                (self.maze.start[0] + 0.2) * grid_dim,
+                (self.maze.start[1] + 0.2) * grid_dim,
+                grid_dim * 0.65,
+                grid_dim * 0.65,
+            )
         )
 
         # X for end of maze
 
-        # Pen width 5 looks good for a 20x20 maze
-        # Scale the width down as the dimension increases
-        pen_width = 5 * (20 / self.maze.dim)
+        # Pen width 5 looks good for 40 pixel nodes, so scale it with the nodes
+        pen_width = max(1.0, grid_dim / 8)
         self.painter.setPen(QPen(Qt.GlobalColor.red, pen_width))
         self.painter.drawLine(
-            (self.maze.end[0] + 0 + 0.2) * grid_dim,
-            (self.maze.end[1] + 0 + 0.2) * grid_dim,
-            (self.maze.end[0] + 1 - 0.15) * grid_dim,
-            (self.maze.end[1] + 1 - 0.15) * grid_dim,
+            QPointF(
+                (self.maze.end[0] + 0 + 0.2) * grid_dim,
+                (self.maze.end[1] + 0 + 0.2) * grid_dim,
+            ),
+            QPointF(
+                (self.maze.end[0] + 1 - 0.15) * grid_dim,
+                (self.maze.end[1] + 1 - 0.15) * grid_dim,
+            ),
         )
         self.painter.drawLine(
-            (self.maze.end[0] + 0 + 0.2) * grid_dim,
-            (self.maze.end[1] + 1 - 0.15) * grid_dim,
-            (self.maze.end[0] + 1 - 0.15) * grid_dim,
-            (self.maze.end[1] + 0 + 0.2) * grid_dim,
+            QPointF(
+                (self.maze.end[0] + 0 + 0.2) * grid_dim,
+                (self.maze.end[1] + 1 - 0.15) * grid_dim,
+            ),
+            QPointF(
+                (self.maze.end[0] + 1 - 0.15) * grid_dim,
+                (self.maze.end[1] + 0 + 0.2) * grid_dim,
+            ),
         )
+        self.painter.resetTransform()
+        if self.minimap_rect() is not None:
+            self.paint_minimap()
         self.painter.end()
 
+    def paint_nodes(self, area):
+        """
+        Draws the nodes of the maze in an area with self.painter, a tile at a
+        time from the tile cache, along with the outlines along the bottom and
+        right of the maze if nodes are big enough to have outlines
+        @param area: QRect of the whole maze at the current zoom to draw
+        """
+        dim = self.maze.dim
+        grid_dim = self.grid_dim
+        tile_size = self.tiles.tile_nodes(grid_dim) * grid_dim
+        size = dim * grid_dim
+        if grid_dim >= MIN_OUTLINED:
+            # Tiles only outline the top and left of their nodes
+            self.painter.fillRect(size, 0, 1, size + 1, Qt.GlobalColor.black)
+            self.painter.fillRect(0, size, size + 1, 1, Qt.GlobalColor.black)
+        area = area.intersected(QRect(0, 0, size, size))
+        if area.isEmpty():
+            return
+        for tile_row in range(area.left() // tile_size, area.right() // tile_size + 1):
+            for tile_col in range(
+                area.top() // tile_size, area.bottom() // tile_size + 1
+            ):
+                self.painter.drawPixmap(
+                    tile_row * tile_size,
+                    tile_col * tile_size,
+                    self.tiles.get(self.maze, grid_dim, tile_row, tile_col),
+                )
+
+    def minimap_rect(self):
+        """
+        Returns where the minimap goes, in the bottom right corner of the drawer
+        @return: QRect, or None if the whole maze fits in the drawer
+        """
+        size = self.maze.dim * self.grid_dim if self.maze else 0
+        if size <= self.width() and size <= self.height():
+            return None
+        return QRect(
+            self.width() - MINIMAP_SIZE - MINIMAP_MARGIN,
+            self.height() - MINIMAP_SIZE - MINIMAP_MARGIN,
+            MINIMAP_SIZE,
+            MINIMAP_SIZE,
+        )
+
+    def paint_minimap(self):
+        """
+        Draws an overview of the whole maze with self.painter, outlining the
+        part of it in view
+        """
+        area = self.minimap_rect()
+        grid = self.maze.grid
+        if self.overview_key is None or (
+            self.overview_key[0] is not grid or self.overview_key[1] != grid.version
+        ):
+            # Sampling only reads the nodes that end up as a pixel, so this
+            # doesn't depend on the size of the maze
+            nodes = grid.sample(MINIMAP_SIZE)
+            self.overview = maze_image(nodes, MINIMAP_SIZE, MINIMAP_SIZE).copy()
+            self.overview_key = (grid, grid.version)
+        self.painter.save()
+        self.painter.translate(area.left(), area.top())
+        self.painter.setTransform(TRANSPOSE, True)
+        self.painter.drawImage(0, 0, self.overview)
+        self.painter.restore()
+        self.painter.setBrush(Qt.BrushStyle.NoBrush)
+        self.painter.setPen(QPen(Qt.GlobalColor.darkGray, 2))
+        self.painter.drawRect(area)
+        # The part of the maze in view
+        scale = MINIMAP_SIZE / (self.maze.dim * self.grid_dim)
+        self.painter.setPen(QPen(Qt.GlobalColor.red, 2))
+        self.painter.drawRect(
+            QRectF(
+                area.left() + self.offset_x * scale,
+                area.top() + self.offset_y * scale,
+                min(self.width() * scale, MINIMAP_SIZE),
+                min(self.height() * scale, MINIMAP_SIZE),
+            )
+        )
+
+    def reset_view(self):
+        """
+        Zooms out as far as the maze allows, fitting it in the drawer if nodes
+        can be a pixel or more
+        """
+        self.tiles.clear()
+        if not self.maze:
+            return
+        self.grid_dim = max(1, self.fit_zoom())
+        self.view_dim = self.maze.dim
+        self.offset_x = 0
+        self.offset_y = 0
+
+    def fit_zoom(self):
+        """
+        Returns the node size in pixels fitting the whole maze in the drawer
+        """
+        return math.floor(min(self.width(), self.height()) / self.maze.dim)
+
+    def move_view(self, offset_x, offset_y):
+        """
+        Moves the view, keeping it within the maze
+        @param offset_x: Pixel of the whole maze to put at the left of the drawer
+        @param offset_y: Pixel of the whole maze to put at the top of the drawer
+        """
+        size = self.maze.dim * self.grid_dim
+        self.offset_x = int(min(max(0, offset_x), max(0, size - self.width())))
+        self.offset_y = int(min(max(0, offset_y), max(0, size - self.height())))
+        self.update()
+
+    def zoom_to(self, grid_dim, x, y):
+        """
+        Changes the node size, keeping the point under a position in place
+        @param grid_dim: New node size in pixels
+        @param x: X coordinate to zoom around
+        @param y: Y coordinate to zoom around
+        """
+        grid_dim = min(max(grid_dim, max(1, self.fit_zoom())), MAX_ZOOM)
+        if grid_dim == self.grid_dim:
+            return
+        scale = grid_dim / self.grid_dim
+        self.grid_dim = grid_dim
+        self.move_view((self.offset_x + x) * scale - x, (self.offset_y + y) * scale - y)
+
+    def wheelEvent(self, event):
+        """
+        Zooms in or out around the mouse with the mouse wheel
+        @param event: PyQT wheel event
+        """
+        if not self.maze or self.grid_dim == 0:
+            return
+        steps = event.angleDelta().y() / 120
+        if steps > 0:
+            grid_dim = max(self.grid_dim + 1, round(self.grid_dim * ZOOM_STEP**steps))
+        elif steps < 0:
+            grid_dim = min(self.grid_dim - 1, round(self.grid_dim * ZOOM_STEP**steps))
+        else:
+            return
+        self.zoom_to(grid_dim, event.position().x(), event.position().y())
+
+    def center_on_minimap(self, x, y):
+        """
+        Moves the view to be centered on a point of the minimap
+        @param x: X coordinate in the drawer
+        @param y: Y coordinate in the drawer
+        """
+        area = self.minimap_rect()
+        scale = self.maze.dim * self.grid_dim / MINIMAP_SIZE
+        self.move_view(
+            (x - area.left()) * scale - self.width() / 2,
+            (y - area.top()) * scale - self.height() / 2,
+        )
+
     def resize(self, width, height):
         """
         Resizes maze drawer
@@ -99,6 +342,7 @@ class MazeDrawer(QWidget):
         """
         # It should be a square, so use the minimum of either dimension
         self.setFixedSize(min(width, height), min(width, height))
+        self.reset_view()
         self.update()
 
     def update(self):
@@ -106,7 +350,44 @@ class MazeDrawer(QWidget):
         Updates the maze drawer
         """
         super().update()
-        self.repaint()
+
+    def cells_rect(self, indices):
+        """
+        Returns the area of the widget covering some nodes
+        @param indices: Flat indices of the nodes
+        @return: QRect, or None if the nodes haven't been painted yet
+        """
+        grid_dim = self.grid_dim
+        if grid_dim == 0:
+            return None
+        dim = self.maze.dim
+        rows = [index // dim for index in indices]
+        cols = [index % dim for index in indices]
+        # Rows are drawn along x and columns along y, and the outline of a node
+        # reaches a pixel past it
+        return QRect(
+            min(rows) * grid_dim - self.offset_x,
+            min(cols) * grid_dim - self.offset_y,
+            (max(rows) - min(rows) + 1) * grid_dim + 1,
+            (max(cols) - min(cols) + 1) * grid_dim + 1,
+        )
+
+    def update_cells(self, indices):
+        """
+        Schedules a repaint of just the area covering some nodes
+        @param indices: Flat indices of the nodes that changed
+        """
+        if not self.maze or not indices:
+            return
+        area = self.cells_rect(indices)
+        if area is None:
+            # Not painted yet, so node positions aren't known
+            super().update()
+            return
+        super().update(area)
+        minimap = self.minimap_rect()
+        if minimap is not None:
+            super().update(minimap)
 
     def set_maze(self, maze):
         """
@@ -114,6 +395,9 @@ class MazeDrawer(QWidget):
         @param maze: Maze to load in
         """
         self.maze = maze
+        self.position = tuple(maze.start) if maze else None
+        self.hint = None
+        self.reset_view()
         self.update()
 
     def mousePressEvent(self, event):
@@ -121,7 +405,19 @@ class MazeDrawer(QWidget):
         Handles mouse presses triggered through PyQT
         @param event: PyQT mouse event
         """
-        if event.button() == Qt.MouseButton.LeftButton:
+        minimap = self.minimap_rect()
+        if event.button() == Qt.MouseButton.MiddleButton:
+            # Middle button drags the view around
+            self.pan_from = event.position()
+        elif (
+            event.button() == Qt.MouseButton.LeftButton
+            and minimap is not None
+            and minimap.contains(event.position().toPoint())
+        ):
+            # Clicking on the minimap moves the view there
+            self.minimap_pressed = True
+            self.center_on_minimap(event.position().x(), event.position().y())
+        elif event.button() == Qt.MouseButton.LeftButton:
             # Left button means either wall in build mode or path in play mode
             self.set_grid(
                 event.position().x(), event.position().y(), 1 if self.mode == 0 else 2
@@ -139,87 +435,188 @@ class MazeDrawer(QWidget):
         """
         if event.button() == Qt.MouseButton.LeftButton:
             self.left_pressed = False
+            self.minimap_pressed = False
         elif event.button() == Qt.MouseButton.RightButton:
             self.right_pressed = False
+        elif event.button() == Qt.MouseButton.MiddleButton:
+            self.pan_from = None
+        # Finish the stroke straight away rather than waiting for the timer
+        self.apply_stroke()
+        self.stroke_last = None
 
     def mouseMoveEvent(self, event):
         """
         Handles mouse movements triggered through PyQT
+        Moves are only collected here, and applied together about once a frame
         @param event: PyQT mouse move event
         """
-        # Do the same things as if we were individually clicking on each of the grids
-        if self.left_pressed:
-            self.set_grid(
-                event.position().x(), event.position().y(), 1 if self.mode == 0 else 2
-            )
-        elif self.right_pressed:
-            self.set_grid(event.position().x(), event.position().y(), 0)
+        if self.pan_from is not None:
+            moved = event.position() - self.pan_from
+            self.pan_from = event.position()
+            self.move_view(self.offset_x - moved.x(), self.offset_y - moved.y())
+            return
+        if self.minimap_pressed:
+            self.center_on_minimap(event.position().x(), event.position().y())
+            return
+        if not (self.left_pressed or self.right_pressed):
+            return
+        node = self.node_at(event.position().x(), event.position().y())
+        if node is None:
+            return
+        if node != (self.stroke_pending[-1] if self.stroke_pending else None):
+            self.stroke_pending.append(node)
+        if not self.stroke_timer.isActive():
+            self.stroke_timer.start()
+
+    def node_at(self, x, y):
+        """
+        Returns the node at a position in the widget
+        @param x: X coordinate, NOT the row/col dimension
+        @param y: Y coordinate, NOT the row/col dimension
+        @return: (row, col), or None if there is no node there
+        """
+        if not self.maze or self.grid_dim == 0:
+            return None
+        row = int((x + self.offset_x) // self.grid_dim)
+        col = int((y + self.offset_y) // self.grid_dim)
+        if row < 0 or row >= self.maze.dim or col < 0 or col >= self.maze.dim:
+            return None
+        return (row, col)
+
+    def apply_stroke(self):
+        """
+        Applies the nodes the mouse was dragged over since the last time, along
+        with every node on the lines between them, so fast drags don't skip any
+        """
+        self.stroke_timer.stop()
+        pending = self.stroke_pending
+        self.stroke_pending = []
+        if not pending or not self.maze:
+            return
+        nodes = []
+        last = self.stroke_last
+        for node in pending:
+            if last is None:
+                nodes.append(node)
+            else:
+                nodes.extend(line_nodes(last, node)[1:])
+            last = node
+        self.stroke_last = last
+        self.set_nodes(nodes, self.stroke_value)
 
     def set_grid(self, x, y, val):
         """
         Sets the grid to a specific value, checking that the value we want
         to set is valid
+        Also starts a stroke there, for dragging to carry on from
         @param x: X coordinate of the event, NOT the row/col dimension
         @param y: Y coordinate of the event, NOT the row/col dimension
         @param val: The value we are trying to set
         """
-        # Do nothing if maze doesn't exist
-        if not self.maze:
-            return
-        # Figure out which row and col we are at, return if invalid
-        row = int(x // self.grid_dim)
-        col = int(y // self.grid_dim)
-        if row < 0 or row >= self.maze.dim or col < 0 or col >= self.maze.dim:
+        # Do nothing if there is no node there
+        node = self.node_at(x, y)
+        if node is None:
             return
+        row, col = node
+        self.stroke_pending = []
+        self.stroke_last = node
+        self.stroke_value = val
         # Cannot build on start or end
-        if self.mode == 0 and (
-            (row, col) == self.maze.end or (row, col) == self.maze.start
-        ):
+        if self.mode == 0 and (node == self.maze.end or node == self.maze.start):
             return
-        can_place = True
         # Can't place track on walls in play mode
-        if self.mode == 1 and self.maze.grid[row][col] == 1:
+        if self.mode == 1 and self.maze.grid[row, col] == 1:
             return
 
         # We're trying to place maze start
         if self.place_start:
             # Only allow on current open boxes
-            if self.maze.grid[row][col] == 0:
+            if self.maze.grid[row, col] == 0:
                 self.maze.start = (row, col)
                 self.place_start = False
+                if self.edit_func:
+                    self.edit_func()
                 self.update()
             self.left_pressed = False
             self.right_pressed = False
             return
         # Same procedure for placing maze end
         if self.place_end:
-            if self.maze.grid[row][col] == 0:
+            if self.maze.grid[row, col] == 0:
                 self.maze.end = (row, col)
                 self.place_end = False
+                if self.edit_func:
+                    self.edit_func()
                 self.update()
             self.left_pressed = False
             self.right_pressed = False
             return
+        self.set_nodes([node], val)
 
+    def can_set(self, node, val):
+        """
+        Returns whether a node can be set to a value
+        @param node: (row, col) of node
+        @param val: The value we are trying to set
+        """
+        # Cannot build on start or end
+        if self.mode == 0 and (node == self.maze.end or node == self.maze.start):
+            return False
+        # Can't place track on walls in play mode
+        if self.mode == 1 and self.maze.grid[node] == 1:
+            return False
         # If we're trying to draw a path, make sure it is connected to another path
         # otherwise it is invalid
         if val == 2:
-            neighbors = self.maze.get_neighbors(row, col, path=True)
-            can_place = False
-            for neighbor in neighbors:
-                if self.maze.grid[neighbor[0]][neighbor[1]] == 2:
-                    can_place = True
-                    break
-        # Allowed to place
-        if can_place:
-            self.maze.grid[row][col] = val
-            if (row, col) == self.maze.end and self.mode == 1:
-                # Check if we have won, if so run callback and win popup
-                self.update()
-                if self.draw_end_func:
-                    self.draw_end_func()
-                self.make_popup("You win!")
-        self.update()
+            return any(
+                self.maze.grid[neighbor] == 2
+                for neighbor in self.maze.get_neighbors(*node, path=True)
+            )
+        return True
+
+    def set_nodes(self, nodes, val):
+        """
+        Sets a run of nodes to a value as one edit, in order, skipping the nodes
+        that can't be set, then repaints them together
+        Nodes are checked as they are set, so a path drawn along the run stays
+        connected to the path it started from
+        @param nodes: List of (row, col), each next to the one before it
+        @param val: The value we are trying to set
+        """
+        dim = self.maze.dim
+        changed = []
+        finished = False
+        for node in nodes:
+            if not self.can_set(node, val):
+                continue
+            # Goes through the maze so its connectivity keeps up with the edit
+            self.maze.set_node(node, val)
+            changed.append(node[0] * dim + node[1])
+            if self.mode == 1:
+                # Drawing moves the player, and erasing where they are sends
+                # them back to the start
+                if val == 2:
+                    self.position = node
+                elif node == self.position:
+                    self.position = tuple(self.maze.start)
+                if node == self.maze.end:
+                    finished = True
+        if not changed:
+            return
+        # Only the edited nodes need drawing again, and the hint if it goes
+        if self.mode == 1 and self.hint is not None:
+            changed.append(self.hint[0] * dim + self.hint[1])
+            self.hint = None
+        self.update_cells(changed)
+        if self.mode == 0 and self.edit_func:
+            self.edit_func()
+        if self.mode == 1 and self.move_func:
+            self.move_func()
+        if finished:
+            # We have won, so run the callback and win popup
+            if self.draw_end_func:
+                self.draw_end_func()
+            self.make_popup("You win!")
 
     def make_popup(self, message):
         """
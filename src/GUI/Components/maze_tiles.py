@@ -0,0 +1,158 @@
+from collections import OrderedDict
+
+from PyQt6.QtCore import QRect, Qt
+from PyQt6.QtGui import QColor, QImage, QPainter, QPixmap, QTransform
+
+from src.Maze.grid import Grid
+
+# Color of every node type, by node type, for the image of the maze
+NODE_COLORS = [
+    QColor(Qt.GlobalColor.white).rgb(),
+    QColor(Qt.GlobalColor.black).rgb(),
+    QColor(Qt.GlobalColor.cyan).rgb(),
+]
+# Smallest node size in pixels that still gets outlines between nodes
+MIN_OUTLINED = 4
+# Draws an image with its x and y swapped, since the grid is stored a row at a
+# time but rows are drawn along x
+TRANSPOSE = QTransform(0, 1, 1, 0, 0, 0)
+# Size of a tile in pixels, tiles hold as many whole nodes as fit
+TILE_SIZE = 256
+# Most tiles to keep, about 32MB of pixmaps
+MAX_TILES = 128
+
+
+def maze_image(nodes, rows, cols):
+    """
+    Returns an indexed QImage of some nodes, one pixel per node, which reads the
+    nodes' memory directly rather than copying it
+    The image has rows along y, so it needs TRANSPOSE to be drawn
+    @param nodes: Bytes-like of node types in row-major order, like Grid.cells
+    or what Grid.region or Grid.sample return, which must outlive the image
+    @param rows: Number of rows
+    @param cols: Number of columns
+    """
+    image = QImage(nodes, cols, rows, cols, QImage.Format.Format_Indexed8)
+    image.setColorTable(NODE_COLORS)
+    return image
+
+
+class TileCache:
+    """
+    Least recently used cache of square pieces of a maze drawn at one node size
+    A tile is drawn again when any node in it changed, which is found by
+    keeping a copy of the nodes the tile was drawn from, only compared once the
+    grid's version moved on from when the tile was last checked
+    Tiles of a grid in memory are drawn from one image over the grid's memory,
+    as the drawer did before it had tiles, and only tiles of a grid kept in a
+    file are drawn from their copy
+    """
+
+    def __init__(self, max_tiles=MAX_TILES):
+        """
+        Initializes a TileCache
+        @param max_tiles: Most tiles to keep
+        """
+        self.max_tiles = max_tiles
+        self.tiles = OrderedDict()
+        # Dimension and node size the cached tiles were drawn for
+        self.key = None
+        # Number of tiles drawn, for checking that tiles are being reused
+        self.drawn = 0
+        # Grid the tiles were last checked against, and a count of the grids
+        # seen, so a version from another grid is never mistaken for current
+        self.grid = None
+        self.generation = 0
+        # Image sharing the memory of the grid, and the grid memory it shares
+        self.image = None
+        self.image_cells = None
+
+    def tile_nodes(self, grid_dim):
+        """
+        Returns the number of nodes along each side of a tile
+        @param grid_dim: Size of a node in pixels
+        """
+        return max(1, TILE_SIZE // grid_dim)
+
+    def get(self, maze, grid_dim, tile_row, tile_col):
+        """
+        Returns the pixmap of a tile, drawing it if it isn't cached or changed
+        Tiles are drawn with the same x and y as the maze, rows along x
+        @param maze: Maze to draw
+        @param grid_dim: Size of a node in pixels
+        @param tile_row: Row of the tile, in tiles
+        @param tile_col: Column of the tile, in tiles
+        @return: QPixmap with the top left node of the tile at its top left
+        """
+        dim = maze.dim
+        if self.key != (dim, grid_dim):
+            self.tiles.clear()
+            self.key = (dim, grid_dim)
+        nodes = self.tile_nodes(grid_dim)
+        first_row = tile_row * nodes
+        last_row = min(dim, first_row + nodes)
+        first_col = tile_col * nodes
+        last_col = min(dim, first_col + nodes)
+        rows = last_row - first_row
+        cols = last_col - first_col
+        grid = maze.grid
+        if grid is not self.grid:
+            self.grid = grid
+            self.generation += 1
+        checked = (self.generation, grid.version)
+        place = (tile_row, tile_col)
+        entry = self.tiles.get(place)
+        if entry is not None and entry[2] == checked:
+            # Nothing in the grid changed since the tile was last checked
+            self.tiles.move_to_end(place)
+            return entry[0]
+        # Only reads the nodes of the tile, so this works the same for a grid
+        # kept in a file
+        drawn_from = grid.region(first_row, first_col, rows, cols)
+        if entry is not None and entry[1] == drawn_from:
+            self.tiles[place] = (entry[0], drawn_from, checked)
+            self.tiles.move_to_end(place)
+            return entry[0]
+        if isinstance(grid, Grid):
+            # The grid swaps in new memory when a shared copy is first changed
+            if grid.cells is not self.image_cells:
+                self.image = maze_image(grid.cells, dim, dim)
+                self.image_cells = grid.cells
+            image = self.image
+            source = QRect(first_col, first_row, cols, rows)
+        else:
+            image = maze_image(drawn_from, rows, cols)
+            source = QRect(0, 0, cols, rows)
+        pixmap = QPixmap(rows * grid_dim, cols * grid_dim)
+        painter = QPainter(pixmap)
+        painter.setTransform(TRANSPOSE)
+        painter.drawImage(QRect(0, 0, cols * grid_dim, rows * grid_dim), image, source)
+        painter.resetTransform()
+        if grid_dim >= MIN_OUTLINED:
+            # Outlines along the top and left of every node, as one pixel wide
+            # rectangles since those fill much faster than lines
+            for row in range(rows):
+                painter.fillRect(
+                    row * grid_dim, 0, 1, cols * grid_dim, Qt.GlobalColor.black
+                )
+            for col in range(cols):
+                painter.fillRect(
+                    0, col * grid_dim, rows * grid_dim, 1, Qt.GlobalColor.black
+                )
+        painter.end()
+        self.drawn += 1
+        self.tiles[place] = (pixmap, drawn_from, checked)
+        self.tiles.move_to_end(place)
+        while len(self.tiles) > self.max_tiles:
+            self.tiles.popitem(last=False)
+        return pixmap
+
+    def clear(self):
+        """
+        Drops every cached tile
+        """
+        self.tiles.clear()
+        self.key = None
+        self.grid = None
+        self.image = None
+        self.image_cells = None
@@ -11,6 +11,8 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from src.GUI.Components.library_watcher import get_library_watcher, sync_maze_list
+from src.Maze.generators import DEFAULT_GENERATOR, GENERATORS
 from src.Maze.maze import Maze
 
 
@@ -53,6 +55,12 @@ class EditControl(QWidget):
         self.random_button.pressed.connect(self.randomize_maze)
         self.random_button.setFixedSize(150, 40)
 
+        # Generator used by the randomize button
+        self.generator_text = QLabel("Generator:")
+        self.generator_list = QComboBox()
+        self.generator_list.addItems(GENERATORS.keys())
+        self.generator_list.setCurrentText(DEFAULT_GENERATOR)
+
         # Save maze button
         self.save_maze_button = QPushButton("Save Maze Changes")
         self.save_maze_button.setEnabled(False)
@@ -64,20 +72,25 @@ class EditControl(QWidget):
         self.load_selected_button.pressed.connect(self.load_selected_maze)
         self.load_selected_button.setFixedSize(150, 40)
 
+        # Whether the start and end are connected, updated with every edit
+        self.connected_label = QLabel("")
+        self.maze_drawer.set_edit_func(self.update_connected)
+
         # Saved maze dropdown list
         self.maze_list = QComboBox()
-        self.maze_list.addItems(Maze.saved_mazes.keys())
+        sync_maze_list(self.maze_list, list(Maze.get_saved_mazes()), [])
+        # Keep the list in step with the saved mazes folder
+        get_library_watcher().mazes_changed.connect(self.library_changed)
 
         # Label for maze size
         self.dimension_text = QLabel("Maze Size (x by x):")
 
         # Size number spin edit
         self.dimension_spin = QSpinBox()
-        # Bounds are 5-100 just because of reasonability of displaying mazes
-        # theoretically > 100 would be fine but it gets
-        # too hard to see/click at that scale
+        # Bounds are 5-5000, bigger mazes are drawn in tiles and can be zoomed
+        # into to see/click, but past 5000 the maze itself gets slow to edit
         self.dimension_spin.setMinimum(5)
-        self.dimension_spin.setMaximum(100)
+        self.dimension_spin.setMaximum(5000)
         self.dimension_spin.setSingleStep(1)
         self.dimension_spin.valueChanged.connect(self.maze_dim_change)
         self.dimension_spin.setEnabled(False)
@@ -122,11 +135,14 @@ class EditControl(QWidget):
         # Add all of the widgets to the layout top to bottom
         layout.addWidget(self.maze_name_label)
         layout.addWidget(self.maze_name_edit)
+        layout.addWidget(self.connected_label)
         layout.addWidget(self.maze_list)
         layout.addWidget(self.load_selected_button)
         layout.addWidget(self.new_maze_button)
         layout.addWidget(self.save_maze_button)
         layout.addWidget(self.random_button)
+        layout.addWidget(self.generator_text)
+        layout.addWidget(self.generator_list)
         layout.addWidget(self.dimension_text)
         layout.addWidget(self.dimension_spin)
         layout.addWidget(self.difficulty_text)
@@ -151,13 +167,32 @@ class EditControl(QWidget):
         """
         self.maze_drawer.place_end = True
 
+    def update_connected(self):
+        """
+        Shows whether the end of the maze can be reached from the start
+        """
+        if not self.maze:
+            self.connected_label.setText("")
+        elif self.maze.is_tiled():
+            # Checking would read the whole file
+            self.connected_label.setText("")
+        elif self.maze.is_solvable():
+            self.connected_label.setText("Start and end connected")
+        else:
+            self.connected_label.setText("Start and end not connected")
+
+    def library_changed(self, added, removed):
+        """
+        Triggered when saved mazes are added or removed, updates the maze list
+        @param added: List of added maze names
+        @param removed: List of removed maze names
+        """
+        sync_maze_list(self.maze_list, added, removed)
+
     def update(self):
         """
         Updates the widget, called by PyQT
         """
-        # Add mazes to the list to account for any changes/new saved mazes
-        self.maze_list.clear()
-        self.maze_list.addItems(Maze.saved_mazes.keys())
         # The rest of the controls all need a maze to exist, so exit if we
         # don't have one yet
         if not self.maze:
@@ -181,9 +216,10 @@ class EditControl(QWidget):
         )
         self.maze_name_edit.setText(self.maze.name)
         self.dimension_spin.setValue(self.maze.dim)
+        self.update_connected()
         # We set the currently selected maze in the dropdown to the maze
         # we have if it is saved because it looks nicer
-        if self.maze.name in Maze.saved_mazes:
+        if self.maze.name in Maze.get_saved_mazes():
             self.maze_list.setCurrentText(self.maze.name)
         # Update the maze drawer to save maze changes
         self.maze_drawer.update()
@@ -194,8 +230,9 @@ class EditControl(QWidget):
         """
         if not self.maze:
             return
-        # Make sure that the given maze is solvable
-        if not self.maze.route_astar(self.maze.start, self.maze.end, search_path=True):
+        # Make sure that the given maze is solvable, which the connectivity kept
+        # up to date while editing answers without searching the maze
+        if not self.maze.is_solvable():
             self.make_popup("That maze is not solvable!")
             return
         # Here we check if a maze is a "new" maze or an edited maze
@@ -203,7 +240,7 @@ class EditControl(QWidget):
         # If it is a "new" maze, we don't allow it to be saved with the
         # same name as another maze
         if self.maze_changed:
-            if self.maze.name in Maze.saved_mazes:
+            if self.maze.name in Maze.get_saved_mazes():
                 self.make_popup("That maze name already exists")
             else:
                 self.maze.save_to_file()
@@ -220,7 +257,7 @@ class EditControl(QWidget):
         Loads the selected maze from the drop down menu
         """
         # Make sure there are mazes we can load
-        if len(Maze.saved_mazes) == 0:
+        if len(Maze.get_saved_mazes()) == 0:
             self.make_popup("No saved mazes!")
         else:
             # Get the current saved maze
@@ -234,7 +271,7 @@ class EditControl(QWidget):
         """
         Triggers when the randomize button is pressed to randomize the maze
         """
-        self.maze.randomize()
+        self.maze.randomize(self.generator_list.currentText())
         self.update()
 
     def resize(self, width, height):
@@ -294,6 +331,7 @@ class EditControl(QWidget):
             "Create a new maze with the new button\n"
             "Save changes to the current maze with the save button\n"
             "Randomize the current maze with the random button, which uses the "
+            "generator you pick below it. The snaking generator also uses the "
             "difficulty you set\n"
             "Configure the maze dimension with the number selector\n"
             "Change the difficulty by rotating the dial between the three "
@@ -302,6 +340,8 @@ class EditControl(QWidget):
             "Dragging/clicking the right mouse button places path tiles on the maze\n"
             "Move the start/end of the maze by clicking the appropriate button "
             "and then clicking on a valid start/ending tile\n"
+            "Zoom in and out with the mouse wheel and drag with the middle mouse "
+            "button to move around, or click on the overview in the corner\n"
         )
         self.make_popup(help_message, title="Help")
 
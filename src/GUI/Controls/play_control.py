@@ -1,5 +1,8 @@
+import time
+
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import (
+    QCheckBox,
     QComboBox,
     QLabel,
     QMessageBox,
@@ -8,7 +11,25 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from src.GUI.Components.library_watcher import get_library_watcher, sync_maze_list
+from src.Maze.instrument import Stats
 from src.Maze.maze import Maze
+from src.Maze.solvers import DEFAULT_SOLVER, SOLVERS, advance_solver, start_solver
+
+# Solver animation speeds in nodes expanded per second, instant runs the whole
+# solver up front and then shows its nodes as fast as they can be drawn
+SPEEDS = {
+    "Slow": 20,
+    "Medium": 200,
+    "Fast": 2000,
+    "Very Fast": 20000,
+    "Instant": None,
+}
+DEFAULT_SPEED = "Medium"
+# Milliseconds between animation frames, about 60 frames a second
+FRAME_INTERVAL = 16
+# Seconds of solving to do at most in one frame, leaving the rest for drawing
+FRAME_BUDGET = 0.008
 
 
 class PlayControl(QWidget):
@@ -23,13 +44,12 @@ class PlayControl(QWidget):
         @param maze_drawer: MazeDrawer to link to the controls
         """
         super().__init__()
-        # Stores the state of the astar algorithm
-        self.animation_state = {
-            "nodes": None,
-            "node_from": None,
-            "g_score": None,
-            "f_score": None,
-        }
+        # Stores the state of the solver being animated, from start_solver
+        self.animation_state = None
+        # When the animation started at its current speed, and how many nodes
+        # it had expanded by then, to work out how many are due each frame
+        self.animation_started = 0.0
+        self.animation_steps = 0
 
         layout = QVBoxLayout()
         # Whether or not we are currently solving the maze
@@ -64,10 +84,30 @@ class PlayControl(QWidget):
         self.animate_solve_button.setFixedSize(150, 40)
         self.animate_solve_button.setEnabled(False)
 
+        # Solver used by the watch solver button
+        self.solver_text = QLabel("Solver:")
+        self.solver_list = QComboBox()
+        self.solver_list.addItems(SOLVERS.keys())
+        self.solver_list.setCurrentText(DEFAULT_SOLVER)
+
+        # Speed of the solver animation
+        self.speed_text = QLabel("Speed:")
+        self.speed_list = QComboBox()
+        self.speed_list.addItems(SPEEDS.keys())
+        self.speed_list.setCurrentText(DEFAULT_SPEED)
+        self.speed_list.currentTextChanged.connect(self.speed_changed)
+
         self.elapsed_time = 0.0
         self.play_timer_label = QLabel("0.0")
         self.play_timer_label.setFont(font)
 
+        # Counts of the solver's work, only recorded while they are shown
+        self.stats = None
+        self.stats_label = QLabel("")
+        self.stats_label.setVisible(False)
+        self.stats_box = QCheckBox("Show Solver Stats")
+        self.stats_box.toggled.connect(self.toggle_stats)
+
         # Timer for the physical viewable timer
         # Separate from the timer that controls the animation ticks
         self.play_timer = QTimer()
@@ -87,44 +127,114 @@ class PlayControl(QWidget):
         self.help_button.pressed.connect(self.show_help)
         self.help_button.setFixedSize(150, 40)
 
+        # Distance from the player to the end, and a hint for the next step
+        self.distance_label = QLabel("")
+        self.hint_button = QPushButton("Hint")
+        self.hint_button.pressed.connect(self.show_hint)
+        self.hint_button.setFixedSize(150, 40)
+        self.hint_button.setEnabled(False)
+
         self.maze_drawer.set_draw_end_func(self.stop_play_timer)
+        self.maze_drawer.set_move_func(self.update_distance)
 
         self.maze_list = QComboBox()
-        self.maze_list.addItems(Maze.saved_mazes.keys())
+        sync_maze_list(self.maze_list, list(Maze.get_saved_mazes()), [])
+        # Keep the list in step with the saved mazes folder
+        get_library_watcher().mazes_changed.connect(self.library_changed)
 
         # Load all of the above widgets into the layout
         layout.addWidget(self.maze_name_label)
         layout.addWidget(self.maze_list)
         layout.addWidget(self.load_selected_button)
         layout.addWidget(self.clear_maze_button)
+        layout.addWidget(self.solver_text)
+        layout.addWidget(self.solver_list)
+        layout.addWidget(self.speed_text)
+        layout.addWidget(self.speed_list)
         layout.addWidget(self.animate_solve_button)
+        layout.addWidget(self.distance_label)
+        layout.addWidget(self.hint_button)
         layout.addWidget(self.play_timer_label)
+        layout.addWidget(self.stats_label)
+        layout.addWidget(self.stats_box)
         layout.addWidget(self.play_button)
         layout.addWidget(self.reset_play_button)
         layout.addWidget(self.help_button)
         layout.setAlignment(Qt.AlignmentFlag.AlignTop)
         self.setLayout(layout)
 
+    def library_changed(self, added, removed):
+        """
+        Triggered when saved mazes are added or removed, updates the maze list
+        @param added: List of added maze names
+        @param removed: List of removed maze names
+        """
+        sync_maze_list(self.maze_list, added, removed)
+
     def update(self):
         """
         Updates the play control and all sub-widgets
         """
-        # Load the saved mazes
-        Maze.load_saved_mazes()
-        self.maze_list.clear()
-        self.maze_list.addItems(Maze.saved_mazes.keys())
         if not self.maze:
             return
         # Once we have a maze, enable maze widgets
         self.clear_maze_button.setEnabled(True)
         self.animate_solve_button.setEnabled(True)
         self.play_button.setEnabled(True)
+        self.hint_button.setEnabled(True)
+        self.update_distance()
         self.maze_name_label.setText(self.maze.name)
-        if self.maze.name in Maze.saved_mazes:
+        if self.maze.name in Maze.get_saved_mazes():
             self.maze_list.setCurrentText(self.maze.name)
         self.maze_name_label.setFixedWidth(self.width())
         self.maze_drawer.update()
 
+    def update_distance(self):
+        """
+        Shows how far the player is from the end of the maze
+        """
+        if not self.maze or self.maze_drawer.position is None:
+            return
+        remaining = self.maze.distance_field().distance(self.maze_drawer.position)
+        if remaining is None:
+            self.distance_label.setText("No way to the end from here")
+        else:
+            self.distance_label.setText(f"Distance to end: {remaining}")
+
+    def show_hint(self):
+        """
+        Highlights the best next step from where the player is
+        """
+        if not self.maze or self.maze_drawer.position is None:
+            return
+        step = self.maze.distance_field().next_step(self.maze_drawer.position)
+        if step is None:
+            self.make_popup("There is no next step from here!")
+            return
+        self.maze_drawer.show_hint(step)
+
+    def toggle_stats(self, shown):
+        """
+        Triggered when the solver stats are shown or hidden
+        @param shown: Whether to show the stats
+        """
+        self.stats = Stats() if shown else None
+        self.stats_label.setVisible(shown)
+        self.update_stats()
+
+    def update_stats(self):
+        """
+        Shows the nodes the solver has expanded and how fast it expanded them
+        """
+        if self.stats is None:
+            return
+        expanded = self.stats.counters.get("solver.expanded", 0)
+        rate = self.stats.rate("solver.expanded", "solver")
+        text = f"Nodes expanded: {expanded}"
+        if rate is not None:
+            text += f"\nExpansions/sec: {rate:,.0f}"
+        self.stats_label.setText(text)
+
     def clear_timer(self):
         """
         Clears the play timer
@@ -169,7 +279,7 @@ class PlayControl(QWidget):
         """
         Triggered when the load maze button is pressed
         """
-        if len(Maze.saved_mazes) == 0:
+        if len(Maze.get_saved_mazes()) == 0:
             self.make_popup("No saved mazes!")
         else:
             if self.solving:
@@ -210,9 +320,13 @@ class PlayControl(QWidget):
             "You can remove parts of the path by clicking or dragging with the right "
             "mouse button\n"
             "You can watch an algorithm solve the maze by pressing the 'Watch Solver' "
-            "button\n"
+            "button, at the speed picked above it\n"
             "You can also set a timer for yourself (or the algorithm) to time the "
             "solve \n"
+            "Show the solver stats to see how many nodes the solver expanded and "
+            "how fast\n"
+            "Zoom in and out with the mouse wheel and drag with the middle mouse "
+            "button to move around, or click on the overview in the corner\n"
         )
         self.make_popup(help_message, title="Help")
 
@@ -237,34 +351,58 @@ class PlayControl(QWidget):
         if not self.solving:
             self.clear_maze()
             self.animate_solve_button.setText("Stop Solver")
-            self.timer.start(int(50 * (10 / self.maze.dim)))
-            self.animation_state = {
-                "nodes": set(),
-                "node_from": dict(),
-                "g_score": dict(),
-                "f_score": dict(),
-            }
+            self.animation_state = start_solver(
+                self.solver_list.currentText(),
+                self.maze,
+                instant=SPEEDS[self.speed_list.currentText()] is None,
+            )
+            self.animation_started = time.perf_counter()
+            self.animation_steps = 0
+            if self.stats is not None:
+                self.stats.reset()
+                self.update_stats()
+            self.timer.start(FRAME_INTERVAL)
         else:
             self.timer.stop()
             self.animate_solve_button.setText("Start Solver")
         self.solving = not self.solving
 
+    def speed_changed(self, speed):
+        """
+        Triggered when the animation speed is changed, carries on from where the
+        animation is at the new speed
+        @param speed: Name of the new speed
+        """
+        self.animation_started = time.perf_counter()
+        self.animation_steps = 0
+
     def run_animation_tick(self):
         """
-        Run one animation tick on the solver algorith, which draws one additional node
+        Run one animation frame of the solver algorithm, which draws as many
+        nodes as are due at the chosen speed, within the frame budget
         """
-        # We run one iteration of astar on the maze
-        result = self.maze.route_astar(
-            self.maze.start,
-            self.maze.end,
-            search_path=True,
-            animate=True,
-            state=self.animation_state,
+        now = time.perf_counter()
+        speed = SPEEDS[self.speed_list.currentText()]
+        if speed is None:
+            due = self.maze.dim * self.maze.dim
+        else:
+            due = int((now - self.animation_started) * speed) - self.animation_steps
+        steps, result = advance_solver(
+            self.maze,
+            self.animation_state,
+            due,
+            deadline=now + FRAME_BUDGET,
+            stats=self.stats,
         )
-        if result:
-            # animation result True = Win
+        self.animation_steps += steps
+        self.update_stats()
+        # Only the nodes marked this frame need drawing again
+        touched = self.animation_state["touched"]
+        self.maze_drawer.update_cells(touched)
+        touched.clear()
+        if result is not None:
+            # The solver is done, whether or not it found the end
             # Disable solver
             self.toggle_solver()
-            if self.play_timer_enabled:
+            if result.found and self.play_timer_enabled:
                 self.toggle_play_timer()
-        self.update()
@@ -1,5 +1,3 @@
-import pickle
-
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
     QComboBox,
@@ -9,6 +7,7 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
 )
 
+from src.GUI.Components.library_watcher import get_library_watcher, sync_maze_list
 from src.Maze.maze import Maze
 
 from .screen import Screen
@@ -39,7 +38,9 @@ class ShareScreen(Screen):
         self.save_selected_button.setMaximumWidth(self.width() * MAX_WIDGET_WIDTH)
 
         self.maze_list = QComboBox()
-        self.maze_list.addItems(Maze.saved_mazes.keys())
+        sync_maze_list(self.maze_list, list(Maze.get_saved_mazes()), [])
+        # Keep the list in step with the saved mazes folder
+        get_library_watcher().mazes_changed.connect(self.library_changed)
         self.maze_list.setMaximumWidth(self.width() * MAX_WIDGET_WIDTH)
 
         self.import_button = QPushButton("Import Maze File to Library")
@@ -65,12 +66,10 @@ class ShareScreen(Screen):
         chosen_file = QFileDialog.getOpenFileName(self, filter="Maze Files (*.maze)")
         if chosen_file[0]:
             try:
-                with open(chosen_file[0], "rb") as file:
-                    read_maze = pickle.load(file)
-                    read_maze.save_to_file()
-                    Maze.load_saved_mazes()
-                    self.update()
-                    self.make_popup("Successfully Loaded File!")
+                read_maze = Maze.load_from_file(chosen_file[0])
+                read_maze.save_to_file()
+                self.update()
+                self.make_popup("Successfully Loaded File!")
             except Exception:
                 self.make_popup("Something went wrong processing that file.")
 
@@ -81,7 +80,7 @@ class ShareScreen(Screen):
         # Make sure there is a maze
         # if there are any in the list, one is automatically
         # "selected" by PyQT even if we didn't manually do it
-        if len(Maze.saved_mazes) == 0:
+        if len(Maze.get_saved_mazes()) == 0:
             self.make_popup("No saved mazes!")
             return
         maze_selected = self.maze_list.currentText()
@@ -94,13 +93,18 @@ class ShareScreen(Screen):
             except Exception:
                 self.make_popup("Something went wrong saving that file.")
 
+    def library_changed(self, added, removed):
+        """
+        Triggered when saved mazes are added or removed, updates the maze list
+        @param added: List of added maze names
+        @param removed: List of removed maze names
+        """
+        sync_maze_list(self.maze_list, added, removed)
+
     def update(self):
         """
         Updates the share screen
         """
-        Maze.load_saved_mazes()
-        self.maze_list.clear()
-        self.maze_list.addItems(Maze.saved_mazes.keys())
         self.save_selected_button.setMaximumWidth(self.width() * MAX_WIDGET_WIDTH)
         self.maze_list.setMaximumWidth(self.width() * MAX_WIDGET_WIDTH)
         self.import_button.setMaximumWidth(self.width() * MAX_WIDGET_WIDTH)
@@ -23,20 +23,23 @@ class MazeGUI(QMainWindow):
         self.layout = QVBoxLayout()
         self.main_widget.setLayout(self.layout)
 
-        self.screens = {
-            "build": build_screen.BuildScreen(),
-            "home": home_screen.HomeScreen(
+        # Screens are only built the first time they are shown, so that startup
+        # doesn't wait on screens (and the maze library) that may never be used
+        self.screen_factories = {
+            "build": build_screen.BuildScreen,
+            "home": lambda: home_screen.HomeScreen(
                 self.play_pressed, self.build_pressed, self.share_pressed
             ),
-            "play": play_screen.PlayScreen(),
-            "share": share_screen.ShareScreen(),
+            "play": play_screen.PlayScreen,
+            "share": share_screen.ShareScreen,
         }
+        self.screens = {}
 
         self.header = header_bar.HeaderBar(self.back_pressed, self.home_pressed, "")
 
         self.header.resize(self.width(), self.height() * 0.15)
         self.active_widget_name = "home"
-        self.active_widget = self.screens["home"]
+        self.active_widget = self.get_screen("home")
         self.layout.addWidget(self.header)
         self.layout.addWidget(self.active_widget)
 
@@ -44,6 +47,15 @@ class MazeGUI(QMainWindow):
         self.screen_history.appendleft("home")
         self.active_widget.resize(self.width(), self.height() * 0.85)
 
+    def get_screen(self, screen_name):
+        """
+        Returns a screen, building it if it hasn't been shown before
+        @param screen_name: Name of the screen
+        """
+        if screen_name not in self.screens:
+            self.screens[screen_name] = self.screen_factories[screen_name]()
+        return self.screens[screen_name]
+
     def set_active_screen(self, screen_name):
         self.screen_history.appendleft(self.active_widget_name)
         if screen_name == "home":
@@ -58,7 +70,7 @@ class MazeGUI(QMainWindow):
         self.layout.addWidget(self.header)
         self.layout.removeWidget(self.active_widget)
         self.active_widget.setParent(None)
-        self.active_widget = self.screens[screen_name]
+        self.active_widget = self.get_screen(screen_name)
         self.active_widget_name = screen_name
         self.active_widget.update()
 
@@ -0,0 +1,327 @@
+import argparse
+import os
+import time
+from collections import namedtuple
+from functools import partial
+
+from . import maze_file
+from .generators import DEFAULT_GENERATOR, GENERATORS
+from .maze import MAZE_SAVE_PATH, Maze, make_save_path
+from .solvers import DEFAULT_SOLVER, SOLVERS, get_solver, solve
+
+# Result of solving one maze file, the path is a list of (row, col) nodes
+# and error holds a message instead if the file could not be solved at all
+SolveResult = namedtuple(
+    "SolveResult",
+    ["name", "filename", "solvable", "length", "expanded", "seconds", "path", "error"],
+)
+
+# One maze to generate, sent to a worker process
+GenerateJob = namedtuple(
+    "GenerateJob", ["name", "dim", "difficulty", "seed", "generator", "directory"]
+)
+
+# Result of generating one maze, which is already on disk by the time we get it
+GenerateResult = namedtuple(
+    "GenerateResult", ["name", "filename", "dim", "difficulty", "seed", "seconds"]
+)
+
+
+def resolve_maze_files(items):
+    """
+    Turns a list of saved maze names, maze files and directories into filenames
+    Directories are expanded to every .maze file inside of them
+    @param items: List of names or paths as strings
+    @return: List of filenames
+    """
+    filenames = []
+    for item in items:
+        if os.path.isdir(item):
+            filenames.extend(
+                os.path.join(item, filename)
+                for filename in sorted(os.listdir(item))
+                if filename.endswith(".maze")
+            )
+        elif os.path.isfile(item):
+            filenames.append(item)
+        elif item in Maze.get_saved_mazes():
+            filenames.append(Maze.saved_mazes[item])
+        else:
+            raise ValueError(f"No saved maze or file named {item!r}")
+    return filenames
+
+
+def solve_file(filename, include_path=True, solver=DEFAULT_SOLVER):
+    """
+    Loads and solves one maze file, meant to run inside of a worker process
+    Only the result goes back to the parent, never the Maze itself
+    @param filename: Maze file to solve
+    @param include_path: Whether to send the solved path back, default True
+    @param solver: Name of the solver to use, default A*
+    """
+    begin = time.perf_counter()
+    try:
+        maze = Maze.load_from_file(filename)
+        solution = solve(solver, maze)
+    except Exception as e:
+        return SolveResult(None, filename, False, 0, 0, 0.0, None, str(e))
+    return SolveResult(
+        maze.name,
+        filename,
+        solution.found,
+        len(solution.path),
+        solution.expanded,
+        time.perf_counter() - begin,
+        solution.path if include_path else None,
+        None,
+    )
+
+
+def solve_batch(
+    items, workers=None, chunksize=1, include_path=True, solver=DEFAULT_SOLVER
+):
+    """
+    Solves many mazes across a pool of worker processes
+    Results are yielded in the order of the mazes as soon as they are ready
+    @param items: List of saved maze names, maze files and directories
+    @param workers: Number of worker processes, defaults to one per core
+    @param chunksize: Number of mazes handed to a worker at once, default 1
+    @param include_path: Whether to send solved paths back, default True
+    @param solver: Name of the solver to use, default A*
+    """
+    # Process pools take a while to import, and only the batch functions use
+    # them, not the helpers the command line tools share
+    from concurrent.futures import ProcessPoolExecutor
+
+    get_solver(solver)
+    filenames = resolve_maze_files(items)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        solve_one = partial(solve_file, include_path=include_path, solver=solver)
+        for result in executor.map(solve_one, filenames, chunksize=chunksize):
+            yield result
+
+
+def generate_file(job):
+    """
+    Generates one maze and saves it, meant to run inside of a worker process
+    Only the result goes back to the parent, never the grid
+    @param job: GenerateJob describing the maze
+    """
+    begin = time.perf_counter()
+    # Each maze gets its own seed, so the same job always makes the same maze
+    # no matter which worker runs it or in what order
+    maze = Maze(job.name, job.dim, job.difficulty)
+    maze.randomize(job.generator, seed=job.seed)
+    filename = maze.make_filename(job.directory)
+    maze.save_to_file(filename=filename)
+    return GenerateResult(
+        job.name,
+        filename,
+        job.dim,
+        job.difficulty,
+        job.seed,
+        time.perf_counter() - begin,
+    )
+
+
+def directory_names(directory):
+    """
+    Returns the names of the mazes saved in a directory, read from the headers
+    of its .maze files, so a batch into it doesn't overwrite any of them
+    Files whose header can't be read are counted by their filename instead
+    @param directory: Directory to look in, which may not exist yet
+    @return: Set of maze names
+    """
+    names = set()
+    if not os.path.isdir(directory):
+        return names
+    for filename in os.listdir(directory):
+        stem, extension = os.path.splitext(filename)
+        if extension != ".maze":
+            continue
+        try:
+            names.add(maze_file.read_header(os.path.join(directory, filename)).name)
+        except (OSError, ValueError):
+            names.add(stem)
+    return names
+
+
+def make_generate_jobs(
+    count, dims, difficulties, seed, generator, prefix, directory, taken
+):
+    """
+    Plans count mazes, cycling through the dimensions and difficulties
+    @param count: Number of mazes
+    @param dims: List of dimensions
+    @param difficulties: List of difficulties
+    @param seed: Seed of the first maze, the rest count up from it
+    @param generator: Name of the generator to use
+    @param prefix: Start of every maze name, followed by a number
+    @param directory: Directory to save the mazes to
+    @param taken: Collection of names which are already used
+    """
+    jobs = []
+    number = 1
+    for index in range(count):
+        # Skip past names that are in use so nothing gets overwritten
+        while f"{prefix} {number}" in taken:
+            number += 1
+        jobs.append(
+            GenerateJob(
+                f"{prefix} {number}",
+                dims[index % len(dims)],
+                difficulties[index % len(difficulties)],
+                seed + index,
+                generator,
+                directory,
+            )
+        )
+        number += 1
+    return jobs
+
+
+def generate_batch(
+    count,
+    dims,
+    difficulties=(0,),
+    seed=0,
+    generator=DEFAULT_GENERATOR,
+    workers=None,
+    prefix="Generated",
+    directory=MAZE_SAVE_PATH,
+):
+    """
+    Generates many mazes across a pool of worker processes, straight to disk
+    Results are yielded as each maze is written, in whatever order they finish
+    @param count: Number of mazes
+    @param dims: List of dimensions to cycle through
+    @param difficulties: List of difficulties to cycle through, default easy
+    @param seed: Seed of the first maze, the rest count up from it, default 0
+    @param generator: Name of the generator to use, default the original one
+    @param workers: Number of worker processes, defaults to one per core
+    @param prefix: Start of every maze name, default "Generated"
+    @param directory: Directory to save the mazes to, default the library
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    if generator not in GENERATORS:
+        raise ValueError(f"Unknown maze generator {generator!r}")
+    in_library = os.path.abspath(directory) == os.path.abspath(MAZE_SAVE_PATH)
+    if in_library:
+        make_save_path()
+    taken = Maze.get_saved_mazes() if in_library else directory_names(directory)
+    jobs = make_generate_jobs(
+        count, dims, difficulties, seed, generator, prefix, directory, taken
+    )
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(generate_file, job) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            if in_library:
+                Maze.add_saved_maze(result.name, result.filename)
+            yield result
+
+
+def generate_command(args):
+    """
+    Runs the generate command from parsed command line arguments
+    @param args: argparse namespace
+    """
+    begin = time.perf_counter()
+    cells = 0
+    count = 0
+    for result in generate_batch(
+        args.count,
+        args.dims,
+        args.difficulties,
+        seed=args.seed,
+        generator=args.generator,
+        workers=args.workers,
+        prefix=args.prefix,
+        directory=args.directory,
+    ):
+        count += 1
+        cells += result.dim * result.dim
+        print(f"{result.name}: {result.dim}x{result.dim} -> {result.filename}")
+    elapsed = time.perf_counter() - begin
+    print(
+        f"Generated {count} mazes in {elapsed:.2f}s "
+        f"({count / elapsed:.1f} mazes/s, {cells / elapsed:.0f} cells/s)"
+    )
+    return 0
+
+
+def solve_command(args):
+    """
+    Runs the solve command from parsed command line arguments
+    @param args: argparse namespace
+    """
+    items = args.mazes or [MAZE_SAVE_PATH]
+    begin = time.perf_counter()
+    count = 0
+    unsolvable = 0
+    for result in solve_batch(
+        items,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        include_path=False,
+        solver=args.solver,
+    ):
+        count += 1
+        if result.error:
+            unsolvable += 1
+            print(f"ERROR    {result.filename}: {result.error}")
+            continue
+        if not result.solvable:
+            unsolvable += 1
+        print(
+            f"{'OK' if result.solvable else 'UNSOLVED':<8} {result.name}: "
+            f"length {result.length}, expanded {result.expanded}, "
+            f"{result.seconds:.3f}s"
+        )
+    elapsed = time.perf_counter() - begin
+    print(f"Solved {count - unsolvable}/{count} mazes in {elapsed:.2f}s")
+    return 1 if unsolvable else 0
+
+
+def main(argv=None):
+    """
+    Command line entry point for batch jobs, run with python -m src.Maze.batch
+    @param argv: Arguments to parse, defaults to sys.argv
+    """
+    parser = argparse.ArgumentParser(description="Batch jobs on maze libraries")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    solve = commands.add_parser(
+        "solve", help="Solve saved mazes, maze files or directories of maze files"
+    )
+    solve.add_argument(
+        "mazes", nargs="*", help="Names, files or directories, default the library"
+    )
+    solve.add_argument("--workers", type=int, default=None)
+    solve.add_argument("--chunksize", type=int, default=1)
+    solve.add_argument("--solver", choices=list(SOLVERS), default=DEFAULT_SOLVER)
+    solve.set_defaults(run=solve_command)
+
+    generate = commands.add_parser(
+        "generate", help="Generate mazes straight into the library"
+    )
+    generate.add_argument("count", type=int, help="Number of mazes")
+    generate.add_argument("--dims", type=int, nargs="+", default=[20])
+    generate.add_argument("--difficulties", type=int, nargs="+", default=[0])
+    generate.add_argument("--seed", type=int, default=0)
+    generate.add_argument(
+        "--generator", choices=list(GENERATORS), default=DEFAULT_GENERATOR
+    )
+    generate.add_argument("--workers", type=int, default=None)
+    generate.add_argument("--prefix", default="Generated")
+    generate.add_argument("--directory", default=MAZE_SAVE_PATH)
+    generate.set_defaults(run=generate_command)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
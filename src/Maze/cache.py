@@ -0,0 +1,80 @@
+import os
+from collections import OrderedDict, namedtuple
+
+# Mazes kept at once are limited by their total number of nodes, which is about
+# their size in memory, this fits a hundred 100x100 mazes or one 1000x1000 maze
+DEFAULT_MAX_CELLS = 1000000
+
+# A cached maze along with what its file looked like when it was loaded
+CacheEntry = namedtuple("CacheEntry", ["maze", "size", "mtime", "cells"])
+
+
+class MazeCache:
+    """
+    Least recently used cache of mazes loaded from files, by filename
+    A file that changed on disk since it was cached is loaded again
+    Callers get copies of the cached mazes, which share the cached grid until
+    they are changed, so editing a maze never touches the cached original
+    """
+
+    def __init__(self, load, max_cells=DEFAULT_MAX_CELLS):
+        """
+        Initializes a MazeCache
+        @param load: Function loading a maze from a filename
+        @param max_cells: Most nodes to keep across all cached mazes
+        """
+        self.load = load
+        self.max_cells = max_cells
+        self.entries = OrderedDict()
+        self.cells = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, filename):
+        """
+        Returns a copy of the maze in a file, loading it if it isn't cached
+        @param filename: Filename as a string
+        """
+        stat = os.stat(filename)
+        entry = self.entries.get(filename)
+        if entry is not None and (entry.size, entry.mtime) == (
+            stat.st_size,
+            stat.st_mtime_ns,
+        ):
+            self.hits += 1
+            self.entries.move_to_end(filename)
+            return entry.maze.copy()
+        self.misses += 1
+        self.invalidate(filename)
+        maze = self.load(filename)
+        cells = maze.dim * maze.dim
+        if cells <= self.max_cells:
+            self.entries[filename] = CacheEntry(
+                maze, stat.st_size, stat.st_mtime_ns, cells
+            )
+            self.cells += cells
+            while self.cells > self.max_cells:
+                self.cells -= self.entries.popitem(last=False)[1].cells
+        return maze.copy()
+
+    def invalidate(self, filename=None):
+        """
+        Drops a file from the cache, or every file if none is given
+        @param filename: Filename as a string
+        """
+        if filename is None:
+            self.entries.clear()
+            self.cells = 0
+        elif filename in self.entries:
+            self.cells -= self.entries.pop(filename).cells
+
+    def stats(self):
+        """
+        Returns a dict of cache hits, misses, cached mazes and cached nodes
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "mazes": len(self.entries),
+            "cells": self.cells,
+        }
@@ -0,0 +1,190 @@
+import hashlib
+import os
+import sqlite3
+from collections import namedtuple
+
+from . import maze_file
+
+# Ending of the catalog file, which goes beside the directory it describes
+# rather than in it, since older versions read every file in the library
+# folder as a maze, and users see what is in that folder
+CATALOG_SUFFIX = ".catalog.sqlite3"
+# Name of the catalog file earlier versions kept inside of the directory
+OLD_CATALOG_FILENAME = "catalog.sqlite3"
+# Bumped whenever the table changes, which throws the old catalog away
+CATALOG_VERSION = 1
+
+# What the catalog knows about one maze file, without opening the file
+CatalogEntry = namedtuple(
+    "CatalogEntry",
+    ["name", "filename", "dim", "difficulty", "size", "mtime", "hash"],
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mazes (
+    filename TEXT PRIMARY KEY,
+    name TEXT,
+    dim INTEGER,
+    difficulty INTEGER,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    hash TEXT
+)
+"""
+
+
+def catalog_path(directory):
+    """
+    Returns where the catalog of a directory goes by default, beside it
+    @param directory: Directory of .maze files
+    """
+    return os.path.normpath(os.path.abspath(directory)) + CATALOG_SUFFIX
+
+
+class MazeCatalog:
+    """
+    Persistent index of the .maze files in a directory, stored with SQLite
+    Each file is read once when it first shows up or when its size or mtime
+    changes, so listing and filtering the library never has to open maze files
+    Files that can't be read are remembered too, with no name, until they change
+    """
+
+    def __init__(self, directory, path=None):
+        """
+        Initializes a MazeCatalog, creating the catalog if it doesn't exist yet
+        @param directory: Directory of .maze files to index
+        @param path: Catalog file, defaults to the directory's name followed by
+        CATALOG_SUFFIX, beside the directory
+        """
+        self.directory = directory
+        self.path = path or catalog_path(directory)
+        try:
+            self.connection = sqlite3.connect(self.path)
+            self._create()
+        except sqlite3.Error:
+            # The catalog is only a cache, so if it can't be stored on disk
+            # keep it in memory for this run instead
+            self.connection = sqlite3.connect(":memory:")
+            self._create()
+
+    def _create(self):
+        """
+        Creates the table, replacing a catalog left by another CATALOG_VERSION
+        """
+        with self.connection:
+            version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != CATALOG_VERSION:
+                self.connection.execute("DROP TABLE IF EXISTS mazes")
+                self.connection.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+            self.connection.execute(SCHEMA)
+
+    def refresh(self):
+        """
+        Brings the catalog up to date with the directory
+        Only files which are new or whose size or mtime changed get read
+        @return: Number of files added, changed or removed
+        """
+        known = {
+            filename: (size, mtime)
+            for filename, size, mtime in self.connection.execute(
+                "SELECT filename, size, mtime FROM mazes"
+            )
+        }
+        changes = 0
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            entries = []
+        with self.connection:
+            for entry in entries:
+                if not entry.name.endswith(".maze") or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                seen = known.pop(entry.path, None)
+                if seen == (stat.st_size, stat.st_mtime_ns):
+                    continue
+                self._index(entry.path, stat)
+                changes += 1
+            # Anything left over was deleted or renamed
+            self.connection.executemany(
+                "DELETE FROM mazes WHERE filename = ?", [(name,) for name in known]
+            )
+        return changes + len(known)
+
+    def _index(self, filename, stat):
+        """
+        Reads one maze file into the catalog
+        @param filename: Maze file
+        @param stat: os.stat_result of the file
+        """
+        name = dim = difficulty = digest = None
+        try:
+            with open(filename, "rb") as file:
+                data = file.read()
+            digest = hashlib.sha1(data).hexdigest()
+            if data.startswith(maze_file.MAGIC):
+                header = maze_file.parse_header(data)[0]
+                name, dim, difficulty = header.name, header.dim, header.difficulty
+            else:
+                # Mazes from before the binary format have to be fully loaded
+                maze = maze_file.load_pickle(data)
+                name, dim, difficulty = maze.name, maze.dim, maze.difficulty
+        except Exception:
+            name = dim = difficulty = None
+        self.connection.execute(
+            "INSERT OR REPLACE INTO mazes VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                filename,
+                name,
+                dim,
+                difficulty,
+                stat.st_size,
+                stat.st_mtime_ns,
+                digest,
+            ),
+        )
+
+    def query(self, dim=None, difficulty=None, name=None, digest=None):
+        """
+        Returns the catalogued mazes matching every given filter, sorted by name
+        @param dim: Only mazes of this dimension
+        @param difficulty: Only mazes of this difficulty
+        @param name: Only mazes with this name
+        @param digest: Only mazes whose file has this content hash
+        @return: List of CatalogEntry
+        """
+        conditions = ["name IS NOT NULL"]
+        values = []
+        for column, value in (
+            ("dim", dim),
+            ("difficulty", difficulty),
+            ("name", name),
+            ("hash", digest),
+        ):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                values.append(value)
+        rows = self.connection.execute(
+            "SELECT name, filename, dim, difficulty, size, mtime, hash FROM mazes "
+            f"WHERE {' AND '.join(conditions)} ORDER BY name, mtime, filename",
+            values,
+        )
+        return [CatalogEntry(*row) for row in rows]
+
+    def names(self):
+        """
+        Returns a dict of maze name to filename, sorted by name
+        If two files share a name, the most recently modified one wins
+        """
+        return {entry.name: entry.filename for entry in self.query()}
+
+    def __len__(self):
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM mazes WHERE name IS NOT NULL"
+        ).fetchone()[0]
+
+    def close(self):
+        """
+        Closes the catalog
+        """
+        self.connection.close()
@@ -0,0 +1,219 @@
+from collections import deque
+
+from .grid import PATH_TABLE
+from .reachability import group_runs
+
+# Offsets of the 8 nodes around a node in order around the ring, as
+# (row change, col change), starting above and going clockwise, so the direct
+# neighbors are at the even positions
+RING = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+
+
+class PathConnectivity:
+    """
+    Which path (non-wall) nodes of a grid are connected to each other, kept up
+    to date while the grid is edited
+
+    Path nodes are grouped into regions with union-find. A wall turning into a
+    path just joins the regions around it. A path turning into a wall can split
+    its region, which union-find can't undo. Nothing needs doing if the path
+    neighbors of the node are still joined to each other through the nodes
+    around it. Otherwise the neighbors are searched out from in turns until all
+    but one search run out of nodes, and the pieces those searches cover get
+    new elements, so a split only costs about the size of the smaller pieces
+
+    A path that becomes a wall stays behind in its old region as a dead element,
+    and gets a brand new element if it becomes a path again, so old unions never
+    join up regions that are no longer connected
+    """
+
+    def __init__(self, grid):
+        """
+        Initializes a PathConnectivity, the regions are built on first query
+        @param grid: Grid to track, changes made other than through set_node
+        cause a rebuild
+        """
+        self.grid = grid
+        self.dim = grid.dim
+        self.regions = None
+        # Element of every node which became a path since the last rebuild,
+        # every other node is the element at its flat index
+        self.elements = {}
+        self.wall_version = grid.wall_version
+        self.rebuilds = 0
+
+    def is_current(self, grid):
+        """
+        Returns whether the regions still describe a grid
+        @param grid: Grid of the maze
+        """
+        return (
+            grid is self.grid
+            and self.regions is not None
+            and grid.wall_version == self.wall_version
+        )
+
+    def rebuild(self):
+        """
+        Regroups every path node into its connected region
+        """
+        self.regions = group_runs(self.grid.cells.translate(PATH_TABLE), self.dim)
+        self.elements = {}
+        self.wall_version = self.grid.wall_version
+        self.rebuilds += 1
+
+    def element(self, index):
+        """
+        Returns the union-find element of a path node
+        @param index: Flat index of node
+        """
+        return self.elements.get(index, index)
+
+    def is_path(self, row, col):
+        """
+        Returns whether a node is inside the grid and not a wall
+        @param row: Row of node
+        @param col: Column of node
+        """
+        dim = self.dim
+        return (
+            0 <= row < dim and 0 <= col < dim and self.grid.cells[row * dim + col] != 1
+        )
+
+    def stays_connected(self, row, col):
+        """
+        Returns whether the path neighbors of a node are joined to each other
+        through the 8 nodes around it, in which case turning the node into a
+        wall can't split its region
+        @param row: Row of node
+        @param col: Column of node
+        """
+        ring = [self.is_path(row + d_row, col + d_col) for d_row, d_col in RING]
+        # Count the runs of paths around the ring with a direct neighbor in them,
+        # a run of just a diagonal node doesn't touch the node at all
+        runs = 0
+        for start in range(8):
+            if not ring[start] or ring[start - 1]:
+                continue
+            end = start
+            while ring[(end + 1) % 8]:
+                end += 1
+            if end > start or start % 2 == 0:
+                runs += 1
+        return runs <= 1
+
+    def split(self, index):
+        """
+        Gives new elements to any pieces cut off from the rest of a region by
+        a node becoming a wall
+        Breadth first searches run from every path neighbor of the node one step
+        at a time each, and searches that run into each other are merged, until
+        at most one search is left with nodes to visit. The others have covered
+        whole pieces of the old region, which get new elements
+        At worst the searches cover the grid a few times over, about the same
+        as a rebuild, but usually a piece cut off is small
+        @param index: Flat index of the node, already a wall
+        """
+        cells = self.grid.cells
+        starts = [
+            neighbor for neighbor in self.grid.neighbors(index) if cells[neighbor] != 1
+        ]
+        # Searches are merged by pointing them at the search they merged into
+        merged = list(range(len(starts)))
+
+        def owner(search):
+            while merged[search] != search:
+                search = merged[search]
+            return search
+
+        seen = {start: search for search, start in enumerate(starts)}
+        queues = [deque([start]) for start in starts]
+        while len({owner(search) for search, queue in enumerate(queues) if queue}) > 1:
+            for search, queue in enumerate(queues):
+                if not queue:
+                    continue
+                current = queue.popleft()
+                for neighbor in self.grid.neighbors(current):
+                    if cells[neighbor] == 1:
+                        continue
+                    if neighbor not in seen:
+                        seen[neighbor] = search
+                        queue.append(neighbor)
+                        continue
+                    ours, theirs = owner(search), owner(seen[neighbor])
+                    if ours != theirs:
+                        merged[theirs] = ours
+        # Everything seen by a search that ran out is a piece of its own
+        remaining = {owner(search) for search, queue in enumerate(queues) if queue}
+        pieces = {}
+        for node, search in seen.items():
+            search = owner(search)
+            if search in remaining:
+                continue
+            element = self.regions.add()
+            self.elements[node] = element
+            if search in pieces:
+                self.regions.union(pieces[search], element)
+            else:
+                pieces[search] = element
+
+    def set_node(self, node, value):
+        """
+        Sets the type of a node, keeping the regions up to date
+        @param node: (row, col) of node
+        @param value: New node type
+        """
+        row, col = node
+        index = row * self.dim + col
+        was_wall = self.grid.get(index) == 1
+        current = self.is_current(self.grid)
+        self.grid.set(index, value)
+        if not current or was_wall == (value == 1):
+            return
+        self.wall_version = self.grid.wall_version
+        if was_wall:
+            element = self.regions.add()
+            self.elements[index] = element
+            for neighbor in self.grid.neighbors(index):
+                if self.grid.cells[neighbor] != 1:
+                    self.regions.union(element, self.element(neighbor))
+        elif not self.stays_connected(row, col):
+            self.split(index)
+        # Dead elements pile up with edits, so start over once there are many
+        if len(self.elements) > self.dim * self.dim:
+            self.regions = None
+
+    def region(self, node):
+        """
+        Returns a number naming the region of a node, which is the same for
+        every node in the region
+        @param node: (row, col) of node
+        @return: Region number, or None for a wall
+        """
+        if not self.is_current(self.grid):
+            self.rebuild()
+        index = node[0] * self.dim + node[1]
+        if self.grid.cells[index] == 1:
+            return None
+        return self.regions.find(self.element(index))
+
+    def connected(self, src, dest):
+        """
+        Returns whether dest can be reached from src through path nodes
+        Same answer as Maze.route_astar(src, dest, search_path=True), which lets
+        a wall source step off onto a path next to it
+        @param src: Source (row, col)
+        @param dest: Destination (row, col)
+        """
+        if tuple(src) == tuple(dest):
+            return True
+        dest_region = self.region(dest)
+        if dest_region is None:
+            return False
+        src_region = self.region(src)
+        if src_region is not None:
+            return src_region == dest_region
+        return any(
+            self.region(divmod(neighbor, self.dim)) == dest_region
+            for neighbor in self.grid.neighbors(src[0] * self.dim + src[1])
+        )
@@ -0,0 +1,111 @@
+from array import array
+from collections import deque
+
+
+class DistanceField:
+    """
+    Distance from every node of a grid to one destination, through non-wall nodes
+    Built with a single breadth first search out from the destination, after
+    which solvability, distance remaining and the best next step from any node
+    are all single lookups
+
+    The field only depends on which nodes are walls, so marking nodes as path
+    (2) doesn't affect it, but turning a wall into a path or back does. The
+    grid counts those changes in wall_version, which is how is_current tells
+    that the field is out of date
+    """
+
+    def __init__(self, grid, dest):
+        """
+        Initializes a DistanceField, running the search
+        @param grid: Grid of the maze
+        @param dest: Destination (row, col)
+        """
+        self.grid = grid
+        self.dest = tuple(dest)
+        self.wall_version = grid.wall_version
+        dim = grid.dim
+        cells = grid.cells
+        masks = grid.masks
+        moves = grid.moves
+        start = self.dest[0] * dim + self.dest[1]
+        # -1 marks nodes the destination can't be reached from
+        distances = array("i", [-1]) * (dim * dim)
+        distances[start] = 0
+        # A wall destination can still be asked about, but leads nowhere
+        queue = deque([start] if cells[start] != 1 else [])
+        while queue:
+            current = queue.popleft()
+            step = distances[current] + 1
+            for move in moves[masks[current]]:
+                neighbor = current + move[0]
+                if distances[neighbor] == -1 and cells[neighbor] != 1:
+                    distances[neighbor] = step
+                    queue.append(neighbor)
+        self.distances = distances
+
+    def is_current(self, grid, dest):
+        """
+        Returns whether the field still describes a grid and destination
+        @param grid: Grid of the maze
+        @param dest: Destination (row, col)
+        """
+        return (
+            grid is self.grid
+            and grid.wall_version == self.wall_version
+            and tuple(dest) == self.dest
+        )
+
+    def rebind(self, grid):
+        """
+        Returns the same field for a copy of the grid it was built for
+        @param grid: Copy of the grid, with the same walls
+        """
+        field = DistanceField.__new__(DistanceField)
+        field.__dict__.update(self.__dict__)
+        field.grid = grid
+        return field
+
+    def distance(self, node):
+        """
+        Returns the number of steps from a node to the destination
+        A wall node can still step off onto a path next to it, the same way
+        Maze.route_astar treats a wall as its source
+        @param node: (row, col) of node
+        @return: Number of steps, or None if the destination can't be reached
+        """
+        node = tuple(node)
+        if node == self.dest:
+            return 0
+        index = node[0] * self.grid.dim + node[1]
+        if self.grid.cells[index] != 1:
+            found = self.distances[index]
+            return None if found == -1 else found
+        found = [
+            self.distances[index + move[0]]
+            for move in self.grid.moves[self.grid.masks[index]]
+            if self.grid.cells[index + move[0]] != 1
+            and self.distances[index + move[0]] != -1
+        ]
+        return min(found) + 1 if found else None
+
+    def next_step(self, node):
+        """
+        Returns the neighbor of a node which is one step closer to the destination
+        @param node: (row, col) of node
+        @return: (row, col) of the next node, or None if node is the destination
+        or the destination can't be reached
+        """
+        remaining = self.distance(node)
+        if not remaining:
+            return None
+        row, col = node
+        index = row * self.grid.dim + col
+        for offset, d_row, d_col in self.grid.moves[self.grid.masks[index]]:
+            neighbor = (row + d_row, col + d_col)
+            if (remaining == 1 and neighbor == self.dest) or (
+                self.grid.cells[index + offset] != 1
+                and self.distances[index + offset] == remaining - 1
+            ):
+                return neighbor
+        return None
@@ -0,0 +1,131 @@
+"""
+Formats for sharing mazes outside of the program, none of which need Qt
+
+JSON holds everything about a maze, with the grid as one string per row of
+"1" for a wall and "0" for anything else
+Text and PNG are pictures of a maze, with rows going down and columns going
+across, which is the view in the program flipped along its diagonal
+"""
+import struct
+import zlib
+
+from .grid import Grid
+from .maze import Maze
+
+# Colors of the PNG palette, indexed by node type, then the start and the end
+PALETTE = (
+    (255, 255, 255),
+    (0, 0, 0),
+    (0, 255, 255),
+    (0, 255, 0),
+    (255, 0, 0),
+)
+START_COLOR = 3
+END_COLOR = 4
+# Maps node types to palette colors, any marked node is drawn as a path mark
+NODE_COLORS = bytes(min(value, 2) for value in range(256))
+# Characters of a text picture, indexed the same way as PALETTE
+TEXT_NODES = ".#o"
+TEXT_START = "S"
+TEXT_END = "E"
+NODE_TEXT = bytes(ord(TEXT_NODES[color]) for color in NODE_COLORS)
+# Maps node types to a "1" for a wall and a "0" for anything else, and back
+WALL_TEXT = bytes(ord("1") if value == 1 else ord("0") for value in range(256))
+TEXT_WALLS = bytes(1 if value == ord("1") else 0 for value in range(256))
+
+
+def to_dict(maze):
+    """
+    Returns a maze as a dict ready to be dumped as JSON
+    @param maze: Maze to convert
+    """
+    return {
+        "name": maze.name,
+        "dim": maze.dim,
+        "difficulty": maze.difficulty,
+        "start": list(maze.start),
+        "end": list(maze.end),
+        "grid": [
+            bytes(maze.grid.row(row)).translate(WALL_TEXT).decode("ascii")
+            for row in range(maze.dim)
+        ],
+    }
+
+
+def from_dict(data):
+    """
+    Returns a Maze made from a dict like the ones from to_dict
+    @param data: Dict loaded from JSON
+    """
+    dim = data["dim"]
+    rows = data["grid"]
+    if len(rows) != dim or any(len(row) != dim for row in rows):
+        raise ValueError(f"Expected {dim} rows of {dim} nodes")
+    cells = "".join(rows).encode("ascii").translate(TEXT_WALLS)
+    maze = Maze(data["name"], dim, data.get("difficulty", 0))
+    maze.grid = Grid(dim, cells=cells)
+    maze.start = tuple(data.get("start", maze.start))
+    maze.end = tuple(data.get("end", maze.end))
+    return maze
+
+
+def to_text(maze):
+    """
+    Returns a picture of a maze as text, one line per row
+    @param maze: Maze to draw
+    """
+    lines = []
+    for row in range(maze.dim):
+        line = bytearray(bytes(maze.grid.row(row)).translate(NODE_TEXT))
+        if maze.start[0] == row:
+            line[maze.start[1]] = ord(TEXT_START)
+        if maze.end[0] == row:
+            line[maze.end[1]] = ord(TEXT_END)
+        lines.append(line.decode("ascii"))
+    return "\n".join(lines) + "\n"
+
+
+def png_chunk(kind, data):
+    """
+    Returns one chunk of a PNG file
+    @param kind: 4 byte chunk type
+    @param data: Chunk contents
+    """
+    return (
+        struct.pack(">I", len(data))
+        + kind
+        + data
+        + struct.pack(">I", zlib.crc32(kind + data))
+    )
+
+
+def to_png(maze, scale=1):
+    """
+    Returns a picture of a maze as the bytes of a PNG file, drawn with the
+    node types as indices into a palette, so no image library is needed
+    @param maze: Maze to draw
+    @param scale: Size of a node in pixels, default 1
+    """
+    dim = maze.dim
+    size = dim * scale
+    lines = []
+    for row in range(dim):
+        values = bytearray(bytes(maze.grid.row(row)).translate(NODE_COLORS))
+        if maze.start[0] == row:
+            values[maze.start[1]] = START_COLOR
+        if maze.end[0] == row:
+            values[maze.end[1]] = END_COLOR
+        # Every node repeats scale times across, and the line scale times down
+        line = bytearray(size)
+        for repeat in range(scale):
+            line[repeat::scale] = values
+        lines.extend([b"\x00" + line] * scale)
+    header = struct.pack(">IIBBBBB", size, size, 8, 3, 0, 0, 0)
+    palette = b"".join(bytes(color) for color in PALETTE)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + png_chunk(b"IHDR", header)
+        + png_chunk(b"PLTE", palette)
+        + png_chunk(b"IDAT", zlib.compress(b"".join(lines)))
+        + png_chunk(b"IEND", b"")
+    )
@@ -0,0 +1,287 @@
+from .grid import Grid
+from .reachability import DisjointSet
+
+# Every maze generator, by name, in the order they should be offered
+# A generator is a function taking the maze to randomize and a random.Random
+# Its version must go up whenever it changes what maze a seed makes
+GENERATORS = {}
+DEFAULT_GENERATOR = "snaking"
+
+
+def register_generator(name, version=1):
+    """
+    Decorator adding a generator function to GENERATORS under a name
+    @param name: Name to select the generator by
+    @param version: Version of the generator, default 1
+    """
+
+    def register(generator):
+        generator.version = version
+        GENERATORS[name] = generator
+        return generator
+
+    return register
+
+
+def get_generator(name):
+    """
+    Returns the generator registered under a name
+    @param name: Name of the generator
+    """
+    if name not in GENERATORS:
+        raise ValueError(f"Unknown maze generator {name!r}")
+    return GENERATORS[name]
+
+
+@register_generator("snaking")
+def snaking(maze, rng):
+    """
+    The original snake-then-branch algorithm, which respects difficulty
+    @param maze: Maze to randomize
+    @param rng: Random number generator
+    """
+    maze.snake_randomize(rng)
+
+
+class Lattice:
+    """
+    The nodes of a maze that line up with its start, every other row and column
+    The classic generators carve a spanning tree over these nodes, knocking out
+    the wall node between two lattice nodes to connect them
+    Lattice nodes are numbered row by row, from 0 to len(lattice) - 1
+
+    Carving writes straight to the cells of a new grid, skipping the
+    bookkeeping of Grid.set, so nothing may read the grid between making the
+    lattice and calling finish, which tells the grid its cells changed
+    """
+
+    def __init__(self, maze):
+        """
+        Initializes a Lattice and sets the maze up as all walls
+        @param maze: Maze to randomize
+        """
+        self.maze = maze
+        self.dim = maze.dim
+        self.rows = range(maze.start[0] % 2, self.dim, 2)
+        self.cols = range(maze.start[1] % 2, self.dim, 2)
+        self.height = len(self.rows)
+        self.width = len(self.cols)
+        self.grid = Grid(self.dim, fill=1)
+        maze.grid = self.grid
+
+    def __len__(self):
+        return self.height * self.width
+
+    @property
+    def start(self):
+        """
+        Lattice number of the maze start
+        """
+        return (self.maze.start[0] // 2) * self.width + self.maze.start[1] // 2
+
+    def node_index(self, cell):
+        """
+        Returns the flat grid index of a lattice node
+        @param cell: Lattice number
+        """
+        row = self.rows[cell // self.width]
+        col = self.cols[cell % self.width]
+        return row * self.dim + col
+
+    def neighbors(self, cell):
+        """
+        Returns the lattice numbers of the lattice nodes next to a lattice node
+        @param cell: Lattice number
+        """
+        row, col = divmod(cell, self.width)
+        neighbors = []
+        if row > 0:
+            neighbors.append(cell - self.width)
+        if col > 0:
+            neighbors.append(cell - 1)
+        if col < self.width - 1:
+            neighbors.append(cell + 1)
+        if row < self.height - 1:
+            neighbors.append(cell + self.width)
+        return neighbors
+
+    def edges(self):
+        """
+        Returns every pair of neighboring lattice nodes
+        """
+        edges = []
+        for cell in range(len(self)):
+            if cell % self.width < self.width - 1:
+                edges.append((cell, cell + 1))
+            if cell + self.width < len(self):
+                edges.append((cell, cell + self.width))
+        return edges
+
+    def carve(self, a, b):
+        """
+        Opens two neighboring lattice nodes and the wall node between them
+        @param a: Lattice number
+        @param b: Lattice number
+        """
+        a = self.node_index(a)
+        b = self.node_index(b)
+        cells = self.grid.cells
+        cells[a] = 0
+        cells[(a + b) // 2] = 0
+        cells[b] = 0
+
+    def finish(self, rng):
+        """
+        Connects the maze end, which may be off the lattice, to the carved maze
+        @param rng: Random number generator
+        """
+        # A lattice with a single node has nothing carved yet
+        self.grid.cells[self.node_index(self.start)] = 0
+        self.grid.cells_changed()
+        row, col = self.maze.end
+        self.grid[row, col] = 0
+        if (row - self.rows.start) % 2 == 0 or (col - self.cols.start) % 2 == 0:
+            # The end is on the lattice, or next to a lattice node
+            return
+        # Otherwise the end sits diagonally between lattice nodes, and we need to
+        # open one of the walls next to it that leads to a lattice node
+        options = [
+            (row + d_row, col + d_col)
+            for d_row, d_col in ((-1, 0), (0, -1), (0, 1), (1, 0))
+            if 0 <= row + d_row < self.dim and 0 <= col + d_col < self.dim
+        ]
+        if any(self.grid[node] == 0 for node in options):
+            return
+        self.grid[rng.choice(options)] = 0
+
+
+@register_generator("backtracker")
+def recursive_backtracker(maze, rng):
+    """
+    Depth first search with random neighbor order, run with an explicit stack
+    @param maze: Maze to randomize
+    @param rng: Random number generator
+    """
+    lattice = Lattice(maze)
+    visited = bytearray(len(lattice))
+    stack = [lattice.start]
+    visited[lattice.start] = 1
+    while stack:
+        current = stack[-1]
+        options = [cell for cell in lattice.neighbors(current) if not visited[cell]]
+        if not options:
+            stack.pop()
+            continue
+        chosen = rng.choice(options)
+        lattice.carve(current, chosen)
+        visited[chosen] = 1
+        stack.append(chosen)
+    lattice.finish(rng)
+
+
+@register_generator("kruskal")
+def kruskal(maze, rng):
+    """
+    Randomized Kruskal's algorithm, joining regions over edges in random order
+    @param maze: Maze to randomize
+    @param rng: Random number generator
+    """
+    lattice = Lattice(maze)
+    regions = DisjointSet(len(lattice))
+    edges = lattice.edges()
+    rng.shuffle(edges)
+    for a, b in edges:
+        if regions.union(a, b):
+            lattice.carve(a, b)
+    lattice.finish(rng)
+
+
+@register_generator("prim")
+def prim(maze, rng):
+    """
+    Randomized Prim's algorithm, growing the maze from a random frontier node
+    @param maze: Maze to randomize
+    @param rng: Random number generator
+    """
+    lattice = Lattice(maze)
+    # 0 is untouched, 1 is on the frontier and 2 is part of the maze
+    status = bytearray(len(lattice))
+    status[lattice.start] = 2
+    frontier = lattice.neighbors(lattice.start)
+    for cell in frontier:
+        status[cell] = 1
+    while frontier:
+        # Swap a random frontier node to the end so it can be removed in O(1)
+        pick = rng.randrange(len(frontier))
+        frontier[pick], frontier[-1] = frontier[-1], frontier[pick]
+        current = frontier.pop()
+        neighbors = lattice.neighbors(current)
+        lattice.carve(current, rng.choice([n for n in neighbors if status[n] == 2]))
+        status[current] = 2
+        for neighbor in neighbors:
+            if status[neighbor] == 0:
+                status[neighbor] = 1
+                frontier.append(neighbor)
+    lattice.finish(rng)
+
+
+@register_generator("wilson")
+def wilson(maze, rng):
+    """
+    Wilson's algorithm, adding loop-erased random walks to the maze
+    Gives an unbiased sample out of every possible perfect maze
+    @param maze: Maze to randomize
+    @param rng: Random number generator
+    """
+    lattice = Lattice(maze)
+    in_maze = bytearray(len(lattice))
+    in_maze[lattice.start] = 1
+    # Where the walk went last from each node, overwriting a node's exit
+    # erases any loop the walk made through it
+    exits = {}
+    order = list(range(len(lattice)))
+    rng.shuffle(order)
+    for begin in order:
+        current = begin
+        while not in_maze[current]:
+            exits[current] = rng.choice(lattice.neighbors(current))
+            current = exits[current]
+        current = begin
+        while not in_maze[current]:
+            in_maze[current] = 1
+            lattice.carve(current, exits[current])
+            current = exits[current]
+        exits.clear()
+    lattice.finish(rng)
+
+
+@register_generator("eller")
+def eller(maze, rng):
+    """
+    Eller's algorithm, building the maze one row at a time
+    @param maze: Maze to randomize
+    @param rng: Random number generator
+    """
+    lattice = Lattice(maze)
+    regions = DisjointSet(len(lattice))
+    width = lattice.width
+    for row in range(lattice.height):
+        first = row * width
+        last_row = row == lattice.height - 1
+        # Randomly join neighbors in different regions, and join all of them on
+        # the last row so that the maze ends up connected
+        for cell in range(first, first + width - 1):
+            if (last_row or rng.random() < 0.5) and regions.union(cell, cell + 1):
+                lattice.carve(cell, cell + 1)
+        if last_row:
+            break
+        # Every region must continue down at least once
+        members = {}
+        for cell in range(first, first + width):
+            members.setdefault(regions.find(cell), []).append(cell)
+        for cells in members.values():
+            rng.shuffle(cells)
+            for cell in cells[: rng.randint(1, len(cells))]:
+                regions.union(cell, cell + width)
+                lattice.carve(cell, cell + width)
+    lattice.finish(rng)
@@ -0,0 +1,424 @@
+import functools
+import operator
+
+# The 4 possible movements (no diagonals), as (row change, col change)
+DELTAS = ((-1, 0), (0, -1), (0, 1), (1, 0))
+# Maps every node type to 1 if it is a path (anything but a wall) or 0 if not
+PATH_TABLE = bytes(0 if value == 1 else 1 for value in range(256))
+
+
+def line_nodes(start, end):
+    """
+    Returns the nodes on a straight line between two nodes, like Bresenham's
+    line algorithm but only ever stepping one row or one column at a time, so
+    that every node is next to the one before it
+    @param start: (row, col) to start at
+    @param end: (row, col) to end at
+    @return: List of (row, col) from start to end, both included
+    """
+    row, col = start
+    rows = abs(end[0] - row)
+    cols = abs(end[1] - col)
+    row_step = 1 if end[0] > row else -1
+    col_step = 1 if end[1] > col else -1
+    nodes = [(row, col)]
+    row_steps = col_steps = 0
+    for _ in range(rows + cols):
+        # Step along whichever way keeps the next node's middle closest to the
+        # line, comparing (row_steps + 0.5) / rows with (col_steps + 0.5) / cols
+        if (1 + 2 * row_steps) * cols < (1 + 2 * col_steps) * rows:
+            row += row_step
+            row_steps += 1
+        else:
+            col += col_step
+            col_steps += 1
+        nodes.append((row, col))
+    return nodes
+
+
+@functools.lru_cache(maxsize=8)
+def bounds_table(dim):
+    """
+    Precomputes which movements stay inside a grid of a given dimension
+    Every node gets a bit mask, with bit k set if DELTAS[k] stays inside the grid
+    Only the border rows and columns differ, so this is one byte per node
+    @param dim: Dimension of the grid
+    @return: (masks, moves), where moves[mask] is a tuple of
+    (flat offset, row change, col change) for every movement allowed by mask
+    """
+
+    def row_masks(row):
+        return bytes(
+            sum(
+                1 << k
+                for k, (d_row, d_col) in enumerate(DELTAS)
+                if 0 <= row + d_row < dim and 0 <= col + d_col < dim
+            )
+            for col in range(dim)
+        )
+
+    if dim == 1:
+        masks = row_masks(0)
+    else:
+        masks = row_masks(0) + row_masks(1) * (dim - 2) + row_masks(dim - 1)
+    moves = tuple(
+        tuple(
+            (d_row * dim + d_col, d_row, d_col)
+            for k, (d_row, d_col) in enumerate(DELTAS)
+            if mask & (1 << k)
+        )
+        for mask in range(16)
+    )
+    return masks, moves
+
+
+class Grid:
+    """
+    Square grid of maze nodes, stored as one flat bytearray of node types
+    Node (row, col) lives at index row * dim + col, so every access is a single
+    lookup instead of the double indirection of a list of lists
+    Supports grid[row, col] access, as well as grid[row][col] for older code
+
+    The grid also keeps, for every node, how many of its neighbors are paths
+    This is built the first time path_counts is used and then kept up to date by
+    set, so once it exists every change must go through set or grid[row, col]
+    rather than writing to cells directly. Code filling in a whole grid can
+    write to cells directly and then call cells_changed once instead
+
+    Copies are copy-on-write: a copy shares its nodes and counts with the grid it
+    came from until one of them is changed through set
+    """
+
+    def __init__(self, dim, fill=0, cells=None):
+        """
+        Initializes a Grid
+        @param dim: Dimension of the grid, as a number
+        @param fill: Node type every node starts as, default 0
+        @param cells: Optional bytes-like of dim * dim node types to copy in
+        """
+        self.dim = dim
+        if cells is None:
+            self.cells = bytearray([fill]) * (dim * dim)
+        else:
+            if len(cells) != dim * dim:
+                raise ValueError(f"Expected {dim * dim} cells, got {len(cells)}")
+            self.cells = bytearray(cells)
+        self.masks, self.moves = bounds_table(dim)
+        self._path_counts = None
+        # Counts up on every change made through set
+        self.version = 0
+        # Counts up on every change through set that turns a wall into anything
+        # else or back, so it ignores nodes being marked as path
+        self.wall_version = 0
+        # Whether cells (and path counts) may be shared with a copy
+        self._shared = False
+
+    def __getstate__(self):
+        """
+        Pickles only the dimension and the nodes, the rest is rebuilt on load
+        """
+        return {"dim": self.dim, "cells": self.cells}
+
+    def __setstate__(self, state):
+        """
+        Restores a pickled grid
+        @param state: Pickled state from __getstate__
+        """
+        self.__init__(state["dim"], cells=state["cells"])
+
+    @staticmethod
+    def from_lists(rows):
+        """
+        Builds a Grid out of a square list of lists of node types
+        @param rows: List of rows, each a list of node types
+        """
+        grid = Grid(len(rows))
+        for row, values in enumerate(rows):
+            grid[row] = values
+        return grid
+
+    def index(self, row, col):
+        """
+        Returns the flat index of a node
+        @param row: Row of node
+        @param col: Column of node
+        """
+        return row * self.dim + col
+
+    def get(self, index):
+        """
+        Returns the node type at a flat index
+        @param index: Flat index of node
+        """
+        return self.cells[index]
+
+    def set(self, index, value):
+        """
+        Sets the node type at a flat index
+        @param index: Flat index of node
+        @param value: New node type
+        """
+        if self._shared:
+            self.detach()
+        cells = self.cells
+        was_wall = cells[index] == 1
+        cells[index] = value
+        self.version += 1
+        if was_wall == (value == 1):
+            return
+        self.wall_version += 1
+        if self._path_counts is not None:
+            # The node flipped between wall and path, so its neighbors now
+            # touch one more or one less path
+            change = 1 if was_wall else -1
+            counts = self._path_counts
+            for offset, _, _ in self.moves[self.masks[index]]:
+                counts[index + offset] += change
+
+    def cells_changed(self):
+        """
+        Counts writes made straight to cells as one change, and drops the path
+        counts so they are counted again when next used
+        The grid must not be shared with a copy when cells is written to
+        """
+        self._path_counts = None
+        self.version += 1
+        self.wall_version += 1
+
+    @property
+    def path_counts(self):
+        """
+        Number of path neighbors of every node, as a bytearray by flat index
+        """
+        if self._path_counts is None:
+            self._path_counts = self._count_paths()
+        return self._path_counts
+
+    def _count_paths(self):
+        """
+        Counts the path neighbors of every node in one pass
+        The grid is read as a big integer with one node per byte, so that adding
+        up the shifted copies for each direction runs in C rather than per node
+        """
+        dim = self.dim
+        size = dim * dim
+        paths = int.from_bytes(self.cells.translate(PATH_TABLE), "little")
+        # Shifting by one node wraps around rows, so mask out the wrapped column
+        not_first_col = int.from_bytes((b"\x00" + b"\xff" * (dim - 1)) * dim, "little")
+        not_last_col = int.from_bytes((b"\xff" * (dim - 1) + b"\x00") * dim, "little")
+        # Every count is at most 4, so no byte ever carries into the next
+        counts = (
+            (paths << 8 * dim)
+            + (paths >> 8 * dim)
+            + ((paths << 8) & not_first_col)
+            + ((paths >> 8) & not_last_col)
+        )
+        counts &= (1 << 8 * size) - 1
+        return bytearray(counts.to_bytes(size, "little"))
+
+    def neighbors(self, index):
+        """
+        Returns the flat indices of the nodes next to a node
+        @param index: Flat index of node
+        """
+        return [index + move[0] for move in self.moves[self.masks[index]]]
+
+    def frontier(self, index):
+        """
+        Returns the flat indices of the walls next to a node that could become
+        path without touching any path other than the node itself
+        Same rule as Maze.get_neighbors with path False
+        @param index: Flat index of node
+        """
+        cells = self.cells
+        counts = self.path_counts
+        # The node itself is one of the path neighbors if it is a path
+        own = 0 if cells[index] == 1 else 1
+        return [
+            index + move[0]
+            for move in self.moves[self.masks[index]]
+            if cells[index + move[0]] == 1 and counts[index + move[0]] == own
+        ]
+
+    def frontier_batch(self, indices):
+        """
+        Runs frontier for many nodes at once
+        @param indices: Iterable of flat indices
+        @return: Dict of flat index to list of frontier flat indices
+        """
+        cells = self.cells
+        counts = self.path_counts
+        masks = self.masks
+        moves = self.moves
+        result = {}
+        for index in indices:
+            own = 0 if cells[index] == 1 else 1
+            result[index] = [
+                index + move[0]
+                for move in moves[masks[index]]
+                if cells[index + move[0]] == 1 and counts[index + move[0]] == own
+            ]
+        return result
+
+    def row(self, row):
+        """
+        Returns a zero-copy memoryview of one row of the grid
+        @param row: Row to view
+        """
+        return memoryview(self.cells)[row * self.dim : (row + 1) * self.dim]
+
+    def view(self):
+        """
+        Returns a zero-copy memoryview of the whole grid in row-major order
+        This can be handed to anything that takes a buffer, such as
+        numpy.frombuffer or a QImage, without copying the grid
+        """
+        return memoryview(self.cells)
+
+    def region(self, first_row, first_col, rows, cols):
+        """
+        Returns the node types of a rectangle of the grid
+        @param first_row: Top row of the rectangle
+        @param first_col: Left column of the rectangle
+        @param rows: Number of rows
+        @param cols: Number of columns
+        @return: Bytes of rows * cols node types in row-major order
+        """
+        dim = self.dim
+        cells = self.cells
+        return b"".join(
+            cells[row * dim + first_col : row * dim + first_col + cols]
+            for row in range(first_row, first_row + rows)
+        )
+
+    def sample(self, size):
+        """
+        Returns a size by size overview of the grid, the node nearest to each
+        point of an evenly spaced size by size lattice
+        @param size: Number of points along each side
+        @return: Bytes of size * size node types in row-major order
+        """
+        points = [point * self.dim // size for point in range(size)]
+        # Picks the sampled columns out of a row in one call, the extra column
+        # makes sure it returns a tuple even for a single point
+        pick = operator.itemgetter(*points, 0)
+        return b"".join(bytes(pick(self.row(row))[:-1]) for row in points)
+
+    def copy(self):
+        """
+        Returns a copy of the grid, without copying anything yet
+        The nodes and path counts are shared until either grid changes, at which
+        point that grid takes its own copy of them
+        """
+        copied = Grid.__new__(Grid)
+        copied.__dict__.update(self.__dict__)
+        copied._shared = self._shared = True
+        return copied
+
+    def detach(self):
+        """
+        Gives the grid its own copy of any nodes and counts shared with a copy
+        Must be called before writing to cells directly on a grid that was copied
+        Memoryviews from row and view still look at the shared nodes afterwards
+        """
+        self.cells = bytearray(self.cells)
+        if self._path_counts is not None:
+            self._path_counts = bytearray(self._path_counts)
+        self._shared = False
+
+    def to_lists(self):
+        """
+        Returns the grid as a list of lists of node types
+        """
+        return [list(self.row(row)) for row in range(self.dim)]
+
+    def _check(self, row, col):
+        """
+        Raises an IndexError if (row, col) is outside of the grid
+        @param row: Row of node
+        @param col: Column of node
+        """
+        if not (0 <= row < self.dim and 0 <= col < self.dim):
+            raise IndexError(f"Node ({row}, {col}) is outside of the grid")
+
+    def __getitem__(self, key):
+        """
+        grid[row, col] returns a node type, grid[row] returns a GridRow
+        @param key: (row, col) or a row number
+        """
+        if isinstance(key, int):
+            if not 0 <= key < self.dim:
+                raise IndexError(f"Row {key} is outside of the grid")
+            return GridRow(self, key)
+        row, col = key
+        self._check(row, col)
+        return self.cells[row * self.dim + col]
+
+    def __setitem__(self, key, value):
+        """
+        grid[row, col] = type sets a node, grid[row] = values sets a whole row
+        @param key: (row, col) or a row number
+        @param value: Node type, or an iterable of dim node types for a row
+        """
+        if isinstance(key, int):
+            values = bytes(value)
+            if len(values) != self.dim:
+                raise ValueError(f"Expected {self.dim} values, got {len(values)}")
+            for col, node_value in enumerate(values):
+                self.set(key * self.dim + col, node_value)
+            return
+        row, col = key
+        self._check(row, col)
+        self.set(row * self.dim + col, value)
+
+    def __len__(self):
+        return self.dim
+
+    def __iter__(self):
+        for row in range(self.dim):
+            yield GridRow(self, row)
+
+    def __eq__(self, other):
+        if isinstance(other, Grid):
+            return self.dim == other.dim and self.cells == other.cells
+        if isinstance(other, list):
+            return self.to_lists() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Grid({self.dim})"
+
+
+class GridRow:
+    """
+    Row proxy returned by grid[row], so that grid[row][col] keeps working
+    Reads and writes go straight through to the underlying Grid
+    """
+
+    def __init__(self, grid, row):
+        """
+        Initializes a GridRow
+        @param grid: Grid the row belongs to
+        @param row: Row number
+        """
+        self.grid = grid
+        self.offset = row * grid.dim
+
+    def __getitem__(self, col):
+        if not 0 <= col < self.grid.dim:
+            raise IndexError(f"Column {col} is outside of the grid")
+        return self.grid.cells[self.offset + col]
+
+    def __setitem__(self, col, value):
+        if not 0 <= col < self.grid.dim:
+            raise IndexError(f"Column {col} is outside of the grid")
+        self.grid.set(self.offset + col, value)
+
+    def __len__(self):
+        return self.grid.dim
+
+    def __iter__(self):
+        return iter(self.grid.cells[self.offset : self.offset + self.grid.dim])
+
+    def __eq__(self, other):
+        return list(self) == list(other)
@@ -0,0 +1,149 @@
+"""
+Counters and timers for the hot paths of the maze engine
+
+Nothing is recorded unless a Stats is active, either for the length of a with
+recording() block, for one call by passing stats= to a function that takes
+it, or everywhere after enable(). Instrumented code looks up the active Stats
+once per call, keeps its counts in local variables and only adds them to the
+Stats at the end, so when nothing is recording all it costs is that lookup
+
+    with instrument.recording() as stats:
+        for maze in mazes:
+            maze.randomize()
+    print(stats.as_dict())
+
+Names are dotted by what they measure, like "astar.expanded", and timers are
+in seconds from time.perf_counter, which never goes backwards
+"""
+import time
+from contextlib import contextmanager
+
+# The Stats everything is recorded to, or None when nothing is recording
+current = None
+
+
+class Stats:
+    """
+    Named counters, peaks and timers
+    Counters add up, peaks keep the biggest value seen and timers add up seconds
+    """
+
+    def __init__(self):
+        """
+        Initializes a Stats with nothing recorded
+        """
+        self.counters = {}
+        self.peaks = {}
+        self.timers = {}
+
+    def count(self, name, amount=1):
+        """
+        Adds to a counter
+        @param name: Counter name
+        @param amount: Amount to add, default 1
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def peak(self, name, value):
+        """
+        Records a value, keeping it if it is the biggest one so far
+        @param name: Peak name
+        @param value: Value seen
+        """
+        if value > self.peaks.get(name, value - 1):
+            self.peaks[name] = value
+
+    def add_time(self, name, seconds):
+        """
+        Adds to a timer
+        @param name: Timer name
+        @param seconds: Seconds to add
+        """
+        self.timers[name] = self.timers.get(name, 0.0) + seconds
+
+    @contextmanager
+    def timer(self, name):
+        """
+        Context manager adding the time spent inside of it to a timer
+        @param name: Timer name
+        """
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - began)
+
+    def rate(self, counter, timer):
+        """
+        Returns a counter per second of a timer, like nodes expanded per second
+        @param counter: Counter name
+        @param timer: Timer name
+        @return: Rate, or None if nothing has been timed
+        """
+        seconds = self.timers.get(timer, 0.0)
+        if seconds <= 0:
+            return None
+        return self.counters.get(counter, 0) / seconds
+
+    def as_dict(self):
+        """
+        Returns everything recorded as a dict of "counters", "peaks" and
+        "timers", each a dict by name, ready to be dumped as JSON
+        """
+        return {
+            "counters": dict(self.counters),
+            "peaks": dict(self.peaks),
+            "timers": dict(self.timers),
+        }
+
+    def reset(self):
+        """
+        Forgets everything recorded
+        """
+        self.counters.clear()
+        self.peaks.clear()
+        self.timers.clear()
+
+
+def active(stats=None):
+    """
+    Returns the Stats a call should record to
+    @param stats: Stats passed to the call, default the one recording
+    @return: Stats, or None if nothing is recording
+    """
+    return current if stats is None else stats
+
+
+def enable(stats=None):
+    """
+    Starts recording everything
+    @param stats: Stats to record to, default a new one
+    @return: The Stats being recorded to
+    """
+    global current
+    current = Stats() if stats is None else stats
+    return current
+
+
+def disable():
+    """
+    Stops recording
+    """
+    global current
+    current = None
+
+
+@contextmanager
+def recording(stats=None):
+    """
+    Context manager recording everything done inside of it, then going back to
+    whatever was recording before
+    @param stats: Stats to record to, default a new one
+    """
+    global current
+    previous = current
+    current = Stats() if stats is None else stats
+    try:
+        yield current
+    finally:
+        current = previous
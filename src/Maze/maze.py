@@ -1,19 +1,45 @@
 import hashlib
+import heapq
 import math
 import os
-import pickle
 import random
-from collections import deque
+import time
+from collections import deque, namedtuple
 
-# When the file is loaded, try to make the saved_mazes directory in the home folder
-# If this fails, the program doesn't run, so print that an error has occured
+from . import instrument, maze_file
+from .cache import MazeCache
+from .catalog import OLD_CATALOG_FILENAME, MazeCatalog, catalog_path
+from .connectivity import PathConnectivity
+from .distance_field import DistanceField
+from .generators import DEFAULT_GENERATOR, get_generator
+from .grid import Grid
+from .reachability import UnionFindReachability
+from .tiled_grid import TiledGrid
+
+# Saved mazes live in a directory in the home folder, which is only made and read
+# the first time the library is used, so importing this module is free
 HOME_DIR = os.path.expanduser("~")
 MAZE_SAVE_PATH = os.path.join(HOME_DIR, ".saved_mazes")
-if not os.path.isdir(MAZE_SAVE_PATH):
-    try:
-        os.mkdir(MAZE_SAVE_PATH)
-    except OSError as e:
-        print(e)
+# The catalog of the library goes beside it, so the library only holds mazes
+MAZE_CATALOG_PATH = catalog_path(MAZE_SAVE_PATH)
+
+
+def make_save_path():
+    """
+    Tries to make the saved_mazes directory in the home folder if it is missing
+    If this fails, mazes can't be saved, so print that an error has occured
+    """
+    if not os.path.isdir(MAZE_SAVE_PATH):
+        try:
+            os.mkdir(MAZE_SAVE_PATH)
+        except OSError as e:
+            print(e)
+
+
+# Everything needed to rebuild a generated maze from scratch
+Recipe = namedtuple(
+    "Recipe", ["generator", "version", "seed", "dim", "difficulty", "start", "end"]
+)
 
 
 class Maze:
@@ -21,30 +47,192 @@ class Maze:
     Represents a Maze object, represented by a 2-d array of types of nodes
     """
 
-    # Class variable for all saved mazes
+    # Class variable for all saved mazes, see get_saved_mazes
     saved_mazes = {}
+    saved_mazes_loaded = False
+    # Catalog of the saved mazes, see get_catalog
+    catalog = None
+    # Recently loaded saved mazes, see get_cache
+    cache = None
+    # Functions called with (added, removed) lists of names whenever names are
+    # added to or removed from saved_mazes
+    library_listeners = []
+
+    # Answers whether the end can still be reached while randomize backtracks
+    reachability_oracle = UnionFindReachability
+
+    @staticmethod
+    def get_catalog():
+        """
+        Static method to return the catalog of the stored folder, opening it
+        the first time it is needed
+        """
+        if Maze.catalog is None:
+            make_save_path()
+            # Earlier versions kept the catalog in the library, where older
+            # versions still would try to load it as a maze
+            try:
+                os.remove(os.path.join(MAZE_SAVE_PATH, OLD_CATALOG_FILENAME))
+            except OSError:
+                pass
+            Maze.catalog = MazeCatalog(MAZE_SAVE_PATH, MAZE_CATALOG_PATH)
+        return Maze.catalog
 
     @staticmethod
     def load_saved_mazes():
         """
         Static method to load all saved mazes from the stored folder
+        Only files which changed since they were last catalogued are read, and
+        only the names that changed are passed on to library_listeners
+        @return: (added, removed) lists of maze names
+        """
+        catalog = Maze.get_catalog()
+        catalog.refresh()
+        names = catalog.names()
+        directory = os.path.abspath(catalog.directory)
+        added = [name for name in names if name not in Maze.saved_mazes]
+        # Mazes saved to files somewhere else aren't in the catalog, but are
+        # still saved, so only names from the library folder can go away
+        removed = [
+            name
+            for name, filename in Maze.saved_mazes.items()
+            if name not in names
+            and os.path.dirname(os.path.abspath(filename)) == directory
+        ]
+        for name in removed:
+            del Maze.saved_mazes[name]
+        Maze.saved_mazes.update(names)
+        Maze.saved_mazes_loaded = True
+        Maze.notify_library(added, removed)
+        return added, removed
+
+    @staticmethod
+    def watch_saved_mazes(interval=1.0):
+        """
+        Static method polling the stored folder for changes, for use without a GUI
+        Each poll only looks at file sizes and mtimes, see load_saved_mazes
+        @param interval: Seconds between polls, default 1
+        @return: Generator of (added, removed) lists of maze names, yielded
+        whenever something changed
+        """
+        while True:
+            added, removed = Maze.load_saved_mazes()
+            if added or removed:
+                yield added, removed
+            time.sleep(interval)
+
+    @staticmethod
+    def add_saved_maze(name, filename):
+        """
+        Static method to add a maze that was just saved to the saved mazes
+        @param name: Maze name
+        @param filename: Filename the maze was saved to
+        """
+        is_new = name not in Maze.saved_mazes
+        Maze.saved_mazes[name] = filename
+        if is_new:
+            Maze.notify_library([name], [])
+
+    @staticmethod
+    def notify_library(added, removed):
+        """
+        Static method to tell library_listeners about changed names
+        @param added: List of added maze names
+        @param removed: List of removed maze names
+        """
+        if not added and not removed:
+            return
+        for listener in list(Maze.library_listeners):
+            listener(added, removed)
+
+    @staticmethod
+    def get_saved_mazes():
         """
-        files = os.listdir(MAZE_SAVE_PATH)
-        for filename in files:
-            filename = os.path.join(MAZE_SAVE_PATH, filename)
-            with open(filename, "rb") as file:
-                read_maze = pickle.load(file)
-                Maze.saved_mazes[read_maze.name] = filename
+        Static method to return the dict of saved maze names to filenames,
+        loading the saved mazes the first time it is called
+        """
+        if not Maze.saved_mazes_loaded:
+            Maze.load_saved_mazes()
+        return Maze.saved_mazes
+
+    @staticmethod
+    def get_cache():
+        """
+        Static method to return the cache of loaded saved mazes
+        """
+        if Maze.cache is None:
+            Maze.cache = MazeCache(Maze.load_from_file)
+        return Maze.cache
 
     @staticmethod
     def get_saved_maze(name):
         """
         Static method to return a saved maze of a given name
+        Mazes are cached, so loading the same maze again doesn't read the file
         @param name: Maze name to fetch
         """
-        with open(Maze.saved_mazes[name], "rb") as file:
-            read_maze = pickle.load(file)
-            return read_maze
+        return Maze.get_cache().get(Maze.get_saved_mazes()[name])
+
+    @staticmethod
+    def load_from_file(filename):
+        """
+        Static method to load a maze from a file
+        @param filename: Filename as a string
+        """
+        with open(filename, "rb") as file:
+            data = file.read()
+        if not data.startswith(maze_file.MAGIC):
+            return maze_file.load_pickle(data)
+        header, cells, recipe = maze_file.decode(data)
+        read_maze = Maze.__new__(Maze)
+        read_maze.__setstate__(
+            {
+                "name": header.name,
+                "dim": header.dim,
+                "difficulty": header.difficulty,
+                "start": header.start,
+                "end": header.end,
+                "_grid": None if cells is None else Grid(header.dim, cells=cells),
+                "recipe": None
+                if recipe is None
+                else Recipe(
+                    *recipe, header.dim, header.difficulty, header.start, header.end
+                ),
+            }
+        )
+        return read_maze
+
+    @staticmethod
+    def open_tiled(filename, name=None, **kwargs):
+        """
+        Static method to open a maze kept in a TiledGrid file, which reads only
+        the parts of the grid that are used
+        The start and end are the corners, the same as a new maze
+        Only what works a node at a time is supported: route_astar,
+        get_neighbors, reading and setting nodes through the grid, to_text,
+        to_png and to_dict. Solvers, is_solvable, connectivity, distance_field,
+        copy, randomize and saving need the whole grid in memory and raise
+        TypeError, use grid.to_grid() for those
+        @param filename: Filename of a file from TiledGrid.create or from_grid
+        @param name: Name of the maze, defaults to the filename without folders
+        or extension
+        @param kwargs: Passed on to TiledGrid
+        """
+        grid = TiledGrid(filename, **kwargs)
+        if name is None:
+            name = os.path.splitext(os.path.basename(filename))[0]
+        tiled_maze = Maze.__new__(Maze)
+        tiled_maze.__setstate__(
+            {
+                "name": name,
+                "dim": grid.dim,
+                "difficulty": 0,
+                "start": (0, 0),
+                "end": (grid.dim - 1, grid.dim - 1),
+                "_grid": grid,
+            }
+        )
+        return tiled_maze
 
     def __init__(self, name, dim, difficulty):
         """
@@ -57,19 +245,221 @@ class Maze:
         # 1 is a blocked node
         # 2 is a current path node
 
-        self.grid = [[0 for _ in range(dim)] for _ in range(dim)]
+        self.grid = Grid(dim)
         self.name = name
         self.difficulty = difficulty
         self.dim = dim
         self.start = (0, 0)
         self.end = (dim - 1, dim - 1)
+        self._distance_field = None
+        self._connectivity = None
+
+    @property
+    def grid(self):
+        """
+        Grid of node types making up the maze
+        """
+        if self._grid is None:
+            self.rebuild()
+        return self._grid
+
+    @grid.setter
+    def grid(self, grid):
+        """
+        Sets the grid, converting a list of lists of node types if needed
+        @param grid: Grid or list of lists of node types
+        """
+        if not isinstance(grid, (Grid, TiledGrid)):
+            grid = Grid.from_lists(grid)
+        self._grid = grid
+        # A new grid means the maze can no longer be rebuilt from its seed
+        self.recipe = None
+
+    def __getstate__(self):
+        """
+        Pickles the maze
+        An unedited generated maze only keeps its recipe, not the grid
+        """
+        state = dict(self.__dict__)
+        if self.is_unedited():
+            state["_grid"] = None
+        state.pop("_recipe_version", None)
+        state.pop("_distance_field", None)
+        state.pop("_connectivity", None)
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores a pickled maze
+        Mazes saved before the grid was a Grid stored it as a list of lists
+        Mazes saved as just a recipe have their grid rebuilt on first use
+        @param state: Pickled attribute dict
+        """
+        if "grid" in state:
+            state["_grid"] = Grid.from_lists(state.pop("grid"))
+        self.__dict__.update(state)
+        self.__dict__.setdefault("recipe", None)
+        self.__dict__.setdefault("_grid", None)
+        self.__dict__.setdefault("_distance_field", None)
+        self.__dict__.setdefault("_connectivity", None)
+        # A pickled grid was edited, or it wouldn't have been kept, so it never
+        # matches the recipe, and a rebuilt grid sets this when it is rebuilt
+        self.__dict__.setdefault("_recipe_version", None)
+
+    def is_tiled(self):
+        """
+        Returns whether the grid is a TiledGrid, kept in a file rather than
+        in memory
+        """
+        return isinstance(self._grid, TiledGrid)
+
+    def require_grid(self, operation):
+        """
+        Raises TypeError if the maze is tiled, for operations that need the
+        whole grid in memory
+        @param operation: What is being done, to say in the error
+        """
+        if self.is_tiled():
+            raise TypeError(f"{operation} is not supported on tiled mazes")
+
+    def copy(self):
+        """
+        Returns a copy of the maze
+        The grid is copy-on-write, so this is cheap until the copy is changed
+        """
+        self.require_grid("Copying")
+        copied = Maze.__new__(Maze)
+        copied.__dict__.update(self.__dict__)
+        copied._grid = self.grid.copy()
+        # The copy has the same walls, so the distance field carries over
+        field = self._distance_field
+        if field is not None and field.is_current(self._grid, self.end):
+            copied._distance_field = field.rebind(copied._grid)
+        copied._connectivity = None
+        return copied
+
+    def distance_field(self):
+        """
+        Returns the DistanceField to the end of the maze, only searching again
+        if walls or the end changed since it was last built
+        """
+        self.require_grid("Distance fields")
+        field = self._distance_field
+        if field is None or not field.is_current(self.grid, self.end):
+            field = self._distance_field = DistanceField(self.grid, self.end)
+        return field
+
+    def connectivity(self):
+        """
+        Returns the PathConnectivity of the grid, which stays up to date through
+        edits made with set_node
+        """
+        self.require_grid("Connectivity")
+        connectivity = self._connectivity
+        if connectivity is None or connectivity.grid is not self.grid:
+            connectivity = self._connectivity = PathConnectivity(self.grid)
+        return connectivity
+
+    def set_node(self, node, value):
+        """
+        Sets the type of a node while editing, keeping the connectivity up to
+        date rather than having it rebuilt
+        @param node: (row, col) of node
+        @param value: New node type
+        """
+        self.connectivity().set_node(node, value)
+
+    def is_solvable(self):
+        """
+        Returns whether the end can be reached from the start through paths
+        Same answer as route_astar(start, end, search_path=True)
+        """
+        return self.connectivity().connected(self.start, self.end)
+
+    def rebuild(self):
+        """
+        Regenerates the grid of a maze that was saved as just its recipe
+        """
+        recipe = self.recipe
+        generator = get_generator(recipe.generator)
+        if generator.version != recipe.version:
+            raise ValueError(
+                f"Maze {self.name!r} was made by version {recipe.version} of the "
+                f"{recipe.generator} generator, which can no longer be rebuilt"
+            )
+        self.dim = recipe.dim
+        self.difficulty = recipe.difficulty
+        self.start = recipe.start
+        self.end = recipe.end
+        self._grid = Grid(self.dim, fill=1)
+        self.randomize(recipe.generator, seed=recipe.seed)
+
+    def is_unedited(self):
+        """
+        Returns whether the maze is exactly what its recipe generates
+        """
+        recipe = self.recipe
+        if recipe is None:
+            return False
+        # A grid that was never rebuilt can't have been edited either
+        if self._grid is not None and self._grid.version != self._recipe_version:
+            return False
+        return (
+            recipe.dim == self.dim
+            and recipe.difficulty == self.difficulty
+            and recipe.start == tuple(self.start)
+            and recipe.end == tuple(self.end)
+        )
+
+    def randomize(self, generator=DEFAULT_GENERATOR, seed=None, stats=None):
+        """
+        Randomizes a maze with one of the registered generators
+        The same generator, seed and maze settings always give the same maze
+        @param generator: Name of the generator to use, defaults to the original
+        snaking generator
+        @param seed: Seed for the random numbers, defaults to a new random seed
+        @param stats: instrument.Stats to record to, defaults to the one recording
+        """
+        self.require_grid("Randomizing")
+        if seed is None:
+            seed = random.getrandbits(32)
+        generate = get_generator(generator)
+        stats = instrument.active(stats)
+        if stats is None:
+            generate(self, random.Random(seed))
+        else:
+            # Recorded to for the whole call, so the generator finds it too
+            with instrument.recording(stats), stats.timer("randomize"):
+                generate(self, random.Random(seed))
+            stats.count("randomize.calls")
+        self.recipe = Recipe(
+            generator,
+            generate.version,
+            seed,
+            self.dim,
+            self.difficulty,
+            tuple(self.start),
+            tuple(self.end),
+        )
+        self._recipe_version = self.grid.version
 
-    def randomize(self):
+    def snake_randomize(self, rng):
         """
         Randomizes a maze, respects difficulty settings to change how it randomizes
+        First snakes a single path from start to end, then branches dead-ends off
+        @param rng: Random number generator to use
         """
         # Set everything to a wall initially
-        self.grid = [[1 for _ in range(self.dim)] for _ in range(self.dim)]
+        self.grid = Grid(self.dim, fill=1)
+        # All grid changes go through the oracle while we build the main path
+        oracle = self.reachability_oracle(self)
+
+        stats = instrument.current
+        if stats is not None:
+            began = time.perf_counter()
+            backtrack_time = 0.0
+        # Counts for stats, cheap enough to keep either way
+        steps = backtracked = neighbor_calls = 0
 
         # Begin searching at the start of the maze
         current = self.start
@@ -78,23 +468,29 @@ class Maze:
         while current != tuple(self.end):
             # Find non-path valid neighbors
             neighbors = self.get_neighbors(current[0], current[1], path=False)
-            self.grid[current[0]][current[1]] = 0
+            neighbor_calls += 1
+            steps += 1
+            oracle.set_node(current, 0)
             if self.end in neighbors:
                 # If we're at the end, make sure we go to it
                 path_stack.appendleft(current)
                 break
             # If we have no neighbors we can go to, we need to backtrack
             if len(neighbors) == 0:
+                if stats is not None:
+                    backtrack_began = time.perf_counter()
                 # Wait until we get back to some node where we can get to the end
-                while not self.route_astar(current, self.end):
-                    self.grid[current[0]][current[1]] = 1
+                while not oracle.can_reach(current, self.end):
+                    oracle.set_node(current, 1)
                     current = path_stack.popleft()
+                    backtracked += 1
                 neighbors = self.get_neighbors(current[0], current[1], path=False)
+                neighbor_calls += 1
                 # Find the neighbors we can route to from our backtracking
                 neighbors = [
                     neighbor
                     for neighbor in neighbors
-                    if self.route_astar(neighbor, self.end)
+                    if oracle.can_reach(neighbor, self.end)
                 ]
                 # We *should never* return here, as we should be able to backtrack
                 # somewhere with valid neighbors. However, this prevents a crash if
@@ -103,6 +499,8 @@ class Maze:
                     return
                 # Pick a neighbor we can go to and set that as new current
                 current = neighbors[0]
+                if stats is not None:
+                    backtrack_time += time.perf_counter() - backtrack_began
             # Sort neighbors by how far away they are from the end
             sorted_dist = sorted(neighbors, key=lambda val: distance(val, self.end))
             # Likelihood of picking the "best" route depends on difficulty
@@ -112,16 +510,21 @@ class Maze:
                 threshold = 0.5
             else:
                 threshold = 0.4
-            rd = random.random()
+            rd = rng.random()
             # If under threshold, choose the best route
             if rd < threshold or len(sorted_dist) == 1:
                 current = sorted_dist[0]
             # otherwise (more in hard difficulties), choose the non-best route
             else:
-                current = random.choice(sorted_dist[1:])
+                current = rng.choice(sorted_dist[1:])
             path_stack.appendleft(current)
         # Mark end as a path
-        self.grid[self.end[0]][self.end[1]] = 0
+        self.grid[self.end] = 0
+        if stats is not None:
+            snaked = time.perf_counter()
+            stats.add_time("randomize.snake", snaked - began - backtrack_time)
+            stats.add_time("randomize.backtrack", backtrack_time)
+        branched = 0
 
         # We now have a single path from start to end
         # Now, we need to generate the additional dead-ends along the path
@@ -133,14 +536,22 @@ class Maze:
             current = node_queue.pop()
             # Get neighbors and add all of them as potential new nodes
             new_neighbors = self.get_neighbors(current[0], current[1], path=False)
+            neighbor_calls += 1
             for neighbor in new_neighbors:
                 node_queue.append(neighbor)
             if len(new_neighbors) > 0:
                 # Visit one of the new neighbors
                 new_visit = new_neighbors.pop()
                 # Mark the source and the new visit as new path
-                self.grid[current[0]][current[1]] = 0
-                self.grid[new_visit[0]][new_visit[1]] = 0
+                self.grid[current] = 0
+                self.grid[new_visit] = 0
+                branched += 1
+        if stats is not None:
+            stats.add_time("randomize.branch", time.perf_counter() - snaked)
+            stats.count("randomize.snake_steps", steps)
+            stats.count("randomize.backtracked", backtracked)
+            stats.count("randomize.branched", branched)
+            stats.count("randomize.neighbor_calls", neighbor_calls)
 
     def save_to_file(self, discard_old=False, filename=None):
         """
@@ -155,35 +566,52 @@ class Maze:
         # e.g. if the dimension changes, the resulting hashed name would be different
         # but the maze itself would be the "same" maze, so we want to remove the old
         # file and then save our own
-        if discard_old and self.name in Maze.saved_mazes:
-            # Delete maze with same name
+        # Checked first, so nothing is deleted when the maze can't be saved
+        self.require_grid("Saving")
+        if discard_old and self.name in Maze.get_saved_mazes():
+            # Delete maze with same name, its entry in saved_mazes is replaced
+            # below rather than removed, since the name stays saved
             os.remove(os.path.join(Maze.saved_mazes[self.name]))
-            del Maze.saved_mazes[self.name]
+            Maze.get_cache().invalidate(Maze.saved_mazes[self.name])
 
         # Make our own filename if one isn't given
         if not filename:
-            # Adding random data to make the hash
-            name_to_hash = (
-                f"{self.name}{self.difficulty}{self.dim}{self.start[0] * self.end[1]}"
-            )
-            hashed = hashlib.md5(name_to_hash.encode())
-            filename = os.path.join(MAZE_SAVE_PATH, hashed.hexdigest() + ".maze")
+            make_save_path()
+            filename = self.make_filename()
+        # An unedited generated maze only needs its recipe to be rebuilt
+        recipe = None
+        if self.is_unedited() and -(2**63) <= self.recipe.seed < 2**63:
+            recipe = self.recipe[:3]
         with open(filename, "wb") as file:
-            pickle.dump(self, file)
+            file.write(maze_file.encode(self, recipe=recipe))
+        Maze.get_cache().invalidate(filename)
         # Add the filename to the dict of saved mazes
-        Maze.saved_mazes[self.name] = filename
+        Maze.add_saved_maze(self.name, filename)
+
+    def make_filename(self, directory=MAZE_SAVE_PATH):
+        """
+        Returns the filename the maze saves to when it isn't given one
+        @param directory: Directory the file goes in, default the library
+        """
+        # Adding random data to make the hash
+        name_to_hash = (
+            f"{self.name}{self.difficulty}{self.dim}{self.start[0] * self.end[1]}"
+        )
+        hashed = hashlib.md5(name_to_hash.encode())
+        return os.path.join(directory, hashed.hexdigest() + ".maze")
 
     def resize(self, new_dim):
         """
         Resize the maze to a new dimension
         @param new_dim: New dimension for maze
         """
-        new_grid = [[0 for _ in range(new_dim)] for _ in range(new_dim)]
+        new_grid = Grid(new_dim)
 
-        for row in range(min(new_dim, self.dim)):
-            for col in range(min(new_dim, self.dim)):
-                # Copy original values
-                new_grid[row][col] = self.grid[row][col]
+        # Copy original values one row slice at a time
+        kept = min(new_dim, self.dim)
+        for row in range(kept):
+            old_row = self.grid.row(row)
+            new_grid.cells[row * new_dim : row * new_dim + kept] = old_row[:kept]
 
         # Start and end may now be invalid
         # Move them in if necessary
@@ -195,17 +623,34 @@ class Maze:
         self.grid = new_grid
         self.dim = new_dim
         # The start and the end must be open
-        self.grid[self.start[0]][self.start[1]] = 0
-        self.grid[self.end[0]][self.end[1]] = 0
+        self.grid[self.start] = 0
+        self.grid[self.end] = 0
 
-    def route_astar(self, src, dest, search_path=False, animate=False, state=None):
+    def route_astar(
+        self,
+        src,
+        dest,
+        search_path=False,
+        animate=False,
+        state=None,
+        heuristic=None,
+        stats=None,
+    ):
         """
         Implements the A* (A Star) search algorithm to route from src to dest in maze
         @param src: Source (x, y)
         @param dest: Destination (x, y)
         @param search_path: Whether to only route through paths or only non-paths
         @param animate: Are we animating (which preserves state and only runs once)
-        @param state: State to pass in, normally empty and unused"""
+        @param state: State to pass in, normally empty and unused
+        @param heuristic: Estimate of the distance between two nodes, defaults to
+        the euclidean distance
+        @param stats: instrument.Stats to record to, defaults to the one recording"""
+        stats = instrument.active(stats)
+        if stats is not None:
+            began = time.perf_counter()
+        if heuristic is None:
+            heuristic = distance
         # Convert src and dest to tuples so that they can be in a set
         src = tuple(src)
         dest = tuple(dest)
@@ -215,61 +660,88 @@ class Maze:
             node_from = state["node_from"]
             g_score = state["g_score"]
             f_score = state["f_score"]
+            closed = state.setdefault("closed", set())
             # State may still be empty, in which case initialize as normal
-            if len(nodes) == 0:
-                nodes.add(src)
+            if src not in g_score:
                 g_score[src] = 0
-                f_score[src] = distance(src, dest)
+                f_score[src] = heuristic(src, dest)
+                heapq.heappush(nodes, (f_score[src], 0, src))
         else:
             # Otherwise, generate base state
-            nodes = set()
-            nodes.add(src)
-
             node_from = {}
 
             g_score = {src: 0}
 
-            f_score = {src: distance(src, dest)}
+            f_score = {src: heuristic(src, dest)}
+
+            nodes = [(f_score[src], 0, src)]
+
+            closed = set()
 
-        # nodes is the list of search nodes we should use
+        # nodes is a binary heap of (f_score, tiebreak, node) search entries
         # node_from tells us what the best path to node goes through
         # which can be used to reconstruct the path at the end
         # g_score tells us the difficulty of getting to a node
         # f_score tells us the difficulty we expect to have getting
-        # to dest through node (predicted using distance)
+        # to dest through node (predicted using the heuristic)
+        # closed holds the nodes which have already been expanded
+        # An improved route to a node just pushes a new entry onto the heap, and the
+        # outdated entries are skipped as they are popped (lazy deletion)
 
+        # The tiebreak counter keeps entries with equal f_score in insertion order
+        # and stops the heap from ever comparing the node tuples themselves
+        counter = len(g_score)
+        expanded = len(closed)
+        pushed = counter
+        largest_heap = len(nodes)
+        found = False
         while len(nodes) > 0:
+            if stats is not None:
+                largest_heap = max(largest_heap, len(nodes))
             # Pick the best current node
-            current = tuple(sorted(nodes, key=lambda x: f_score[x])[0])
+            _, _, current = heapq.heappop(nodes)
+            if current in closed:
+                # Outdated entry for a node we already found a better route to
+                continue
             if current == dest:
                 # At the end, draw the last path and return True
                 if animate:
-                    self.grid[current[0]][current[1]] = 2
-                return True
+                    self.grid[current] = 2
+                found = True
+                break
 
-            # Remove current from the set of nodes we want to check
-            nodes.remove(current)
+            # Mark current as expanded so that we never look at it again
+            closed.add(current)
             # Get neighbors of current, either path or non-path
             neighbors = self.get_neighbors(current[0], current[1], path=search_path)
+            # We moved 1 more distance than what it took to get to current
+            route_score = g_score[current] + 1
             for neighbor in neighbors:
-                neighbor = tuple(neighbor)
-                # We moved 1 more distance than what it took to get to current
-                route_score = g_score[current] + 1
+                if neighbor in closed:
+                    continue
                 if neighbor not in g_score or route_score < g_score[neighbor]:
                     # We have a new best way to get to the neighbor
                     # Update how we get to neighbor and its scores
                     node_from[neighbor] = current
                     g_score[neighbor] = route_score
-                    f_score[neighbor] = route_score + distance(neighbor, dest)
-                    if neighbor not in nodes:
-                        # Add it to the search set
-                        nodes.add(neighbor)
+                    f_score[neighbor] = route_score + heuristic(neighbor, dest)
+                    counter += 1
+                    heapq.heappush(nodes, (f_score[neighbor], counter, neighbor))
             if animate:
                 # If we're animating, draw the current node we got to
                 # and then return False for not complete yet
-                self.grid[current[0]][current[1]] = 2
-                return False
-        return False
+                self.grid[current] = 2
+                break
+        if stats is not None:
+            # Every expanded node asked for its neighbors once
+            expanded = len(closed) - expanded
+            stats.count("astar.calls")
+            stats.count("astar.expanded", expanded)
+            stats.count("astar.neighbor_calls", expanded)
+            stats.count("astar.pushed", counter - pushed)
+            stats.peak("astar.heap", largest_heap)
+            stats.add_time("astar", time.perf_counter() - began)
+        return found
 
     def get_neighbors(self, row, col, path=False):
         """
@@ -280,58 +752,88 @@ class Maze:
         neighbors (true) or only non-path (and non-bordering path) (false)
         """
         neighbors = set()
-        # 4 possible movements (no diagonals)
-        delta = ((-1, 0), (0, -1), (0, 1), (1, 0))
-
-        for d in delta:
-            if (
-                row + d[0] < self.dim
-                and row + d[0] >= 0
-                and col + d[1] < self.dim
-                and col + d[1] >= 0
-            ):
-                neighbor = (row + d[0], col + d[1])
-                neighbor_value = self.grid[neighbor[0]][neighbor[1]]
-                if path:
-                    # If all we want is the path neighbors, just check for the ones
-                    # that are paths, meaning 0 or 2
-                    if neighbor_value == 0 or neighbor_value == 2:
-                        neighbors.add(neighbor)
-                else:
-                    # Otherwise, we are trying to avoid paths
-                    # This means that we are also avoiding nodes which neighbor paths
-                    # For example, finding neighbors of x where path is false
-                    # ...
-                    # 0 1 0 1
-                    # 0 x 1 1
-                    # 1 1 1 1
-                    # 1 1 1 1
-                    # ...
-                    # Here, the node to the direct right is invalid, because
-                    # creating a path there would connect to the path in the top right
-                    # and as such create unintended paths
-                    # The only valid neighbor here is the node directly below the x
-                    # To check for this, we need to check if there are path neighbors
-                    # of our prospective neighbor i.e. checking neighbors one level down
-
-                    # Fetch neighbors of our neighbor
-                    path_neighbors_of_neighbor = self.get_neighbors(
-                        neighbor[0], neighbor[1], path=True
-                    )
-                    # However, it is ok (necessary even) that it borders the current
-                    # node we are searching from (the x in the example above)
-                    # filter that one out so that it doesn't make the neighbor invalid
-                    path_neighbors_of_neighbor = set(
-                        filter(
-                            lambda node: node != (row, col), path_neighbors_of_neighbor
-                        )
-                    )
-                    # We should have no neighbors that are paths and the node itself
-                    # should not be a path as well. If both met, add it.
-                    if len(path_neighbors_of_neighbor) == 0 and neighbor_value == 1:
-                        neighbors.add(neighbor)
+        grid = self.grid
+        index = row * self.dim + col
+        if isinstance(grid, TiledGrid):
+            # Tiled grids are read a node at a time, see the comments below for
+            # which neighbors are returned
+            if path:
+                found = [
+                    neighbor
+                    for neighbor in grid.neighbors(index)
+                    if grid.get(neighbor) != 1
+                ]
+            else:
+                found = grid.frontier(index)
+            return {divmod(neighbor, self.dim) for neighbor in found}
+        cells = grid.cells
+        # The movements (no diagonals) that stay inside the maze from this node
+        moves = grid.moves[grid.masks[index]]
+        if path:
+            # If all we want is the path neighbors, just check for the ones
+            # that are paths, meaning 0 or 2
+            for offset, d_row, d_col in moves:
+                if cells[index + offset] != 1:
+                    neighbors.add((row + d_row, col + d_col))
+            return neighbors
+        # Otherwise, we are trying to avoid paths
+        # This means that we are also avoiding nodes which neighbor paths
+        # For example, finding neighbors of x where path is false
+        # ...
+        # 0 1 0 1
+        # 0 x 1 1
+        # 1 1 1 1
+        # 1 1 1 1
+        # ...
+        # Here, the node to the direct right is invalid, because
+        # creating a path there would connect to the path in the top right
+        # and as such create unintended paths
+        # The only valid neighbor here is the node directly below the x
+        # To check for this, the grid keeps a count of the path neighbors of every
+        # node. However, it is ok (necessary even) that a neighbor borders the
+        # current node we are searching from (the x in the example above), so if
+        # that is a path it is allowed to be the one path the neighbor touches
+        counts = grid.path_counts
+        own = 0 if cells[index] == 1 else 1
+        for offset, d_row, d_col in moves:
+            neighbor = index + offset
+            # The neighbor itself should not be a path as well
+            if cells[neighbor] == 1 and counts[neighbor] == own:
+                neighbors.add((row + d_row, col + d_col))
         return neighbors
 
+    def get_neighbors_batch(self, nodes, path=False):
+        """
+        Runs get_neighbors for many nodes at once
+        @param nodes: Iterable of (row, col) nodes
+        @param path: Same as for get_neighbors
+        @return: Dict of node to its set of neighbors
+        """
+        if path:
+            return {node: self.get_neighbors(node[0], node[1], True) for node in nodes}
+        dim = self.dim
+        frontier = self.grid.frontier_batch(node[0] * dim + node[1] for node in nodes)
+        return {
+            divmod(index, dim): {divmod(neighbor, dim) for neighbor in neighbors}
+            for index, neighbors in frontier.items()
+        }
+
+
+def reconstruct_path(node_from, src, dest):
+    """
+    Walks the node_from links left by route_astar back from dest to src
+    @param node_from: node_from dict from the state of a finished route_astar
+    @param src: Source (x, y)
+    @param dest: Destination (x, y)
+    @return: List of nodes from src to dest, inclusive
+    """
+    src = tuple(src)
+    path = [tuple(dest)]
+    while path[-1] != src:
+        path.append(node_from[path[-1]])
+    path.reverse()
+    return path
+
 
 def distance(a, b):
     """
@@ -342,5 +844,11 @@ def distance(a, b):
     return math.sqrt((b[1] - a[1]) ** 2 + (b[0] - a[0]) ** 2)
 
 
-# Load the saved mazes as the file is loaded
-Maze.load_saved_mazes()
+def manhattan(a, b):
+    """
+    Manhattan (taxicab) distance between two nodes
+    Cheaper than distance and still exact on a grid without diagonal moves
+    @param a: Tuple/List of 2 values representing node 1
+    @param b: Tuple/List of 2 values representing node 2
+    """
+    return abs(b[0] - a[0]) + abs(b[1] - a[1])
@@ -0,0 +1,210 @@
+"""
+Binary .maze file format
+
+A file is a fixed size header, the maze name, then a payload:
+    magic        4 bytes, MAGIC
+    version      1 byte, FORMAT_VERSION
+    flags        1 byte, FLAG_COMPRESSED and/or FLAG_RECIPE
+    difficulty   1 byte
+    reserved     1 byte, 0
+    dim          4 bytes
+    start        4 bytes row, 4 bytes col
+    end          4 bytes row, 4 bytes col
+    payload size 4 bytes
+    name size    2 bytes
+    name         name size bytes of UTF-8
+    payload      payload size bytes, zlib compressed if FLAG_COMPRESSED
+
+The payload is either the grid, one bit per node in row-major order (1 for a
+wall, 0 for a path), or with FLAG_RECIPE a generator recipe: 4 bytes of
+generator version, 8 bytes of seed and then the generator name in UTF-8
+All numbers are little-endian
+"""
+import io
+import pickle
+import struct
+import zlib
+from collections import namedtuple
+
+MAGIC = b"SNKM"
+FORMAT_VERSION = 1
+FLAG_COMPRESSED = 1
+FLAG_RECIPE = 2
+
+HEADER = struct.Struct("<4sBBBBIIIIIIH")
+RECIPE = struct.Struct("<Iq")
+
+# Everything in a file except the payload
+MazeHeader = namedtuple(
+    "MazeHeader",
+    ["version", "flags", "name", "dim", "difficulty", "start", "end", "payload_size"],
+)
+
+# Maps node types to an ASCII bit (b"1" for a wall) and back
+WALL_BITS = bytes(ord("1") if value == 1 else ord("0") for value in range(256))
+BIT_NODES = bytes(1 if value == ord("1") else 0 for value in range(256))
+
+# The only things a legacy pickled maze file is allowed to load
+PICKLE_ALLOWED = {
+    ("src.Maze.maze", "Maze"),
+    ("src.Maze.maze", "Recipe"),
+    ("src.Maze.grid", "Grid"),
+    ("builtins", "bytearray"),
+    ("builtins", "set"),
+    ("builtins", "frozenset"),
+}
+
+
+def pack_walls(cells):
+    """
+    Packs node types into one bit per node, 1 for a wall and 0 for anything else
+    The nodes become an ASCII string of bits that int() parses in one go
+    @param cells: Bytes-like of node types
+    """
+    bits = bytes(cells).translate(WALL_BITS)
+    bits += b"0" * (-len(bits) % 8)
+    if not bits:
+        return b""
+    return int(bits, 2).to_bytes(len(bits) // 8, "big")
+
+
+def unpack_walls(data, size):
+    """
+    Unpacks bits from pack_walls back into a bytearray of node types
+    @param data: Packed bytes
+    @param size: Number of nodes
+    """
+    bits = bin(int.from_bytes(data, "big"))[2:].zfill(len(data) * 8)
+    return bytearray(bits[:size].encode("ascii").translate(BIT_NODES))
+
+
+def encode(maze, compress=True, recipe=None):
+    """
+    Encodes a maze into the bytes of a .maze file
+    @param maze: Maze to encode
+    @param compress: Whether to zlib compress the payload, default True
+    @param recipe: (generator, version, seed) to store instead of the grid
+    """
+    maze.require_grid("Saving")
+    flags = 0
+    if recipe is not None:
+        generator, version, seed = recipe
+        payload = RECIPE.pack(version, seed) + generator.encode("utf-8")
+        flags |= FLAG_RECIPE
+    else:
+        payload = pack_walls(maze.grid.cells)
+    if compress:
+        payload = zlib.compress(payload)
+        flags |= FLAG_COMPRESSED
+    name = maze.name.encode("utf-8")
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        flags,
+        maze.difficulty,
+        0,
+        maze.dim,
+        maze.start[0],
+        maze.start[1],
+        maze.end[0],
+        maze.end[1],
+        len(payload),
+        len(name),
+    )
+    return header + name + payload
+
+
+def parse_header(data):
+    """
+    Parses the header at the start of some bytes
+    @param data: Bytes starting with a header, at least up to the end of the name
+    @return: (MazeHeader, offset of the payload)
+    """
+    if len(data) < HEADER.size or data[:4] != MAGIC:
+        raise ValueError("Not a .maze file")
+    (
+        _,
+        version,
+        flags,
+        difficulty,
+        _,
+        dim,
+        start_row,
+        start_col,
+        end_row,
+        end_col,
+        payload_size,
+        name_size,
+    ) = HEADER.unpack_from(data)
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Unsupported .maze file version {version}")
+    name_end = HEADER.size + name_size
+    if len(data) < name_end:
+        raise ValueError("Truncated .maze file header")
+    header = MazeHeader(
+        version,
+        flags,
+        bytes(data[HEADER.size : name_end]).decode("utf-8"),
+        dim,
+        difficulty,
+        (start_row, start_col),
+        (end_row, end_col),
+        payload_size,
+    )
+    return header, name_end
+
+
+def read_header(filename):
+    """
+    Reads just the header of a .maze file, without reading the grid
+    @param filename: Filename as a string
+    """
+    with open(filename, "rb") as file:
+        data = file.read(HEADER.size)
+        if len(data) == HEADER.size and data[:4] == MAGIC:
+            name_size = HEADER.unpack(data)[-1]
+            data += file.read(name_size)
+    return parse_header(data)[0]
+
+
+def decode(data):
+    """
+    Decodes the bytes of a .maze file
+    @param data: Whole file contents
+    @return: (MazeHeader, cells, recipe) where exactly one of cells (a bytearray
+    of node types) and recipe (generator, version, seed) is set
+    """
+    header, offset = parse_header(data)
+    payload = data[offset : offset + header.payload_size]
+    if len(payload) != header.payload_size:
+        raise ValueError("Truncated .maze file")
+    if header.flags & FLAG_COMPRESSED:
+        payload = zlib.decompress(payload)
+    if header.flags & FLAG_RECIPE:
+        version, seed = RECIPE.unpack_from(payload)
+        generator = bytes(payload[RECIPE.size :]).decode("utf-8")
+        return header, None, (generator, version, seed)
+    size = header.dim * header.dim
+    if len(payload) * 8 < size:
+        raise ValueError("Truncated .maze grid")
+    return header, unpack_walls(payload, size), None
+
+
+class MazeUnpickler(pickle.Unpickler):
+    """
+    Unpickler for maze files from before the binary format
+    Only loads the maze classes, so a shared file can't run arbitrary code
+    """
+
+    def find_class(self, module, name):
+        if (module, name) not in PICKLE_ALLOWED:
+            raise pickle.UnpicklingError(f"{module}.{name} is not allowed in a maze")
+        return super().find_class(module, name)
+
+
+def load_pickle(data):
+    """
+    Loads a maze pickled by older versions of the program
+    @param data: Whole file contents
+    """
+    return MazeUnpickler(io.BytesIO(data)).load()
@@ -0,0 +1,217 @@
+import re
+
+# Maps every node type to 1 if it is a wall, and every count to 1 if it is zero
+WALL_TABLE = bytes(1 if value == 1 else 0 for value in range(256))
+ZERO_TABLE = bytes(1 if value == 0 else 0 for value in range(256))
+# A run of marked nodes, such as clean nodes, once they are marked with a 1 byte
+MARKED_RUN = re.compile(b"\x01+")
+
+
+class DisjointSet:
+    """
+    Union-find over the numbers 0 to size - 1, with path halving and union by size
+    """
+
+    def __init__(self, size):
+        """
+        Initializes a DisjointSet where every number is in its own set
+        @param size: Number of elements
+        """
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item):
+        """
+        Returns the representative of the set containing item
+        @param item: Element to look up
+        """
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        """
+        Merges the sets containing a and b
+        @param a: First element
+        @param b: Second element
+        @return: True if the sets were separate before the merge
+        """
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return True
+
+    def add(self):
+        """
+        Adds a new element in its own set
+        @return: The new element, which is the previous number of elements
+        """
+        self.parent.append(len(self.parent))
+        self.size.append(1)
+        return len(self.parent) - 1
+
+
+def group_runs(marked, dim):
+    """
+    Groups the marked nodes of a grid into connected regions
+    Works on runs of marked nodes rather than single nodes: a run within a row
+    is one region straight away, and a run of nodes marked both in a row and
+    the row below only needs one union to join the two rows
+    @param marked: Bytes with a 1 for every marked node, by flat index
+    @param dim: Dimension of the grid
+    @return: DisjointSet over flat indices, only meaningful for marked nodes
+    """
+    size = dim * dim
+    regions = DisjointSet(size)
+    parent = regions.parent
+    for row_start in range(0, size, dim):
+        for run in MARKED_RUN.finditer(marked, row_start, row_start + dim):
+            start, end = run.span()
+            parent[start:end] = [start] * (end - start)
+            regions.size[start] = end - start
+    for row_start in range(0, size - dim, dim):
+        above = int.from_bytes(marked[row_start : row_start + dim], "little")
+        below = int.from_bytes(marked[row_start + dim : row_start + 2 * dim], "little")
+        for run in MARKED_RUN.finditer((above & below).to_bytes(dim, "little")):
+            node = row_start + run.start()
+            regions.union(node, node + dim)
+    return regions
+
+
+class AStarReachability:
+    """
+    Reference reachability oracle, which runs a full non-path A* search per query
+    This is what Maze.randomize originally did on every backtracking step
+    """
+
+    def __init__(self, maze):
+        """
+        Initializes an AStarReachability
+        @param maze: Maze being randomized
+        """
+        self.maze = maze
+
+    def set_node(self, node, value):
+        """
+        Sets the type of a node in the maze
+        @param node: (row, col) of node
+        @param value: New node type
+        """
+        self.maze.grid[node] = value
+
+    def can_reach(self, src, dest):
+        """
+        Returns whether dest can be reached from src through non-path nodes
+        @param src: Source (row, col)
+        @param dest: Destination (row, col)
+        """
+        return self.maze.route_astar(src, dest)
+
+
+class UnionFindReachability:
+    """
+    Reachability oracle answering the same question as a non-path A* search
+    (Maze.route_astar with search_path False) without searching
+
+    A non-path search from src may first step onto a wall node whose only path
+    neighbor is src. Every later step must be onto a "clean" node: a wall with no
+    path neighbors at all. Clean nodes are grouped into connected regions with
+    union-find, so a query only has to look at the regions around src
+
+    Nodes turning back into walls can only make nodes clean, which is handled by
+    merging regions. Nodes turning into paths can split regions, so the regions
+    are rebuilt on the next query instead
+    """
+
+    def __init__(self, maze):
+        """
+        Initializes a UnionFindReachability
+        @param maze: Maze being randomized, all changes to its grid while the
+        oracle is in use must go through set_node
+        """
+        self.maze = maze
+        self.grid = maze.grid
+        self.dim = maze.grid.dim
+        self.regions = None
+
+    def is_clean(self, index):
+        """
+        Returns whether a node is a wall with no path neighbors
+        @param index: Flat index of node
+        """
+        return self.grid.cells[index] == 1 and self.grid.path_counts[index] == 0
+
+    def set_node(self, node, value):
+        """
+        Sets the type of a node in the maze, keeping the regions up to date
+        @param node: (row, col) of node
+        @param value: New node type
+        """
+        index = node[0] * self.dim + node[1]
+        was_wall = self.grid.cells[index] == 1
+        self.grid.set(index, value)
+        if was_wall == (value == 1):
+            return
+        if was_wall:
+            # A new path node, which can split regions
+            self.regions = None
+            return
+        if self.regions is None:
+            return
+        # A new wall node, which can only make nodes clean and join regions
+        for changed in [index] + self.grid.neighbors(index):
+            if self.is_clean(changed):
+                for neighbor in self.grid.neighbors(changed):
+                    if self.is_clean(neighbor):
+                        self.regions.union(changed, neighbor)
+
+    def rebuild(self):
+        """
+        Regroups every clean node into its connected region
+        """
+        size = self.dim * self.dim
+        walls = int.from_bytes(self.grid.cells.translate(WALL_TABLE), "little")
+        no_paths = int.from_bytes(self.grid.path_counts.translate(ZERO_TABLE), "little")
+        clean = (walls & no_paths).to_bytes(size, "little")
+        self.regions = group_runs(clean, self.dim)
+
+    def can_reach(self, src, dest):
+        """
+        Returns whether dest can be reached from src through non-path nodes
+        Gives the same answer as maze.route_astar(src, dest)
+        @param src: Source (row, col)
+        @param dest: Destination (row, col)
+        """
+        src = src[0] * self.dim + src[1]
+        dest = dest[0] * self.dim + dest[1]
+        if src == dest:
+            return True
+        if self.regions is None:
+            self.rebuild()
+        cells = self.grid.cells
+        # src itself counts towards the path neighbors of the first step
+        src_is_path = 1 if cells[src] != 1 else 0
+        dest_region = self.regions.find(dest) if self.is_clean(dest) else None
+        for first in self.grid.neighbors(src):
+            if cells[first] != 1 or self.grid.path_counts[first] != src_is_path:
+                continue
+            if first == dest:
+                return True
+            if dest_region is None:
+                continue
+            if self.is_clean(first) and self.regions.find(first) == dest_region:
+                return True
+            for neighbor in self.grid.neighbors(first):
+                if (
+                    self.is_clean(neighbor)
+                    and self.regions.find(neighbor) == dest_region
+                ):
+                    return True
+        return False
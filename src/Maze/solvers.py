@@ -0,0 +1,470 @@
+import heapq
+import time
+from collections import deque, namedtuple
+
+from . import instrument
+
+# Every maze solver, by name, in the order they should be offered
+# A solver is a generator function taking the maze, the source index and the
+# destination index (both flat grid indices). It yields the flat index of every
+# node it expands, in order, and returns a Solution when it is done
+SOLVERS = {}
+DEFAULT_SOLVER = "astar"
+
+# Outcome of a solver, path is a list of (row, col) nodes from source to
+# destination (empty if not found), expanded is the number of nodes the solver
+# expanded and max_frontier the most nodes it was holding on to at once
+Solution = namedtuple("Solution", ["found", "path", "expanded", "max_frontier"])
+
+
+def register_solver(name):
+    """
+    Decorator adding a solver function to SOLVERS under a name
+    @param name: Name to select the solver by
+    """
+
+    def register(solver):
+        SOLVERS[name] = solver
+        return solver
+
+    return register
+
+
+def get_solver(name):
+    """
+    Returns the solver registered under a name
+    @param name: Name of the solver
+    """
+    if name not in SOLVERS:
+        raise ValueError(f"Unknown maze solver {name!r}")
+    return SOLVERS[name]
+
+
+def start_solver(name, maze, src=None, dest=None, instant=False):
+    """
+    Starts a solver for stepping through it with step_solver
+    @param name: Name of the solver
+    @param maze: Maze to solve
+    @param src: Source (row, col), defaults to the maze start
+    @param dest: Destination (row, col), defaults to the maze end
+    @param instant: Whether to run the whole solver now and only replay the
+    nodes it expanded when stepping, default False
+    @return: State to pass to step_solver
+    """
+    maze.require_grid("Solving")
+    src = maze.start if src is None else src
+    dest = maze.end if dest is None else dest
+    dim = maze.dim
+    steps = get_solver(name)(maze, src[0] * dim + src[1], dest[0] * dim + dest[1])
+    if instant:
+        steps = replay(*trace_solver(steps))
+    # touched collects the nodes marked since the caller last cleared it, so
+    # only those need drawing again
+    return {"steps": steps, "dest": tuple(dest), "result": None, "touched": []}
+
+
+def trace_solver(steps):
+    """
+    Runs a solver generator to the end
+    @param steps: Generator from a solver function
+    @return: (list of expanded flat indices in order, Solution)
+    """
+    trace = []
+    try:
+        while True:
+            trace.append(next(steps))
+    except StopIteration as done:
+        return trace, done.value
+
+
+def replay(trace, result):
+    """
+    Generator yielding the nodes of a solver trace and returning its Solution,
+    which can be stepped through like the solver itself
+    @param trace: List of expanded flat indices
+    @param result: Solution of the solver
+    """
+    yield from trace
+    return result
+
+
+def step_solver(maze, state, animate=True):
+    """
+    Runs a started solver until it expands one more node
+    @param maze: Maze being solved
+    @param state: State from start_solver
+    @param animate: Whether to mark the expanded node as path, default True
+    @return: None while the solver is running, then its Solution
+    """
+    if state["result"] is not None:
+        return state["result"]
+    try:
+        index = next(state["steps"])
+    except StopIteration as done:
+        state["result"] = done.value
+        if animate and done.value.found:
+            maze.grid[state["dest"]] = 2
+            state["touched"].append(state["dest"][0] * maze.dim + state["dest"][1])
+        return done.value
+    if animate:
+        maze.grid.set(index, 2)
+        state["touched"].append(index)
+    return None
+
+
+def record(stats, began, expanded, result):
+    """
+    Records solver steps to a Stats
+    @param stats: instrument.Stats to record to
+    @param began: time.perf_counter() value when the steps began
+    @param expanded: Number of nodes expanded
+    @param result: Solution if the solver is done, otherwise None
+    """
+    stats.add_time("solver", time.perf_counter() - began)
+    stats.count("solver.expanded", expanded)
+    if result is not None:
+        stats.count("solver.calls")
+        stats.peak("solver.frontier", result.max_frontier)
+
+
+def advance_solver(maze, state, steps, deadline=None, stats=None):
+    """
+    Runs a started solver for a number of steps, or until a deadline
+    @param maze: Maze being solved
+    @param state: State from start_solver
+    @param steps: Most nodes to expand
+    @param deadline: time.perf_counter() value to stop at, default no deadline
+    @param stats: instrument.Stats to record to, defaults to the one recording
+    @return: (number of steps run, None while the solver is running, then its
+    Solution)
+    """
+    stats = instrument.active(stats)
+    if stats is not None:
+        began = time.perf_counter()
+    result = state["result"]
+    done = 0
+    while done < steps and result is None:
+        result = step_solver(maze, state)
+        done += 1
+        # Checking the clock every step would cost more than the steps
+        if deadline is not None and done % 64 == 0 and time.perf_counter() > deadline:
+            break
+    if stats is not None and done:
+        # The step that finds the solver is done doesn't expand a node
+        record(stats, began, done - (result is not None), result)
+    return done, result
+
+
+def solve(name, maze, src=None, dest=None, stats=None):
+    """
+    Runs a solver to the end without touching the maze
+    @param name: Name of the solver
+    @param maze: Maze to solve
+    @param src: Source (row, col), defaults to the maze start
+    @param dest: Destination (row, col), defaults to the maze end
+    @param stats: instrument.Stats to record to, defaults to the one recording
+    @return: Solution
+    """
+    stats = instrument.active(stats)
+    if stats is not None:
+        began = time.perf_counter()
+    state = start_solver(name, maze, src, dest)
+    result = None
+    while result is None:
+        result = step_solver(maze, state, animate=False)
+    if stats is not None:
+        record(stats, began, result.expanded, result)
+    return result
+
+
+def path_neighbors(grid, index):
+    """
+    Returns the flat indices of the non-wall nodes next to a node
+    @param grid: Grid of the maze
+    @param index: Flat index of node
+    """
+    cells = grid.cells
+    return [
+        index + move[0]
+        for move in grid.moves[grid.masks[index]]
+        if cells[index + move[0]] != 1
+    ]
+
+
+def to_path(dim, indices):
+    """
+    Turns flat indices into (row, col) nodes
+    @param dim: Dimension of the maze
+    @param indices: Iterable of flat indices
+    """
+    return [divmod(index, dim) for index in indices]
+
+
+def walk_back(came_from, node):
+    """
+    Follows came_from links from a node back to the node the search started at
+    @param came_from: Dict of flat index to the flat index it was reached from
+    @param node: Flat index to start from
+    @return: List of flat indices, starting with node
+    """
+    path = [node]
+    while came_from[path[-1]] is not None:
+        path.append(came_from[path[-1]])
+    return path
+
+
+@register_solver("astar")
+def astar(maze, src, dest):
+    """
+    A* search with the manhattan distance on flat indices
+    It finds a path of the same length as Maze.route_astar, but that uses the
+    euclidean distance by default and breaks ties differently, so the nodes
+    expanded and their order can differ
+    @param maze: Maze to solve
+    @param src: Source flat index
+    @param dest: Destination flat index
+    """
+    grid = maze.grid
+    dim = maze.dim
+    dest_row, dest_col = divmod(dest, dim)
+
+    def heuristic(index):
+        row, col = divmod(index, dim)
+        return abs(dest_row - row) + abs(dest_col - col)
+
+    came_from = {src: None}
+    g_score = {src: 0}
+    nodes = [(heuristic(src), 0, src)]
+    closed = set()
+    counter = 0
+    max_frontier = 1
+    while nodes:
+        _, _, current = heapq.heappop(nodes)
+        if current in closed:
+            continue
+        if current == dest:
+            path = to_path(dim, reversed(walk_back(came_from, dest)))
+            return Solution(True, path, len(closed), max_frontier)
+        closed.add(current)
+        yield current
+        route_score = g_score[current] + 1
+        for neighbor in path_neighbors(grid, current):
+            if neighbor in closed:
+                continue
+            if neighbor not in g_score or route_score < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = route_score
+                counter += 1
+                heapq.heappush(
+                    nodes, (route_score + heuristic(neighbor), counter, neighbor)
+                )
+        max_frontier = max(max_frontier, len(nodes))
+    return Solution(False, [], len(closed), max_frontier)
+
+
+@register_solver("bfs")
+def bfs(maze, src, dest):
+    """
+    Breadth first search, which finds a shortest path without a heuristic
+    @param maze: Maze to solve
+    @param src: Source flat index
+    @param dest: Destination flat index
+    """
+    grid = maze.grid
+    came_from = {src: None}
+    queue = deque([src])
+    expanded = 0
+    max_frontier = 1
+    while queue:
+        current = queue.popleft()
+        if current == dest:
+            path = to_path(maze.dim, reversed(walk_back(came_from, dest)))
+            return Solution(True, path, expanded, max_frontier)
+        expanded += 1
+        yield current
+        for neighbor in path_neighbors(grid, current):
+            if neighbor not in came_from:
+                came_from[neighbor] = current
+                queue.append(neighbor)
+        max_frontier = max(max_frontier, len(queue))
+    return Solution(False, [], expanded, max_frontier)
+
+
+@register_solver("bidirectional")
+def bidirectional_bfs(maze, src, dest):
+    """
+    Breadth first search from both ends at once, a layer at a time from
+    whichever side has the smaller frontier, until the two searches meet
+    @param maze: Maze to solve
+    @param src: Source flat index
+    @param dest: Destination flat index
+    """
+    grid = maze.grid
+    if src == dest:
+        return Solution(True, to_path(maze.dim, [src]), 0, 1)
+    forward = {src: None}
+    backward = {dest: None}
+    forward_layer = [src]
+    backward_layer = [dest]
+    expanded = 0
+    max_frontier = 2
+    while forward_layer and backward_layer:
+        if len(forward_layer) <= len(backward_layer):
+            layer, came_from, other = forward_layer, forward, backward
+        else:
+            layer, came_from, other = backward_layer, backward, forward
+        next_layer = []
+        meeting = None
+        for current in layer:
+            expanded += 1
+            yield current
+            for neighbor in path_neighbors(grid, current):
+                if neighbor in came_from:
+                    continue
+                came_from[neighbor] = current
+                if neighbor in other:
+                    meeting = neighbor
+                    break
+                next_layer.append(neighbor)
+            if meeting is not None:
+                path = walk_back(forward, meeting)[::-1]
+                path += walk_back(backward, meeting)[1:]
+                return Solution(True, to_path(maze.dim, path), expanded, max_frontier)
+        if came_from is forward:
+            forward_layer = next_layer
+        else:
+            backward_layer = next_layer
+        max_frontier = max(max_frontier, len(forward_layer) + len(backward_layer))
+    return Solution(False, [], expanded, max_frontier)
+
+
+@register_solver("dead-end")
+def dead_end_filling(maze, src, dest):
+    """
+    Dead-end filling, which fills in dead ends until only the ways from the
+    source to the destination are left, then walks what is left
+    In a perfect maze what is left is exactly the solution path
+    @param maze: Maze to solve
+    @param src: Source flat index
+    @param dest: Destination flat index
+    """
+    grid = maze.grid
+    cells = grid.cells
+    size = maze.dim * maze.dim
+    # Open neighbors of every path node, which goes down as dead ends are filled
+    degree = bytearray(size)
+    dead_ends = deque()
+    for index in range(size):
+        if cells[index] == 1:
+            continue
+        degree[index] = len(path_neighbors(grid, index))
+        if degree[index] <= 1 and index != src and index != dest:
+            dead_ends.append(index)
+    filled = bytearray(size)
+    expanded = 0
+    max_frontier = len(dead_ends)
+    while dead_ends:
+        current = dead_ends.popleft()
+        if filled[current]:
+            continue
+        filled[current] = 1
+        expanded += 1
+        yield current
+        for neighbor in path_neighbors(grid, current):
+            if filled[neighbor]:
+                continue
+            degree[neighbor] -= 1
+            if degree[neighbor] == 1 and neighbor != src and neighbor != dest:
+                dead_ends.append(neighbor)
+        max_frontier = max(max_frontier, len(dead_ends))
+    # Walk whatever is left, which only has loops left in it if the maze has any
+    came_from = {src: None}
+    queue = deque([src])
+    while queue:
+        current = queue.popleft()
+        if current == dest:
+            path = to_path(maze.dim, reversed(walk_back(came_from, dest)))
+            return Solution(True, path, expanded, max_frontier)
+        for neighbor in path_neighbors(grid, current):
+            if not filled[neighbor] and neighbor not in came_from:
+                came_from[neighbor] = current
+                queue.append(neighbor)
+    return Solution(False, [], expanded, max_frontier)
+
+
+# Headings for the wall followers in clockwise order, as (row change, col change)
+HEADINGS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+
+
+def follow_wall(maze, src, dest, turn):
+    """
+    Walks through the maze keeping one hand on the wall
+    Always finds the destination in a perfect maze, but can walk around a loop
+    forever in a maze with loops, so it gives up when it gets back to where it
+    has already been facing the same way
+    @param maze: Maze to solve
+    @param src: Source flat index
+    @param dest: Destination flat index
+    @param turn: 3 to follow the left wall, 1 to follow the right wall
+    """
+    cells = maze.grid.cells
+    dim = maze.dim
+    row, col = divmod(src, dim)
+    heading = 0
+    seen = set()
+    # Stepping back onto a node already on the path cuts the path back to it,
+    # so the path never includes dead ends the walk went into and back out of
+    path = [src]
+    on_path = {src: 0}
+    expanded = 0
+    while path[-1] != dest:
+        if (row, col, heading) in seen:
+            return Solution(False, [], expanded, 1)
+        seen.add((row, col, heading))
+        # Try the hand side first, then straight on, the other side and back
+        for offset in (turn, 0, 4 - turn, 2):
+            d_row, d_col = HEADINGS[(heading + offset) % 4]
+            if (
+                0 <= row + d_row < dim
+                and 0 <= col + d_col < dim
+                and cells[(row + d_row) * dim + col + d_col] != 1
+            ):
+                heading = (heading + offset) % 4
+                break
+        else:
+            # Walled in on every side
+            return Solution(False, [], expanded, 1)
+        row += d_row
+        col += d_col
+        current = row * dim + col
+        expanded += 1
+        yield current
+        if current in on_path:
+            while path[-1] != current:
+                del on_path[path.pop()]
+        else:
+            on_path[current] = len(path)
+            path.append(current)
+    return Solution(True, to_path(dim, path), expanded, 1)
+
+
+@register_solver("left-wall")
+def left_wall_follower(maze, src, dest):
+    """
+    Wall follower keeping its left hand on the wall
+    @param maze: Maze to solve
+    @param src: Source flat index
+    @param dest: Destination flat index
+    """
+    return (yield from follow_wall(maze, src, dest, 3))
+
+
+@register_solver("right-wall")
+def right_wall_follower(maze, src, dest):
+    """
+    Wall follower keeping its right hand on the wall
+    @param maze: Maze to solve
+    @param src: Source flat index
+    @param dest: Destination flat index
+    """
+    return (yield from follow_wall(maze, src, dest, 1))
@@ -0,0 +1,476 @@
+"""
+Grid stored in a file as square tiles, for mazes too big to keep in memory
+
+A file is a fixed size header followed by the tiles:
+    magic        4 bytes, MAGIC
+    version      1 byte, FORMAT_VERSION
+    reserved     1 byte, 0
+    tile         2 bytes, nodes along each side of a tile
+    dim          4 bytes
+    tiles        tile * tile / 4 bytes each, in row-major order of tiles
+
+Every tile holds tile * tile nodes in row-major order at 2 bits a node, four
+nodes to a byte with the first node in the lowest bits, so node types 0 to 3
+can be stored. Tiles along the bottom and right of the grid are stored whole,
+with the nodes past the edge of the grid left as 0
+All numbers are little-endian
+"""
+import mmap
+import struct
+from collections import OrderedDict
+
+from .grid import DELTAS, Grid
+
+MAGIC = b"SNKT"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sBBHI")
+
+# Nodes along each side of a tile, 16KB of file per tile
+DEFAULT_TILE = 256
+# Most tiles kept unpacked at once, 64 tiles of 256 * 256 nodes is 4MB
+DEFAULT_MAX_TILES = 64
+# Node types take 2 bits in a file, so only these fit
+MAX_NODE = 3
+
+
+def pack_tile(nodes):
+    """
+    Packs node types into 2 bits each, four to a byte
+    Every fourth node is read as one big integer with a node in each byte, and
+    node types are below 4, so shifting them into place never carries into the
+    next byte
+    @param nodes: Bytes-like of node types, a multiple of 4 long
+    """
+    number = 0
+    for shift in range(4):
+        number |= int.from_bytes(nodes[shift::4], "little") << 2 * shift
+    return number.to_bytes(len(nodes) // 4, "little")
+
+
+def unpack_tile(data):
+    """
+    Unpacks bytes from pack_tile back into a bytearray of node types
+    @param data: Packed bytes
+    """
+    size = len(data)
+    number = int.from_bytes(data, "little")
+    low_bits = int.from_bytes(b"\x03" * size, "little")
+    nodes = bytearray(size * 4)
+    for shift in range(4):
+        nodes[shift::4] = ((number >> 2 * shift) & low_bits).to_bytes(size, "little")
+    return nodes
+
+
+class TiledGrid:
+    """
+    Square grid of maze nodes kept in a file rather than in memory, which works
+    like a Grid through get, set, neighbors, frontier and grid[row, col]
+
+    The file is memory mapped and split into tiles, which are only unpacked when
+    a node in them is used. Unpacked tiles are kept in a least recently used
+    cache, and changed tiles are packed back into the file when they drop out of
+    it or on flush, so memory use depends on max_tiles rather than the grid
+
+    Node types are limited to 0 to 3, and anything needing the whole grid at
+    once, such as path_counts or a DistanceField, needs an in-memory Grid
+    """
+
+    def __init__(self, filename, max_tiles=DEFAULT_MAX_TILES, writable=True):
+        """
+        Opens a TiledGrid file made by create or from_grid
+        @param filename: Filename as a string
+        @param max_tiles: Most tiles to keep unpacked at once
+        @param writable: Whether nodes can be changed, default True
+        """
+        self.filename = filename
+        self.max_tiles = max_tiles
+        self.writable = writable
+        self.file = open(filename, "r+b" if writable else "rb")
+        try:
+            magic, version, _, tile, dim = HEADER.unpack(self.file.read(HEADER.size))
+        except struct.error:
+            magic = None
+        if magic != MAGIC:
+            self.file.close()
+            raise ValueError("Not a tiled grid file")
+        if version > FORMAT_VERSION:
+            self.file.close()
+            raise ValueError(f"Unsupported tiled grid file version {version}")
+        tiles_across = -(-dim // tile)
+        tile_bytes = tile * tile // 4
+        if self.file.seek(0, 2) < HEADER.size + tiles_across**2 * tile_bytes:
+            self.file.close()
+            raise ValueError("Truncated tiled grid file")
+        self.map = mmap.mmap(
+            self.file.fileno(),
+            0,
+            access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ,
+        )
+        # Tiles are read all over the file, so reading ahead of them only maps
+        # in pages that aren't used (madvise is only there on newer Pythons)
+        if hasattr(self.map, "madvise") and hasattr(mmap, "MADV_RANDOM"):
+            self.map.madvise(mmap.MADV_RANDOM)
+        self.dim = dim
+        self.tile = tile
+        self.tiles_across = tiles_across
+        self.tile_bytes = tile_bytes
+        self.tiles = OrderedDict()
+        self.dirty = set()
+        # Counts up on every change, the same as Grid.version
+        self.version = 0
+        # Counts up on every change turning a wall into anything else or back
+        self.wall_version = 0
+        # Number of tiles unpacked from the file
+        self.loads = 0
+        # Last overview from sample, as (size, places, nodes) where places maps
+        # a sampled row or column to its places along the side of the overview
+        self.overview = None
+
+    @staticmethod
+    def create(filename, dim, fill=0, tile=DEFAULT_TILE, **kwargs):
+        """
+        Makes a new file of nodes all of one type and opens it
+        A grid of 0s is written as a sparse file, so it takes no time or disk
+        space until tiles are changed
+        @param filename: Filename as a string
+        @param dim: Dimension of the grid
+        @param fill: Node type every node starts as, default 0
+        @param tile: Nodes along each side of a tile, must be even
+        @param kwargs: Passed on to TiledGrid
+        """
+        if tile <= 0 or tile % 2:
+            raise ValueError(f"Tile size must be even, got {tile}")
+        if not 0 <= fill <= MAX_NODE:
+            raise ValueError(f"Node type {fill} doesn't fit in a tiled grid")
+        tiles_across = -(-dim // tile)
+        tile_bytes = tile * tile // 4
+        with open(filename, "wb") as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, tile, dim))
+            if fill:
+                # Nodes past the edge of the grid get the fill too, which is
+                # never seen
+                packed = bytes([fill * 0x55]) * tile_bytes
+                for _ in range(tiles_across * tiles_across):
+                    file.write(packed)
+            else:
+                file.truncate(HEADER.size + tiles_across**2 * tile_bytes)
+        return TiledGrid(filename, **kwargs)
+
+    @staticmethod
+    def from_grid(filename, grid, tile=DEFAULT_TILE, **kwargs):
+        """
+        Writes the nodes of a Grid to a new file and opens it
+        @param filename: Filename as a string
+        @param grid: Grid (or TiledGrid) to copy
+        @param tile: Nodes along each side of a tile, must be even
+        @param kwargs: Passed on to TiledGrid
+        """
+        tiled = TiledGrid.create(filename, grid.dim, tile=tile, **kwargs)
+        dim = grid.dim
+        for first_row in range(0, dim, tile):
+            rows = min(tile, dim - first_row)
+            for first_col in range(0, dim, tile):
+                cols = min(tile, dim - first_col)
+                tiled.set_region(
+                    first_row,
+                    first_col,
+                    cols,
+                    grid.region(first_row, first_col, rows, cols),
+                )
+        tiled.flush()
+        return tiled
+
+    def to_grid(self):
+        """
+        Returns the whole grid as an in-memory Grid
+        """
+        return Grid(self.dim, cells=self.region(0, 0, self.dim, self.dim))
+
+    def tile_offset(self, number):
+        """
+        Returns where a tile starts in the file
+        @param number: Tile number, tile row * tiles_across + tile column
+        """
+        return HEADER.size + number * self.tile_bytes
+
+    def load(self, number):
+        """
+        Returns the unpacked nodes of a tile, unpacking it if it isn't cached
+        and packing the least recently used tile back if the cache is full
+        @param number: Tile number, tile row * tiles_across + tile column
+        """
+        nodes = self.tiles.get(number)
+        if nodes is not None:
+            self.tiles.move_to_end(number)
+            return nodes
+        offset = self.tile_offset(number)
+        nodes = unpack_tile(self.map[offset : offset + self.tile_bytes])
+        self.loads += 1
+        self.tiles[number] = nodes
+        while len(self.tiles) > self.max_tiles:
+            evicted, evicted_nodes = self.tiles.popitem(last=False)
+            if evicted in self.dirty:
+                self.store(evicted, evicted_nodes)
+        return nodes
+
+    def store(self, number, nodes):
+        """
+        Packs a tile back into the file
+        @param number: Tile number
+        @param nodes: Unpacked nodes of the tile
+        """
+        offset = self.tile_offset(number)
+        self.map[offset : offset + self.tile_bytes] = pack_tile(nodes)
+        self.dirty.discard(number)
+
+    def flush(self):
+        """
+        Packs every changed tile back into the file and writes it to disk
+        """
+        for number in list(self.dirty):
+            self.store(number, self.tiles[number])
+        if self.writable:
+            self.map.flush()
+
+    def close(self):
+        """
+        Flushes any changes and closes the file
+        """
+        if not self.map.closed:
+            self.flush()
+            self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def locate(self, index):
+        """
+        Returns the tile number of a node and its index within the tile
+        @param index: Flat index of node
+        """
+        row, col = divmod(index, self.dim)
+        tile = self.tile
+        tile_row, in_row = divmod(row, tile)
+        tile_col, in_col = divmod(col, tile)
+        return tile_row * self.tiles_across + tile_col, in_row * tile + in_col
+
+    def index(self, row, col):
+        """
+        Returns the flat index of a node
+        @param row: Row of node
+        @param col: Column of node
+        """
+        return row * self.dim + col
+
+    def get(self, index):
+        """
+        Returns the node type at a flat index
+        @param index: Flat index of node
+        """
+        number, offset = self.locate(index)
+        return self.load(number)[offset]
+
+    def peek(self, index):
+        """
+        Returns the node type at a flat index without unpacking its tile, reading
+        the 2 bits straight from the file unless the tile is already unpacked
+        @param index: Flat index of node
+        """
+        number, offset = self.locate(index)
+        nodes = self.tiles.get(number)
+        if nodes is not None:
+            return nodes[offset]
+        byte = self.map[self.tile_offset(number) + offset // 4]
+        return (byte >> 2 * (offset % 4)) & MAX_NODE
+
+    def set(self, index, value):
+        """
+        Sets the node type at a flat index
+        @param index: Flat index of node
+        @param value: New node type, 0 to 3
+        """
+        if not self.writable:
+            raise ValueError("Tiled grid was opened read only")
+        if not 0 <= value <= MAX_NODE:
+            raise ValueError(f"Node type {value} doesn't fit in a tiled grid")
+        number, offset = self.locate(index)
+        nodes = self.load(number)
+        was_wall = nodes[offset] == 1
+        nodes[offset] = value
+        self.dirty.add(number)
+        self.version += 1
+        if was_wall != (value == 1):
+            self.wall_version += 1
+        if self.overview is not None:
+            # Keep the overview from sample up to date if this node is in it
+            size, places, overview = self.overview
+            row, col = divmod(index, self.dim)
+            for row_place in places.get(row, ()):
+                for col_place in places.get(col, ()):
+                    overview[row_place * size + col_place] = value
+
+    def region(self, first_row, first_col, rows, cols):
+        """
+        Returns the node types of a rectangle of the grid, unpacking only the
+        tiles it covers
+        @param first_row: Top row of the rectangle
+        @param first_col: Left column of the rectangle
+        @param rows: Number of rows
+        @param cols: Number of columns
+        @return: Bytearray of rows * cols node types in row-major order
+        """
+        result = bytearray(rows * cols)
+        tile = self.tile
+        for tile_row in range(first_row // tile, (first_row + rows - 1) // tile + 1):
+            top = max(first_row, tile_row * tile)
+            bottom = min(first_row + rows, (tile_row + 1) * tile)
+            for tile_col in range(
+                first_col // tile, (first_col + cols - 1) // tile + 1
+            ):
+                left = max(first_col, tile_col * tile)
+                right = min(first_col + cols, (tile_col + 1) * tile)
+                nodes = self.load(tile_row * self.tiles_across + tile_col)
+                for row in range(top, bottom):
+                    start = (row - tile_row * tile) * tile + left - tile_col * tile
+                    end = (row - first_row) * cols + left - first_col
+                    result[end : end + right - left] = nodes[
+                        start : start + right - left
+                    ]
+        return result
+
+    def set_region(self, first_row, first_col, cols, values):
+        """
+        Sets the node types of a rectangle of the grid, a tile at a time
+        @param first_row: Top row of the rectangle
+        @param first_col: Left column of the rectangle
+        @param cols: Number of columns, the rows follow from len(values)
+        @param values: Bytes-like of node types in row-major order
+        """
+        if not self.writable:
+            raise ValueError("Tiled grid was opened read only")
+        values = bytes(values)
+        if values and max(values) > MAX_NODE:
+            raise ValueError(f"Node type {max(values)} doesn't fit in a tiled grid")
+        rows = len(values) // cols
+        tile = self.tile
+        for tile_row in range(first_row // tile, (first_row + rows - 1) // tile + 1):
+            top = max(first_row, tile_row * tile)
+            bottom = min(first_row + rows, (tile_row + 1) * tile)
+            for tile_col in range(
+                first_col // tile, (first_col + cols - 1) // tile + 1
+            ):
+                left = max(first_col, tile_col * tile)
+                right = min(first_col + cols, (tile_col + 1) * tile)
+                number = tile_row * self.tiles_across + tile_col
+                nodes = self.load(number)
+                for row in range(top, bottom):
+                    start = (row - tile_row * tile) * tile + left - tile_col * tile
+                    end = (row - first_row) * cols + left - first_col
+                    nodes[start : start + right - left] = values[
+                        end : end + right - left
+                    ]
+                self.dirty.add(number)
+        # Walls may have changed anywhere in the rectangle
+        self.version += 1
+        self.wall_version += 1
+        self.overview = None
+
+    def row(self, row):
+        """
+        Returns the node types of one row of the grid
+        @param row: Row to read
+        """
+        return self.region(row, 0, 1, self.dim)
+
+    def sample(self, size):
+        """
+        Returns a size by size overview of the grid, the node nearest to each
+        point of an evenly spaced size by size lattice, without unpacking tiles
+        The points are all over the file, so the overview is kept and set keeps
+        it up to date rather than it being read again after every change
+        @param size: Number of points along each side
+        @return: Bytes of size * size node types in row-major order
+        """
+        if self.overview is None or self.overview[0] != size:
+            points = [point * self.dim // size for point in range(size)]
+            places = {}
+            for place, point in enumerate(points):
+                places.setdefault(point, []).append(place)
+            overview = bytearray(
+                self.peek(row * self.dim + col) for row in points for col in points
+            )
+            self.overview = (size, places, overview)
+        return bytes(self.overview[2])
+
+    def neighbors(self, index):
+        """
+        Returns the flat indices of the nodes next to a node, in the same order
+        as Grid.neighbors
+        @param index: Flat index of node
+        """
+        row, col = divmod(index, self.dim)
+        dim = self.dim
+        return [
+            index + d_row * dim + d_col
+            for d_row, d_col in DELTAS
+            if 0 <= row + d_row < dim and 0 <= col + d_col < dim
+        ]
+
+    def path_count(self, index):
+        """
+        Returns how many of the nodes next to a node are paths
+        @param index: Flat index of node
+        """
+        return sum(self.get(neighbor) != 1 for neighbor in self.neighbors(index))
+
+    def frontier(self, index):
+        """
+        Returns the flat indices of the walls next to a node that could become
+        path without touching any path other than the node itself
+        Same rule as Grid.frontier, counting path neighbors as it goes
+        @param index: Flat index of node
+        """
+        own = 0 if self.get(index) == 1 else 1
+        return [
+            neighbor
+            for neighbor in self.neighbors(index)
+            if self.get(neighbor) == 1 and self.path_count(neighbor) == own
+        ]
+
+    def _check(self, row, col):
+        """
+        Raises an IndexError if (row, col) is outside of the grid
+        @param row: Row of node
+        @param col: Column of node
+        """
+        if not (0 <= row < self.dim and 0 <= col < self.dim):
+            raise IndexError(f"Node ({row}, {col}) is outside of the grid")
+
+    def __getitem__(self, key):
+        """
+        grid[row, col] returns a node type
+        @param key: (row, col)
+        """
+        row, col = key
+        self._check(row, col)
+        return self.get(row * self.dim + col)
+
+    def __setitem__(self, key, value):
+        """
+        grid[row, col] = type sets a node
+        @param key: (row, col)
+        @param value: Node type
+        """
+        row, col = key
+        self._check(row, col)
+        self.set(row * self.dim + col, value)
+
+    def __len__(self):
+        return self.dim
+
+    def __repr__(self):
+        return f"TiledGrid({self.filename!r}, {self.dim})"
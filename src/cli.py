@@ -0,0 +1,543 @@
+"""
+Command line tools for mazes, run with python -m src.cli <command>
+
+Every command prints JSON, one object per line for every maze it works on, so
+the output can be piped into other tools. A maze that fails gets an "error"
+in its object and the command exits with 1 at the end
+Mazes can be given as names of saved mazes, .maze, .json or .tiled files or
+directories of .maze files, and anything that saves without a file goes to the library
+
+Nothing here imports Qt, and the maze modules are only imported by the
+commands that use them, so starting up stays fast
+"""
+import argparse
+import json
+import os
+import sys
+
+# Smallest maze that has a start and an end in different places
+MIN_DIM = 2
+
+
+class ArgumentParser(argparse.ArgumentParser):
+    """
+    Argument parser that reports bad arguments as JSON like every other error,
+    with the usage still going to stderr
+    Extends argparse.ArgumentParser
+    """
+
+    def error(self, message):
+        """
+        Reports a bad argument and exits with 1
+        @param message: What was wrong
+        """
+        self.print_usage(sys.stderr)
+        emit({"error": message})
+        sys.exit(1)
+
+
+def maze_dim(text):
+    """
+    Parses a maze dimension, which has to be at least MIN_DIM
+    @param text: Argument as a string
+    """
+    try:
+        dim = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{text!r} is not a whole number")
+    if dim < MIN_DIM:
+        raise argparse.ArgumentTypeError(f"Mazes have to be at least {MIN_DIM} across")
+    return dim
+
+
+def emit(result):
+    """
+    Prints one result as a line of JSON
+    @param result: Dict to print
+    """
+    print(json.dumps(result), flush=True)
+
+
+def load_maze(filename):
+    """
+    Loads a maze from a .maze, a .json or a .tiled file
+    Tiled mazes stay in their file and are only read, see Maze.open_tiled for
+    what works on them
+    @param filename: Filename as a string
+    """
+    from src.Maze.maze import Maze
+
+    if filename.endswith(".json"):
+        from src.Maze.export import from_dict
+
+        with open(filename, encoding="utf-8") as file:
+            return from_dict(json.load(file))
+    if filename.endswith(".tiled"):
+        return Maze.open_tiled(filename, writable=False)
+    return Maze.load_from_file(filename)
+
+
+def each_maze(items):
+    """
+    Loads every maze named on the command line, directories give every .maze
+    file inside of them
+    @param items: List of names or paths as strings
+    @return: Generator of (filename, Maze or None, error message or None)
+    """
+    from src.Maze.batch import resolve_maze_files
+
+    for item in items:
+        try:
+            filenames = resolve_maze_files([item])
+        except ValueError as e:
+            yield item, None, str(e)
+            continue
+        for filename in filenames:
+            try:
+                yield filename, load_maze(filename), None
+            except Exception as e:
+                yield filename, None, str(e)
+
+
+def single_maze(item):
+    """
+    Loads the one maze named on the command line, for commands that only work
+    on a single maze
+    @param item: Name or path as a string
+    @return: (filename, Maze or None, error message or None)
+    """
+    from src.Maze.batch import resolve_maze_files
+
+    try:
+        filenames = resolve_maze_files([item])
+    except ValueError as e:
+        return item, None, str(e)
+    if len(filenames) != 1:
+        return item, None, f"Expected one maze in {item!r}, found {len(filenames)}"
+    filename, maze, error = next(each_maze(filenames))
+    return filename, maze, error
+
+
+def save_maze(maze, output, replace):
+    """
+    Saves a maze to a file, or to the library if no file is given
+    @param maze: Maze to save
+    @param output: Filename as a string, or None for the library
+    @param replace: Whether to replace a saved maze with the same name
+    @return: Filename saved to
+    """
+    from src.Maze.maze import Maze
+
+    if output:
+        maze.save_to_file(filename=output)
+        return output
+    if maze.name in Maze.get_saved_mazes() and not replace:
+        raise ValueError(f"A saved maze is already named {maze.name!r}")
+    maze.save_to_file(discard_old=True)
+    return Maze.saved_mazes[maze.name]
+
+
+def generate_command(args):
+    """
+    Generates a maze and saves it
+    @param args: argparse namespace
+    """
+    import random
+
+    from src.Maze.maze import Maze
+
+    seed = random.getrandbits(32) if args.seed is None else args.seed
+    maze = Maze(args.name, args.dim, args.difficulty)
+    try:
+        maze.randomize(args.generator, seed=seed)
+        filename = save_maze(maze, args.output, args.replace)
+    except (ValueError, OSError) as e:
+        emit({"name": args.name, "error": str(e)})
+        return 1
+    emit(
+        {
+            "name": maze.name,
+            "filename": filename,
+            "dim": maze.dim,
+            "difficulty": maze.difficulty,
+            "generator": args.generator,
+            "seed": seed,
+        }
+    )
+    return 0
+
+
+def solve_maze(solver, maze):
+    """
+    Solves a maze, checking its start and end first
+    @param solver: Name of the solver
+    @param maze: Maze to solve
+    @return: Solution
+    """
+    from src.Maze.solvers import solve
+
+    errors = node_errors(maze)
+    if errors:
+        raise ValueError(errors[0])
+    return solve(solver, maze)
+
+
+def solve_command(args):
+    """
+    Solves mazes
+    @param args: argparse namespace
+    """
+    from src.Maze.solvers import get_solver
+
+    try:
+        get_solver(args.solver)
+    except ValueError as e:
+        emit({"error": str(e)})
+        return 1
+    failed = False
+    for filename, maze, error in each_maze(args.mazes):
+        if error is not None:
+            emit({"filename": filename, "error": error})
+            failed = True
+            continue
+        try:
+            solution = solve_maze(args.solver, maze)
+        except Exception as e:
+            emit({"name": maze.name, "filename": filename, "error": str(e)})
+            failed = True
+            continue
+        result = {
+            "name": maze.name,
+            "filename": filename,
+            "solvable": solution.found,
+            "length": len(solution.path),
+            "expanded": solution.expanded,
+        }
+        if args.path:
+            result["path"] = solution.path
+        emit(result)
+        failed = failed or not solution.found
+    return 1 if failed else 0
+
+
+def node_errors(maze):
+    """
+    Returns what is wrong with the start and end of a maze, which solvers
+    can't work with
+    @param maze: Maze to check
+    @return: List of messages, empty if both are fine
+    """
+    errors = []
+    for label, node in (("start", maze.start), ("end", maze.end)):
+        if not all(0 <= value < maze.dim for value in node):
+            errors.append(f"The {label} {list(node)} is outside of the maze")
+        elif maze.grid[tuple(node)] == 1:
+            errors.append(f"The {label} {list(node)} is a wall")
+    return errors
+
+
+def maze_errors(maze):
+    """
+    Returns everything wrong with a maze that would stop it being played
+    @param maze: Maze to check
+    @return: List of messages, empty if the maze is fine
+    """
+    errors = node_errors(maze)
+    if not errors and not maze.is_solvable():
+        errors.append("The end can't be reached from the start")
+    return errors
+
+
+def validate_command(args):
+    """
+    Checks that mazes can be loaded and solved
+    @param args: argparse namespace
+    """
+    failed = False
+    for filename, maze, error in each_maze(args.mazes):
+        try:
+            errors = [error] if error is not None else maze_errors(maze)
+        except TypeError as e:
+            errors = [str(e)]
+        emit(
+            {
+                "name": maze.name if maze else None,
+                "filename": filename,
+                "valid": not errors,
+                "errors": errors,
+            }
+        )
+        failed = failed or bool(errors)
+    return 1 if failed else 0
+
+
+def render_command(args):
+    """
+    Draws a maze as a PNG or as text
+    @param args: argparse namespace
+    """
+    from src.Maze.export import to_png, to_text
+
+    filename, maze, error = single_maze(args.maze)
+    if error is not None:
+        emit({"filename": filename, "error": error})
+        return 1
+    if args.solution:
+        try:
+            solution = solve_maze(args.solver, maze)
+        except Exception as e:
+            emit({"name": maze.name, "filename": filename, "error": str(e)})
+            return 1
+        if not solution.found:
+            emit(
+                {
+                    "name": maze.name,
+                    "filename": filename,
+                    "error": "The end can't be reached from the start",
+                }
+            )
+            return 1
+        for node in solution.path:
+            maze.grid[node] = 2
+    if args.output is None:
+        # Nothing else is printed, so the text can go straight into a file
+        sys.stdout.write(to_text(maze))
+        return 0
+    try:
+        if args.output.endswith(".png"):
+            with open(args.output, "wb") as file:
+                file.write(to_png(maze, scale=args.scale))
+        else:
+            with open(args.output, "w", encoding="utf-8") as file:
+                file.write(to_text(maze))
+    except OSError as e:
+        emit({"name": maze.name, "filename": filename, "error": str(e)})
+        return 1
+    emit({"name": maze.name, "filename": filename, "output": args.output})
+    return 0
+
+
+def stats_command(args):
+    """
+    Describes mazes
+    @param args: argparse namespace
+    """
+    from src.Maze.grid import PATH_TABLE
+    from src.Maze.solvers import DEFAULT_SOLVER, solve
+
+    # Maps path counts to 1 for a dead end (a single path neighbor) or 0
+    dead_end_table = bytes(1 if value == 1 else 0 for value in range(256))
+    failed = False
+    for filename, maze, error in each_maze(args.mazes):
+        if error is not None:
+            emit({"filename": filename, "error": error})
+            failed = True
+            continue
+        if maze.is_tiled():
+            emit(
+                {
+                    "name": maze.name,
+                    "filename": filename,
+                    "error": "Stats are not supported on tiled mazes",
+                }
+            )
+            failed = True
+            continue
+        grid = maze.grid
+        paths = grid.cells.translate(PATH_TABLE)
+        # Both are a 0 or 1 in every byte, so ANDing them as integers finds the
+        # paths that are dead ends without looking at every node in Python
+        dead_ends = int.from_bytes(paths, "little") & int.from_bytes(
+            grid.path_counts.translate(dead_end_table), "little"
+        )
+        solution = None if maze_errors(maze) else solve(DEFAULT_SOLVER, maze)
+        recipe = maze.recipe
+        emit(
+            {
+                "name": maze.name,
+                "filename": filename,
+                "dim": maze.dim,
+                "difficulty": maze.difficulty,
+                "start": list(maze.start),
+                "end": list(maze.end),
+                "paths": paths.count(1),
+                "walls": len(paths) - paths.count(1),
+                "dead_ends": bin(dead_ends).count("1"),
+                "solvable": solution is not None,
+                "solution_length": len(solution.path) if solution else None,
+                "generator": recipe.generator if recipe else None,
+                "seed": recipe.seed if recipe else None,
+            }
+        )
+    return 1 if failed else 0
+
+
+def import_command(args):
+    """
+    Copies .maze or .json files into the library
+    @param args: argparse namespace
+    """
+    if args.name is not None and len(args.files) != 1:
+        emit({"error": "--name can only be used with a single file"})
+        return 1
+    failed = False
+    for filename in args.files:
+        try:
+            maze = load_maze(filename)
+            if args.name is not None:
+                maze.name = args.name
+            saved = save_maze(maze, None, args.replace)
+        except Exception as e:
+            emit({"filename": filename, "error": str(e)})
+            failed = True
+            continue
+        emit({"name": maze.name, "filename": filename, "saved": saved})
+    return 1 if failed else 0
+
+
+def write_export(maze, kind, output):
+    """
+    Writes a maze to a file in one of the export formats
+    @param maze: Maze to write
+    @param kind: "json", "tiled" or "maze"
+    @param output: Filename as a string
+    """
+    if kind == "json":
+        from src.Maze.export import to_dict
+
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(to_dict(maze), file)
+    elif kind == "tiled":
+        from src.Maze.tiled_grid import TiledGrid
+
+        TiledGrid.from_grid(output, maze.grid).close()
+    else:
+        from src.Maze import maze_file
+
+        with open(output, "wb") as file:
+            file.write(maze_file.encode(maze))
+
+
+def export_command(args):
+    """
+    Writes a maze to a .maze, .json or .tiled file
+    @param args: argparse namespace
+    """
+    filename, maze, error = single_maze(args.maze)
+    if error is not None:
+        emit({"filename": filename, "error": error})
+        return 1
+    kind = args.format or os.path.splitext(args.output)[1].lstrip(".")
+    if kind not in ("json", "tiled", "maze"):
+        emit({"filename": filename, "error": f"Unknown export format {kind!r}"})
+        return 1
+    try:
+        write_export(maze, kind, args.output)
+    except (OSError, TypeError) as e:
+        emit({"name": maze.name, "filename": filename, "error": str(e)})
+        return 1
+    emit(
+        {"name": maze.name, "filename": filename, "output": args.output, "format": kind}
+    )
+    return 0
+
+
+def make_parser():
+    """
+    Returns the argument parser for every command
+    """
+    parser = ArgumentParser(
+        prog="python -m src.cli", description="Command line tools for mazes"
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print counters and timers of the work done as a last line of JSON",
+    )
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+    # Generator and solver names are checked when a command runs, rather than
+    # listed as choices, which would mean importing them just to parse arguments
+    mazes_help = "Saved maze names, .maze files or directories"
+
+    generate = commands.add_parser("generate", help="Generate a maze and save it")
+    generate.add_argument("name", nargs="?", default="Generated")
+    generate.add_argument("--dim", type=maze_dim, default=20)
+    generate.add_argument("--difficulty", type=int, choices=(0, 1, 2), default=0)
+    generate.add_argument("--generator", default="snaking")
+    generate.add_argument("--seed", type=int, default=None)
+    generate.add_argument("--output", help="File to save to, default the library")
+    generate.add_argument(
+        "--replace", action="store_true", help="Replace a saved maze of the same name"
+    )
+    generate.set_defaults(run=generate_command)
+
+    solve = commands.add_parser("solve", help="Solve mazes")
+    solve.add_argument("mazes", nargs="+", help=mazes_help)
+    solve.add_argument("--solver", default="astar")
+    solve.add_argument("--path", action="store_true", help="Include the path")
+    solve.set_defaults(run=solve_command)
+
+    validate = commands.add_parser(
+        "validate", help="Check that mazes load and can be solved"
+    )
+    validate.add_argument("mazes", nargs="+", help=mazes_help)
+    validate.set_defaults(run=validate_command)
+
+    render = commands.add_parser(
+        "render", help="Draw a maze as text, or as a PNG with a .png output"
+    )
+    render.add_argument("maze", help="Saved maze name or .maze file")
+    render.add_argument("--output", help="File to draw to, default printed as text")
+    render.add_argument("--scale", type=int, default=4, help="Pixels per node")
+    render.add_argument("--solution", action="store_true", help="Draw the solution")
+    render.add_argument("--solver", default="astar")
+    render.set_defaults(run=render_command)
+
+    stats = commands.add_parser("stats", help="Describe mazes")
+    stats.add_argument("mazes", nargs="+", help=mazes_help)
+    stats.set_defaults(run=stats_command)
+
+    import_parser = commands.add_parser(
+        "import", help="Copy .maze or .json files into the library"
+    )
+    import_parser.add_argument("files", nargs="+")
+    import_parser.add_argument("--name", help="New name, for a single file")
+    import_parser.add_argument(
+        "--replace", action="store_true", help="Replace a saved maze of the same name"
+    )
+    import_parser.set_defaults(run=import_command)
+
+    export = commands.add_parser(
+        "export", help="Write a maze to a .maze, .json or .tiled file"
+    )
+    export.add_argument("maze", help="Saved maze name or .maze file")
+    export.add_argument("output")
+    export.add_argument(
+        "--format",
+        choices=("maze", "json", "tiled"),
+        help="Default from the output's extension",
+    )
+    export.set_defaults(run=export_command)
+    return parser
+
+
+def main(argv=None):
+    """
+    Runs a command
+    @param argv: Arguments to parse, defaults to sys.argv
+    @return: Exit code
+    """
+    args = make_parser().parse_args(argv)
+    if not args.stats:
+        return args.run(args)
+    from src.Maze import instrument
+
+    with instrument.recording() as stats:
+        code = args.run(args)
+    emit({"stats": stats.as_dict()})
+    return code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
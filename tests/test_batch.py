@@ -0,0 +1,63 @@
+import random
+
+from src.Maze import batch, maze
+
+
+def test_solve_batch(tmp_path):
+    """
+    Tests solving a directory of mazes across worker processes, including an
+    unsolvable maze and a file that is not a maze at all
+    """
+    random.seed(0)
+    for number in range(4):
+        test_maze = maze.Maze(f"batch {number}", 12, 0)
+        test_maze.randomize("kruskal")
+        test_maze.save_to_file(filename=str(tmp_path / f"{number}.maze"))
+    blocked = maze.Maze("blocked", 5, 0)
+    blocked.grid[1] = [1, 1, 1, 1, 1]
+    blocked.save_to_file(filename=str(tmp_path / "blocked.maze"))
+    (tmp_path / "broken.maze").write_bytes(b"not a maze")
+
+    results = list(batch.solve_batch([str(tmp_path)], workers=2, chunksize=2))
+    by_file = {result.filename.split("/")[-1]: result for result in results}
+    assert len(results) == 6
+    assert by_file["broken.maze"].error
+    assert not by_file["blocked.maze"].solvable
+    for number in range(4):
+        result = by_file[f"{number}.maze"]
+        assert result.solvable and result.name == f"batch {number}"
+        assert result.path[0] == (0, 0) and result.path[-1] == (11, 11)
+        assert result.length == len(result.path) <= result.expanded + 1
+
+
+def test_generate_batch(tmp_path):
+    """
+    Tests generating mazes across worker processes, checking that names don't
+    collide and that each maze only depends on its own seed
+    """
+    results = list(
+        batch.generate_batch(
+            5, [8, 12], [0, 2], seed=10, workers=2, directory=str(tmp_path)
+        )
+    )
+    assert sorted(result.name for result in results) == [
+        f"Generated {number}" for number in range(1, 6)
+    ]
+    assert len(list(tmp_path.iterdir())) == 5
+    for result in results:
+        loaded = maze.Maze.load_from_file(result.filename)
+        assert loaded.name == result.name and loaded.dim == result.dim
+        assert loaded.route_astar(loaded.start, loaded.end, search_path=True)
+    # A second batch into the same directory carries on after the first
+    more = batch.generate_batch(2, [8], seed=20, workers=1, directory=str(tmp_path))
+    assert sorted(result.name for result in more) == ["Generated 6", "Generated 7"]
+    assert len(list(tmp_path.iterdir())) == 7
+    # Running the same job again gives the same maze
+    first = min(results, key=lambda result: result.seed)
+    again = batch.generate_file(
+        batch.GenerateJob("again", 8, 0, first.seed, "snaking", str(tmp_path))
+    )
+    assert (
+        maze.Maze.load_from_file(again.filename).grid
+        == maze.Maze.load_from_file(first.filename).grid
+    )
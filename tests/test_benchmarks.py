@@ -0,0 +1,53 @@
+import json
+
+from benchmarks import suite
+
+
+def test_compare():
+    """
+    Tests that only cases slower than the threshold fail, and that cases too
+    fast to compare or missing from either side are left out or passed
+    """
+    rows = [
+        {"case": "astar-path", "dim": 10, "seconds": 0.625},
+        {"case": "astar-path", "dim": 20, "seconds": 0.75},
+        {"case": "load", "dim": 10, "seconds": suite.MIN_SECONDS * 10},
+        {"case": "resize", "dim": 10, "seconds": 1.0},
+    ]
+    baseline = {
+        "results": {
+            "astar-path/10": 0.5,
+            "astar-path/20": 0.5,
+            "load/10": suite.MIN_SECONDS / 2,
+            "save/10": 1.0,
+        }
+    }
+    compared = suite.compare(rows, baseline, threshold=0.25)
+    by_key = {(row["case"], row["dim"]): row for row in compared}
+    assert set(by_key) == {("astar-path", 10), ("astar-path", 20), ("load", 10)}
+    # Exactly at the threshold still passes
+    assert by_key["astar-path", 10]["change"] == 0.25
+    assert not by_key["astar-path", 10]["failed"]
+    assert by_key["astar-path", 20]["failed"]
+    assert not by_key["load", 10]["failed"]
+    assert not suite.compare(rows, baseline, threshold=0.5)[1]["failed"]
+
+
+def test_main_exit_code(tmp_path, capsys):
+    """
+    Tests that a run saves a baseline, and exits with 1 only when comparing
+    finds a case slower than the threshold
+    """
+    filename = str(tmp_path / "baseline.json")
+    args = ["--cases", "astar-path", "--dims", "30", "--repeat", "1"]
+    assert suite.main(args + ["--save", filename]) == 0
+    with open(filename, encoding="utf-8") as file:
+        baseline = json.load(file)
+    assert set(baseline["results"]) == {"astar-path/30"}
+    assert baseline["results"]["astar-path/30"] > suite.MIN_SECONDS
+    assert suite.main(args + ["--compare", filename, "--threshold", "100"]) == 0
+    baseline["results"]["astar-path/30"] = suite.MIN_SECONDS
+    with open(filename, "w", encoding="utf-8") as file:
+        json.dump(baseline, file)
+    assert suite.main(args + ["--compare", filename]) == 1
+    assert "SLOWER" in capsys.readouterr().out
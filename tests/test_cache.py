@@ -0,0 +1,39 @@
+import os
+
+from src.Maze import cache, maze
+
+
+def test_maze_cache(tmp_path):
+    """
+    Tests that the cache hands out copies, notices changed files and stays
+    within its size
+    """
+    filenames = []
+    for number in range(3):
+        test_maze = maze.Maze(f"cached {number}", 10, 0)
+        test_maze.randomize("kruskal", seed=number)
+        filenames.append(str(tmp_path / f"{number}.maze"))
+        test_maze.save_to_file(filename=filenames[-1])
+
+    mazes = cache.MazeCache(maze.Maze.load_from_file, max_cells=250)
+    first = mazes.get(filenames[0])
+    again = mazes.get(filenames[0])
+    assert mazes.stats() == {"hits": 1, "misses": 1, "mazes": 1, "cells": 100}
+    assert again.is_unedited()
+
+    # Changing a copy leaves the cached maze alone
+    first.grid[0, 0] = 1
+    assert mazes.get(filenames[0]).grid[0, 0] == 0
+
+    # Only two 10x10 mazes fit, so the least recently used one is dropped
+    mazes.get(filenames[1])
+    mazes.get(filenames[2])
+    assert list(mazes.entries) == filenames[1:]
+
+    # A file changed on disk is loaded again
+    changed = maze.Maze("changed", 10, 0)
+    changed.save_to_file(filename=filenames[1])
+    stat = os.stat(filenames[1])
+    os.utime(filenames[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert mazes.get(filenames[1]).name == "changed"
+    assert mazes.stats()["misses"] == 4
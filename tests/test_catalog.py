@@ -0,0 +1,115 @@
+import os
+import pickle
+import subprocess
+import sys
+
+from src.Maze import catalog, maze
+
+
+def test_catalog_refresh(tmp_path):
+    """
+    Tests that the catalog indexes new, changed, deleted and broken files, and
+    only rereads files which changed
+    """
+    directory = str(tmp_path)
+    for number, (dim, difficulty) in enumerate([(8, 0), (10, 1), (10, 2)]):
+        test_maze = maze.Maze(f"maze {number}", dim, difficulty)
+        test_maze.save_to_file(filename=os.path.join(directory, f"{number}.maze"))
+    legacy = maze.Maze("legacy", 6, 0)
+    (tmp_path / "legacy.maze").write_bytes(pickle.dumps(legacy))
+    (tmp_path / "broken.maze").write_bytes(b"not a maze")
+    (tmp_path / "notes.txt").write_text("not a maze either")
+
+    library = catalog.MazeCatalog(directory)
+    assert library.refresh() == 5
+    assert list(library.names()) == ["legacy", "maze 0", "maze 1", "maze 2"]
+    assert [entry.name for entry in library.query(dim=10)] == ["maze 1", "maze 2"]
+    assert [entry.name for entry in library.query(dim=10, difficulty=2)] == ["maze 2"]
+    assert library.refresh() == 0
+
+    # The catalog persists, and picks up changes since it was last used
+    library.close()
+    os.remove(os.path.join(directory, "0.maze"))
+    renamed = maze.Maze("renamed", 8, 0)
+    renamed.save_to_file(filename=os.path.join(directory, "1.maze"))
+    library = catalog.MazeCatalog(directory)
+    assert library.refresh() == 2
+    assert list(library.names()) == ["legacy", "maze 2", "renamed"]
+    assert len(library) == 3
+    entry = library.query(name="renamed")[0]
+    assert library.query(digest=entry.hash) == [entry]
+    library.close()
+
+
+def test_lazy_library(tmp_path):
+    """
+    Tests that importing the maze module doesn't touch the library, and that the
+    library is loaded the first time it is used
+    """
+    script = (
+        "import os\n"
+        "from src.Maze.maze import MAZE_SAVE_PATH, Maze\n"
+        "assert not os.path.exists(MAZE_SAVE_PATH)\n"
+        "assert Maze.get_saved_mazes() == {}\n"
+        "assert os.path.isdir(MAZE_SAVE_PATH)\n"
+    )
+    env = dict(os.environ, HOME=str(tmp_path))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", script], env=env, cwd=root, check=True)
+
+
+def test_library_only_holds_mazes(tmp_path):
+    """
+    Tests that the library's catalog is kept beside the library folder, so the
+    folder only ever holds .maze files, and that a catalog left in it by an
+    earlier version is removed
+    """
+    library = tmp_path / ".saved_mazes"
+    library.mkdir()
+    (library / "catalog.sqlite3").write_bytes(b"old catalog")
+    script = (
+        "from src.Maze.maze import Maze\n"
+        "Maze('kept', 5, 0).save_to_file()\n"
+        "assert list(Maze.get_saved_mazes()) == ['kept']\n"
+    )
+    env = dict(os.environ, HOME=str(tmp_path))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", script], env=env, cwd=root, check=True)
+    saved = os.listdir(str(library))
+    assert len(saved) == 1 and saved[0].endswith(".maze")
+    assert (tmp_path / ".saved_mazes.catalog.sqlite3").is_file()
+
+
+def test_library_changes(tmp_path, monkeypatch):
+    """
+    Tests that refreshing the saved mazes only reports names that changed, and
+    that polling picks up files written by something else
+    """
+    monkeypatch.setattr(maze.Maze, "catalog", catalog.MazeCatalog(str(tmp_path)))
+    monkeypatch.setattr(maze.Maze, "saved_mazes", {})
+    monkeypatch.setattr(maze.Maze, "saved_mazes_loaded", False)
+    monkeypatch.setattr(maze.Maze, "library_listeners", [])
+    changes = []
+    maze.Maze.library_listeners.append(lambda *change: changes.append(change))
+
+    first = maze.Maze("first", 5, 0)
+    first.save_to_file(filename=str(tmp_path / "first.maze"))
+    first.save_to_file(filename=str(tmp_path / "first.maze"))
+    assert changes == [(["first"], [])]
+    assert maze.Maze.load_saved_mazes() == ([], [])
+
+    # Written by another program, so only the folder knows about it
+    (tmp_path / "second.maze").write_bytes(
+        maze.maze_file.encode(maze.Maze("second", 5, 0))
+    )
+    os.remove(str(tmp_path / "first.maze"))
+    assert next(maze.Maze.watch_saved_mazes()) == (["second"], ["first"])
+    assert changes[-1] == (["second"], ["first"])
+    assert maze.Maze.saved_mazes == {"second": str(tmp_path / "second.maze")}
+
+    # A maze saved outside of the library stays saved through a refresh
+    (tmp_path / "elsewhere").mkdir()
+    elsewhere = str(tmp_path / "elsewhere" / "third.maze")
+    maze.Maze("third", 5, 0).save_to_file(filename=elsewhere)
+    assert maze.Maze.load_saved_mazes() == ([], [])
+    assert maze.Maze.saved_mazes["third"] == elsewhere
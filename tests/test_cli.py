@@ -0,0 +1,208 @@
+import json
+import os
+import subprocess
+import sys
+
+from src import cli
+from src.Maze import export, maze
+
+
+def run(capsys, *argv):
+    """
+    Runs a command and returns its exit code and every line of JSON it printed
+    @param capsys: pytest output capture
+    @param argv: Command line arguments
+    """
+    code = cli.main(list(argv))
+    lines = capsys.readouterr().out.splitlines()
+    return code, [json.loads(line) for line in lines]
+
+
+def test_generate_solve_and_stats(tmp_path, capsys):
+    """
+    Tests generating a maze to a file, then solving and describing it
+    """
+    filename = str(tmp_path / "made.maze")
+    code, results = run(
+        capsys, "generate", "Made", "--dim", "11", "--seed", "5", "--output", filename
+    )
+    assert code == 0 and results[0]["seed"] == 5 and results[0]["filename"] == filename
+    code, results = run(capsys, "solve", filename, "--path")
+    solved = results[0]
+    assert code == 0 and solved["solvable"]
+    assert solved["path"][0] == [0, 0] and solved["path"][-1] == [10, 10]
+    assert solved["length"] == len(solved["path"])
+    code, results = run(capsys, "stats", filename)
+    stats = results[0]
+    assert stats["name"] == "Made" and stats["generator"] == "snaking"
+    assert stats["paths"] + stats["walls"] == 121
+    assert stats["solution_length"] == solved["length"]
+    assert 0 < stats["dead_ends"] < stats["paths"]
+    code, results = run(capsys, "--stats", "solve", filename)
+    assert code == 0
+    assert results[-1]["stats"]["counters"]["solver.expanded"] == solved["expanded"]
+
+
+def test_validate(tmp_path, capsys):
+    """
+    Tests that validate reports unsolvable mazes and unreadable files, and
+    fails if any maze is invalid
+    """
+    blocked = maze.Maze("blocked", 5, 0)
+    blocked.grid[1] = [1, 1, 1, 1, 1]
+    blocked.save_to_file(filename=str(tmp_path / "blocked.maze"))
+    (tmp_path / "broken.maze").write_bytes(b"not a maze")
+    good = maze.Maze("good", 5, 0)
+    good.save_to_file(filename=str(tmp_path / "good.maze"))
+    code, results = run(capsys, "validate", str(tmp_path), "missing")
+    by_name = {os.path.basename(result["filename"]): result for result in results}
+    assert code == 1 and len(results) == 4
+    assert by_name["good.maze"]["valid"]
+    assert by_name["blocked.maze"]["errors"] == [
+        "The end can't be reached from the start"
+    ]
+    assert not by_name["broken.maze"]["valid"]
+    assert not by_name["missing"]["valid"]
+
+
+def test_errors_are_reported(tmp_path, capsys):
+    """
+    Tests that single maze commands reject directories without exactly one
+    maze, and that mazes that can't be solved give an error row, not a crash
+    """
+    (tmp_path / "empty").mkdir()
+    code, results = run(capsys, "render", str(tmp_path / "empty"))
+    assert code == 1 and "found 0" in results[0]["error"]
+    walled = maze.Maze("walled", 5, 0)
+    walled.grid[0, 0] = 1
+    walled.save_to_file(filename=str(tmp_path / "walled.maze"))
+    blocked = maze.Maze("blocked", 5, 0)
+    blocked.grid[1] = [1, 1, 1, 1, 1]
+    blocked.save_to_file(filename=str(tmp_path / "blocked.maze"))
+    output = str(tmp_path / "out.json")
+    code, results = run(capsys, "export", str(tmp_path), output)
+    assert code == 1 and "found 2" in results[0]["error"]
+    code, results = run(capsys, "solve", str(tmp_path))
+    by_name = {result["name"]: result for result in results}
+    assert code == 1 and not by_name["blocked"]["solvable"]
+    assert by_name["walled"]["error"] == "The start [0, 0] is a wall"
+    for filename in ("blocked", "walled"):
+        code, results = run(
+            capsys, "render", str(tmp_path / f"{filename}.maze"), "--solution"
+        )
+        assert code == 1 and results[0]["error"]
+    code, results = run(
+        capsys,
+        "render",
+        str(tmp_path / "blocked.maze"),
+        "--solution",
+        "--solver",
+        "nowhere",
+    )
+    assert code == 1 and "nowhere" in results[0]["error"]
+
+
+def test_bad_dims(capsys):
+    """
+    Tests that dimensions too small for a maze are reported as JSON errors
+    """
+    for dim in ("0", "-3", "1", "ten"):
+        try:
+            cli.main(["generate", "--dim", dim])
+            assert False
+        except SystemExit as e:
+            assert e.code == 1
+        error = json.loads(capsys.readouterr().out)["error"]
+        assert error.startswith("argument --dim")
+
+
+def test_unwritable_output(tmp_path, capsys):
+    """
+    Tests that files which can't be written are reported as JSON errors
+    """
+    filename = str(tmp_path / "out.maze")
+    maze.Maze("Out", 5, 0).save_to_file(filename=filename)
+    missing = str(tmp_path / "missing")
+    for argv in (
+        ["export", filename, missing + "/x.json"],
+        ["export", filename, missing + "/x.tiled"],
+        ["export", filename, missing + "/x.maze"],
+        ["render", filename, "--output", missing + "/x.png"],
+        ["render", filename, "--output", missing + "/x.txt"],
+        ["generate", "--dim", "5", "--output", missing + "/x.maze"],
+    ):
+        code, results = run(capsys, *argv)
+        assert code == 1 and "missing" in results[0]["error"]
+
+
+def test_render_and_export(tmp_path, capsys):
+    """
+    Tests drawing a maze as text and a PNG, and that a JSON export loads back
+    """
+    test_maze = maze.Maze("Shared", 6, 1)
+    test_maze.randomize("kruskal", seed=2)
+    filename = str(tmp_path / "shared.maze")
+    test_maze.save_to_file(filename=filename)
+    assert cli.main(["render", filename, "--solution"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 6 and lines[0][0] == "S" and lines[5][5] == "E"
+    assert "o" in "".join(lines)
+    code, _ = run(capsys, "render", filename, "--output", str(tmp_path / "a.png"))
+    assert code == 0
+    assert (tmp_path / "a.png").read_bytes().startswith(b"\x89PNG")
+    code, results = run(capsys, "export", filename, str(tmp_path / "shared.json"))
+    assert code == 0 and results[0]["format"] == "json"
+    loaded = cli.load_maze(str(tmp_path / "shared.json"))
+    assert loaded.grid == test_maze.grid and loaded.difficulty == 1
+
+
+def test_tiled_mazes(tmp_path, capsys):
+    """
+    Tests that a tiled maze can be drawn and exported, and that the commands
+    needing the whole grid report an error for it
+    """
+    test_maze = maze.Maze("Tiled", 6, 0)
+    test_maze.randomize("prim", seed=3)
+    filename = str(tmp_path / "tiled.maze")
+    test_maze.save_to_file(filename=filename)
+    tiled = str(tmp_path / "tiled.tiled")
+    assert run(capsys, "export", filename, tiled)[0] == 0
+    assert cli.main(["render", tiled]) == 0
+    assert capsys.readouterr().out == export.to_text(test_maze)
+    code, _ = run(capsys, "export", tiled, str(tmp_path / "tiled.json"))
+    assert code == 0
+    assert cli.load_maze(str(tmp_path / "tiled.json")).grid == test_maze.grid
+    for argv in (
+        ["solve", tiled],
+        ["stats", tiled],
+        ["render", tiled, "--solution"],
+        ["export", tiled, str(tmp_path / "again.maze")],
+    ):
+        code, results = run(capsys, *argv)
+        assert code == 1 and "tiled mazes" in results[0]["error"]
+    code, results = run(capsys, "validate", tiled)
+    assert code == 1 and "tiled mazes" in results[0]["errors"][0]
+
+
+def test_cli_without_qt(tmp_path):
+    """
+    Tests that the command line never imports Qt, and that generate and import
+    go to the library in the home folder
+    """
+    script = (
+        "import sys\n"
+        "from src import cli\n"
+        "assert cli.main(['generate', 'Library', '--dim', '7']) == 0\n"
+        "assert cli.main(['export', 'Library', 'out.json']) == 0\n"
+        "assert cli.main(['import', 'out.json', '--name', 'Copy']) == 0\n"
+        "assert cli.main(['import', 'out.json', '--name', 'Copy']) == 1\n"
+        "assert not any(name.startswith('PyQt') for name in sys.modules)\n"
+    )
+    env = dict(os.environ, HOME=str(tmp_path))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = root
+    subprocess.run(
+        [sys.executable, "-c", script], env=env, cwd=str(tmp_path), check=True
+    )
+    saved = os.listdir(str(tmp_path / ".saved_mazes"))
+    assert len([name for name in saved if name.endswith(".maze")]) == 2
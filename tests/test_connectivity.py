@@ -0,0 +1,66 @@
+import random
+
+from src.Maze import maze
+
+
+def test_connectivity():
+    """
+    Tests connected regions as walls are added and removed, and that edits
+    keep the regions up to date without rebuilding them
+    """
+    test_maze = maze.Maze("connectivity", 5, 0)
+    test_maze.grid = [
+        [0, 0, 0, 0, 0],
+        [1, 1, 1, 1, 0],
+        [0, 0, 0, 1, 0],
+        [0, 1, 0, 1, 0],
+        [0, 1, 0, 0, 0],
+    ]
+    test_maze.end = (2, 0)
+    connectivity = test_maze.connectivity()
+    assert test_maze.is_solvable()
+    assert connectivity.region((1, 0)) is None
+    assert connectivity.rebuilds == 1
+
+    # Closing the corridor splits the maze in two
+    test_maze.set_node((3, 4), 1)
+    assert not test_maze.is_solvable()
+    assert connectivity.region((0, 0)) != connectivity.region((2, 0))
+    assert connectivity.region((4, 4)) == connectivity.region((2, 0))
+    # Opening a wall joins the regions on either side without a rebuild
+    test_maze.set_node((1, 0), 0)
+    assert test_maze.is_solvable()
+    # A wall at a dead end can't split anything either
+    test_maze.set_node((4, 0), 1)
+    assert test_maze.is_solvable()
+    assert connectivity.rebuilds == 1
+    # A wall source steps off onto a path next to it, like route_astar
+    assert connectivity.connected((1, 1), (2, 0))
+    assert not connectivity.connected((2, 0), (1, 1))
+
+    # Changing the grid directly is noticed
+    test_maze.grid[1, 0] = 1
+    assert not test_maze.is_solvable()
+    # Copies track their own connectivity
+    copied = test_maze.copy()
+    copied.set_node((3, 4), 0)
+    assert copied.is_solvable()
+    assert not test_maze.is_solvable()
+
+
+def test_connectivity_matches_astar():
+    """
+    Tests connectivity against route_astar through random edits
+    """
+    rng = random.Random(3)
+    for trial in range(30):
+        dim = rng.randint(2, 10)
+        test_maze = maze.Maze("connectivity", dim, 0)
+        test_maze.randomize(seed=trial)
+        for _ in range(40):
+            node = (rng.randrange(dim), rng.randrange(dim))
+            test_maze.set_node(node, rng.choice((0, 1, 2)))
+            src = (rng.randrange(dim), rng.randrange(dim))
+            dest = (rng.randrange(dim), rng.randrange(dim))
+            expected = bool(test_maze.route_astar(src, dest, search_path=True))
+            assert test_maze.connectivity().connected(src, dest) == expected
@@ -0,0 +1,36 @@
+from src.Maze import maze
+
+
+def test_distance_field():
+    """
+    Tests distances and hints, and that only wall changes rebuild the field
+    """
+    test_maze = maze.Maze("distances", 5, 0)
+    test_maze.grid = [
+        [0, 0, 0, 0, 0],
+        [1, 1, 1, 1, 0],
+        [0, 0, 0, 1, 0],
+        [0, 1, 0, 1, 0],
+        [0, 1, 0, 0, 0],
+    ]
+    test_maze.end = (2, 0)
+    field = test_maze.distance_field()
+    assert test_maze.is_solvable()
+    assert field.distance((0, 0)) == 14
+    assert field.distance((4, 0)) == 2
+    # A wall can step off onto the end right next to it
+    assert field.distance((1, 0)) == 1
+    assert field.next_step((0, 0)) == (0, 1)
+    assert field.next_step((2, 1)) == (2, 0)
+    assert field.next_step((2, 0)) is None
+
+    # Marking the player's path doesn't change any distances
+    test_maze.grid[0, 0] = 2
+    assert test_maze.distance_field() is field
+    # Copies share the field until their walls change
+    copied = test_maze.copy()
+    assert copied.distance_field().distances is field.distances
+    copied.grid[2, 4] = 1
+    assert not copied.is_solvable()
+    assert copied.distance_field().next_step((0, 0)) is None
+    assert test_maze.distance_field() is field
@@ -0,0 +1,66 @@
+import random
+
+from src.Maze import maze
+from src.Maze.generators import GENERATORS
+from src.Maze.grid import Grid
+
+
+def test_generators_solvable():
+    """
+    Tests that every generator makes a solvable maze that keeps its start and
+    end, including odd dimensions and a start and end off the default corners
+    """
+    random.seed(0)
+    for name in GENERATORS:
+        for dim, start, end in (
+            (10, (0, 0), (9, 9)),
+            (11, (0, 0), (10, 10)),
+            (9, (1, 0), (8, 3)),
+            (8, (3, 5), (0, 1)),
+            (5, (4, 4), (0, 0)),
+        ):
+            test_maze = maze.Maze("", dim, 1)
+            test_maze.start = start
+            test_maze.end = end
+            test_maze.randomize(name)
+            assert test_maze.start == start and test_maze.end == end
+            assert test_maze.route_astar(start, end, search_path=True), (name, dim)
+
+
+def test_lattice_generators_perfect():
+    """
+    Tests that the lattice generators carve a spanning tree, so every open node
+    is reachable and there are no loops, when the end is on the lattice
+    """
+    random.seed(1)
+    for name in GENERATORS:
+        if name == "snaking":
+            continue
+        test_maze = maze.Maze("", 15, 0)
+        test_maze.randomize(name)
+        open_nodes = [
+            (row, col)
+            for row in range(15)
+            for col in range(15)
+            if test_maze.grid[row, col] == 0
+        ]
+        # A tree on 64 lattice nodes has 63 edges, each one extra open node
+        assert len(open_nodes) == 64 + 63
+        for node in open_nodes:
+            assert test_maze.route_astar((0, 0), node, search_path=True)
+
+
+def test_lattice_grid_bookkeeping():
+    """
+    Tests that a lattice generator leaves its grid with path counts matching
+    its nodes and a version showing it changed, even though carving skips set
+    """
+    for name in GENERATORS:
+        if name == "snaking":
+            continue
+        test_maze = maze.Maze("", 13, 0)
+        test_maze.randomize(name, seed=4)
+        grid = test_maze.grid
+        assert grid.version > 0 and grid.wall_version > 0
+        assert grid.path_counts == Grid(13, cells=grid.cells).path_counts
+        assert test_maze.is_unedited()
@@ -0,0 +1,91 @@
+import pickle
+
+from src.Maze import maze
+from src.Maze.grid import Grid, line_nodes
+
+
+def test_grid_access():
+    """
+    Tests that tuple access, row access and flat access all see the same nodes
+    """
+    grid = Grid(4)
+    grid[1, 2] = 1
+    grid[3][0] = 2
+    assert grid[1][2] == 1
+    assert grid[3, 0] == 2
+    assert grid.get(grid.index(1, 2)) == 1
+    assert bytes(grid.row(3)) == bytes([2, 0, 0, 0])
+    assert grid == [[0, 0, 0, 0], [0, 0, 1, 0], [0, 0, 0, 0], [2, 0, 0, 0]]
+
+
+def test_grid_bounds():
+    """
+    Tests that nodes outside of the grid raise instead of wrapping to another row
+    """
+    grid = Grid(3)
+    for key in ((0, 3), (3, 0), (-1, 0)):
+        try:
+            grid[key]
+            assert False
+        except IndexError:
+            pass
+
+
+def test_grid_is_compact():
+    """
+    Tests that a large grid uses one byte per node
+    """
+    grid = Grid(2000, fill=1)
+    assert len(grid.cells) == 2000 * 2000
+    assert grid.view().nbytes == 2000 * 2000
+
+
+def test_legacy_pickle():
+    """
+    Tests that a maze pickled with a list of lists grid still loads
+    """
+    test_maze = maze.Maze("old", 3, 0)
+    state = dict(test_maze.__dict__)
+    del state["_grid"]
+    state["grid"] = [[0, 1, 0], [0, 1, 0], [0, 0, 0]]
+    loaded = maze.Maze.__new__(maze.Maze)
+    loaded.__setstate__(state)
+    assert isinstance(loaded.grid, Grid)
+    assert loaded.grid[0, 1] == 1
+    assert loaded.route_astar((0, 0), (2, 2), search_path=True)
+    assert pickle.loads(pickle.dumps(loaded)).grid == loaded.grid
+
+
+def test_copy_on_write():
+    """
+    Tests that a copy shares nodes and counts until either grid changes
+    """
+    grid = Grid(4, fill=1)
+    grid[1, 1] = 0
+    counts = grid.path_counts
+    copied = grid.copy()
+    assert copied.cells is grid.cells and copied.path_counts is counts
+    copied[2, 2] = 0
+    assert copied.cells is not grid.cells
+    assert grid[2, 2] == 1 and copied[2, 2] == 0
+    assert grid.path_counts == Grid(4, cells=grid.cells).path_counts
+    assert copied.path_counts == Grid(4, cells=copied.cells).path_counts
+    grid[0, 0] = 0
+    assert copied[0, 0] == 1
+
+
+def test_line_nodes():
+    """
+    Tests that lines between nodes never skip a node or step diagonally
+    """
+    assert line_nodes((2, 2), (2, 2)) == [(2, 2)]
+    assert line_nodes((0, 3), (0, 0)) == [(0, 3), (0, 2), (0, 1), (0, 0)]
+    for end in [(9, 4), (-3, 7), (-6, -6), (1, -8)]:
+        nodes = line_nodes((0, 0), end)
+        assert nodes[0] == (0, 0) and nodes[-1] == end
+        assert len(nodes) == abs(end[0]) + abs(end[1]) + 1
+        for a, b in zip(nodes, nodes[1:]):
+            assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+        # Every node stays within a node of the straight line
+        for row, col in nodes:
+            assert abs(row * end[1] - col * end[0]) <= max(map(abs, end))
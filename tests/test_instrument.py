@@ -0,0 +1,62 @@
+from src.Maze import instrument, maze, solvers
+
+
+def test_nothing_recorded_by_default():
+    """
+    Tests that nothing is recorded outside of recording, and that recording
+    goes back to what was recording before
+    """
+    assert instrument.current is None
+    test_maze = maze.Maze("Quiet", 15, 0)
+    test_maze.randomize(seed=1)
+    with instrument.recording() as outer:
+        with instrument.recording() as inner:
+            test_maze.route_astar(test_maze.start, test_maze.end, search_path=True)
+        assert instrument.current is outer
+    assert instrument.current is None
+    assert outer.as_dict() == {"counters": {}, "peaks": {}, "timers": {}}
+    assert inner.counters["astar.calls"] == 1
+
+
+def test_astar_and_randomize_stats():
+    """
+    Tests the counters of A* against its own state, and that randomizing
+    times every phase of the snaking generator
+    """
+    test_maze = maze.Maze("Counted", 30, 2)
+    stats = instrument.Stats()
+    test_maze.randomize(seed=3, stats=stats)
+    for timer in ("randomize", "randomize.snake", "randomize.branch"):
+        assert stats.timers[timer] > 0
+    assert stats.counters["randomize.calls"] == 1
+    assert stats.counters["randomize.snake_steps"] > 0
+    state = {"nodes": [], "node_from": {}, "g_score": {}, "f_score": {}}
+    stats.reset()
+    assert test_maze.route_astar(
+        test_maze.start, test_maze.end, search_path=True, state=state, stats=stats
+    )
+    counters = stats.counters
+    assert counters["astar.expanded"] == len(state["closed"])
+    assert counters["astar.neighbor_calls"] == counters["astar.expanded"]
+    assert 0 < stats.peaks["astar.heap"] <= counters["astar.pushed"] + 1
+    assert stats.rate("astar.expanded", "astar") > 0
+
+
+def test_solver_stats():
+    """
+    Tests that stepping a solver counts the same nodes as solving it outright
+    """
+    test_maze = maze.Maze("Stepped", 25, 0)
+    test_maze.randomize("prim", seed=4)
+    with instrument.recording() as solved:
+        solution = solvers.solve("bfs", test_maze)
+    stepped = instrument.Stats()
+    state = solvers.start_solver("bfs", test_maze)
+    result = None
+    while result is None:
+        _, result = solvers.advance_solver(test_maze, state, 7, stats=stepped)
+    solvers.advance_solver(test_maze, state, 7, stats=stepped)
+    for stats in (solved, stepped):
+        assert stats.counters["solver.expanded"] == solution.expanded
+        assert stats.counters["solver.calls"] == 1
+        assert stats.peaks["solver.frontier"] == solution.max_frontier
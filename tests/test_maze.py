@@ -1,3 +1,5 @@
+import pickle
+
 from src.Maze import maze
 
 
@@ -84,3 +86,50 @@ def test_randomize():
         test_maze.difficulty += 1
         test_maze.difficulty %= 3
         assert test_maze.route_astar(test_maze.start, test_maze.end, search_path=True)
+
+
+def test_astar_heuristic_and_animate():
+    """
+    Tests that both heuristics find the same route and that stepping through
+    the search one node at a time with shared state reaches the end as well
+    """
+    test_maze = maze.Maze("", 5, 0)
+    test_maze.grid = [
+        [0, 1, 0, 0, 0],
+        [0, 1, 0, 1, 0],
+        [0, 1, 0, 1, 0],
+        [0, 1, 0, 1, 0],
+        [0, 0, 0, 1, 0],
+    ]
+    assert test_maze.route_astar((0, 0), (4, 4), search_path=True)
+    assert test_maze.route_astar(
+        (0, 0), (4, 4), search_path=True, heuristic=maze.manhattan
+    )
+    state = {"nodes": [], "node_from": {}, "g_score": {}, "f_score": {}}
+    steps = 0
+    while not test_maze.route_astar(
+        (0, 0), (4, 4), search_path=True, animate=True, state=state
+    ):
+        steps += 1
+        assert steps < 25
+    # Every node on the only route was expanded and marked as searched
+    assert test_maze.grid[4][4] == 2
+    assert test_maze.grid[0][2] == 2
+    assert state["node_from"][(4, 4)] == (3, 4)
+
+
+def test_pickle_edited_maze(tmp_path):
+    """
+    Tests that a generated maze that was edited keeps its edits through pickle,
+    and can still be saved and pickled again afterwards
+    """
+    test_maze = maze.Maze("Edited", 15, 0)
+    test_maze.randomize("prim", seed=3)
+    test_maze.grid[0, 1] = 1 - (test_maze.grid[0, 1] & 1)
+    copied = pickle.loads(pickle.dumps(test_maze))
+    assert not copied.is_unedited()
+    assert copied.grid == test_maze.grid
+    filename = str(tmp_path / "edited.maze")
+    copied.save_to_file(filename=filename)
+    assert maze.Maze.load_from_file(filename).grid == test_maze.grid
+    assert pickle.loads(pickle.dumps(copied)).grid == test_maze.grid
@@ -0,0 +1,112 @@
+import os
+
+from PyQt6.QtWidgets import QComboBox
+
+from src.GUI.Components.library_watcher import sync_maze_list
+from src.GUI.Components.maze_drawer import MAX_ZOOM, MazeDrawer
+from src.GUI.Components.maze_tiles import TileCache
+from src.Maze.grid import line_nodes
+from src.Maze.maze import Maze
+
+# Nothing here is shown, so it runs without a display, as long as this is set
+# before the QApplication is made
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def make_drawer(qtbot, dim, size=200):
+    """
+    Returns a drawer of a size showing a new maze
+    @param qtbot: pytest-qt fixture
+    @param dim: Maze dimension
+    @param size: Drawer size in pixels, default 200
+    """
+    drawer = MazeDrawer()
+    qtbot.addWidget(drawer)
+    drawer.setFixedSize(size, size)
+    drawer.set_maze(Maze("Drawn", dim, 0))
+    return drawer
+
+
+def test_tile_cache(qapp):
+    """
+    Tests that tiles are reused until a node in them changes, that the least
+    recently used tile is dropped first, and that a new node size starts over
+    """
+    maze = Maze("Tiled", 60, 0)
+    tiles = TileCache(max_tiles=2)
+    assert tiles.tile_nodes(1) == 256
+    assert tiles.tile_nodes(10) == 25
+    assert tiles.tile_nodes(300) == 1
+    # 60 nodes in tiles of 25 leaves 10 nodes in the last tile
+    assert tiles.get(maze, 10, 2, 0).size().width() == 100
+    tiles.get(maze, 10, 0, 0)
+    tiles.get(maze, 10, 2, 0)
+    assert tiles.drawn == 2
+    tiles.get(maze, 10, 0, 1)
+    assert list(tiles.tiles) == [(2, 0), (0, 1)]
+    # A change outside of a tile doesn't draw it again, a change inside does
+    maze.grid[55, 5] = 1
+    tiles.get(maze, 10, 0, 1)
+    assert tiles.drawn == 3
+    tiles.get(maze, 10, 2, 0)
+    assert tiles.drawn == 4
+    tiles.get(maze, 5, 0, 1)
+    assert list(tiles.tiles) == [(0, 1)] and tiles.key == (60, 5)
+
+
+def test_zoom_and_pan(qtbot):
+    """
+    Tests that zooming keeps the point under the mouse in place and stays
+    within its limits, and that the view can't be moved off the maze
+    """
+    drawer = make_drawer(qtbot, 100)
+    assert drawer.grid_dim == drawer.fit_zoom() == 2
+    drawer.move_view(-5, 1000)
+    assert (drawer.offset_x, drawer.offset_y) == (0, 0)
+    node = drawer.node_at(100, 60)
+    drawer.zoom_to(8, 100, 60)
+    assert drawer.grid_dim == 8
+    assert (drawer.offset_x, drawer.offset_y) == (300, 180)
+    assert drawer.node_at(100, 60) == node
+    drawer.move_view(10000, -3)
+    assert (drawer.offset_x, drawer.offset_y) == (600, 0)
+    assert drawer.node_at(199, 0) == (99, 0)
+    drawer.zoom_to(1000, 0, 0)
+    assert drawer.grid_dim == MAX_ZOOM
+    drawer.zoom_to(0, 0, 0)
+    assert drawer.grid_dim == 2
+    assert (drawer.offset_x, drawer.offset_y) == (0, 0)
+
+
+def test_drag_stroke(qtbot):
+    """
+    Tests that a drag fills in the nodes between the places the mouse was seen
+    """
+    drawer = make_drawer(qtbot, 20)
+    grid_dim = drawer.grid_dim
+    drawer.set_grid(2 * grid_dim, 2 * grid_dim, 1)
+    drawer.stroke_pending = [(8, 4), (12, 7)]
+    drawer.apply_stroke()
+    walls = {
+        divmod(index, 20)
+        for index, value in enumerate(drawer.maze.grid.cells)
+        if value == 1
+    }
+    assert walls == set(line_nodes((2, 2), (8, 4)) + line_nodes((8, 4), (12, 7)))
+    assert drawer.stroke_last == (12, 7) and drawer.stroke_pending == []
+
+
+def test_sync_maze_list(qapp):
+    """
+    Tests that changed names keep a maze list sorted and keep its selection
+    """
+    maze_list = QComboBox()
+    maze_list.addItems(["b", "d"])
+    maze_list.setCurrentText("d")
+    sync_maze_list(maze_list, ["c", "a", "d"], ["b", "x"])
+    assert [maze_list.itemText(index) for index in range(maze_list.count())] == [
+        "a",
+        "c",
+        "d",
+    ]
+    assert maze_list.currentText() == "d"
@@ -0,0 +1,63 @@
+import os
+import pickle
+
+from src.Maze import maze, maze_file
+
+
+def test_pack_walls():
+    """
+    Tests that packing and unpacking walls gives back the same nodes for sizes
+    that don't fill the last byte
+    """
+    for size in (1, 7, 8, 9, 25, 1000):
+        cells = bytearray((index * 7 % 3) % 2 for index in range(size))
+        packed = maze_file.pack_walls(cells)
+        assert len(packed) == (size + 7) // 8
+        assert maze_file.unpack_walls(packed, size) == cells
+
+
+def test_save_and_load(tmp_path):
+    """
+    Tests that a saved maze loads back the same, and that its header can be read
+    on its own
+    """
+    test_maze = maze.Maze("Binary ✓", 33, 2)
+    test_maze.randomize("prim", seed=3)
+    test_maze.end = (31, 30)
+    test_maze.grid[test_maze.end] = 0
+    filename = str(tmp_path / "test.maze")
+    test_maze.save_to_file(filename=filename)
+
+    header = maze_file.read_header(filename)
+    assert header.name == "Binary ✓" and header.dim == 33
+    assert header.difficulty == 2 and header.end == (31, 30)
+
+    loaded = maze.Maze.load_from_file(filename)
+    assert loaded.grid == test_maze.grid
+    assert loaded.start == test_maze.start and loaded.end == test_maze.end
+    # 33 * 33 nodes as bits, before compression
+    assert os.path.getsize(filename) < 33 * 33 // 8 + 100
+
+
+def test_legacy_pickle_files(tmp_path):
+    """
+    Tests that pickled maze files still load, but that a pickle which would run
+    code is refused
+    """
+    old_maze = maze.Maze("old", 5, 0)
+    old_maze.grid[2] = [1, 1, 1, 1, 0]
+    filename = tmp_path / "old.maze"
+    filename.write_bytes(pickle.dumps(old_maze))
+    loaded = maze.Maze.load_from_file(str(filename))
+    assert loaded.name == "old" and loaded.grid == old_maze.grid
+
+    class Evil:
+        def __reduce__(self):
+            return (os.system, ("echo unsafe",))
+
+    filename.write_bytes(pickle.dumps(Evil()))
+    try:
+        maze.Maze.load_from_file(str(filename))
+        assert False
+    except pickle.UnpicklingError:
+        pass
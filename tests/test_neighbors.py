@@ -0,0 +1,54 @@
+import random
+
+from src.Maze import maze
+
+
+def expected_neighbors(grid, row, col, path):
+    """
+    Straightforward statement of the get_neighbors rules to test against
+    """
+    dim = len(grid)
+
+    def around(r, c):
+        return [
+            (r + d_r, c + d_c)
+            for d_r, d_c in ((-1, 0), (0, -1), (0, 1), (1, 0))
+            if 0 <= r + d_r < dim and 0 <= c + d_c < dim
+        ]
+
+    if path:
+        return {(r, c) for r, c in around(row, col) if grid[r][c] in (0, 2)}
+    return {
+        (r, c)
+        for r, c in around(row, col)
+        if grid[r][c] == 1
+        and all(
+            grid[n_r][n_c] == 1 or (n_r, n_c) == (row, col) for n_r, n_c in around(r, c)
+        )
+    }
+
+
+def test_neighbors_match_rules():
+    """
+    Tests get_neighbors and get_neighbors_batch on random grids, while nodes
+    keep flipping so that the path counts have to stay up to date
+    """
+    rng = random.Random(5)
+    for _ in range(30):
+        dim = rng.randint(1, 9)
+        test_maze = maze.Maze("", dim, 0)
+        test_maze.grid = [
+            [rng.choice((0, 1, 1, 2)) for _ in range(dim)] for _ in range(dim)
+        ]
+        for _ in range(30):
+            node = (rng.randrange(dim), rng.randrange(dim))
+            test_maze.grid[node] = rng.choice((0, 1, 2))
+            grid = test_maze.grid.to_lists()
+            for path in (True, False):
+                assert test_maze.get_neighbors(node[0], node[1], path) == (
+                    expected_neighbors(grid, node[0], node[1], path)
+                )
+        nodes = [(row, col) for row in range(dim) for col in range(dim)]
+        batch = test_maze.get_neighbors_batch(nodes)
+        for row, col in nodes:
+            assert batch[row, col] == expected_neighbors(grid, row, col, False)
@@ -0,0 +1,38 @@
+import random
+
+from src.Maze import maze
+from src.Maze.reachability import AStarReachability, UnionFindReachability
+
+
+def test_matches_astar():
+    """
+    Tests that the union-find oracle agrees with a non-path A* search on random
+    grids, including after nodes are turned back into walls
+    """
+    rng = random.Random(3)
+    for _ in range(40):
+        test_maze = maze.Maze("", 8, 0)
+        test_maze.grid = [
+            [0 if rng.random() < 0.2 else 1 for _ in range(8)] for _ in range(8)
+        ]
+        oracle = UnionFindReachability(test_maze)
+        for _ in range(20):
+            node = (rng.randrange(8), rng.randrange(8))
+            oracle.set_node(node, rng.choice((0, 1, 1)))
+            src = (rng.randrange(8), rng.randrange(8))
+            dest = (rng.randrange(8), rng.randrange(8))
+            assert oracle.can_reach(src, dest) == test_maze.route_astar(src, dest)
+
+
+def test_same_mazes():
+    """
+    Tests that randomizing gives the same maze with either oracle
+    """
+    for seed in range(10):
+        grids = []
+        for oracle in (AStarReachability, UnionFindReachability):
+            test_maze = maze.Maze("", 15, seed % 3)
+            test_maze.reachability_oracle = oracle
+            test_maze.randomize(seed=seed)
+            grids.append(test_maze.grid)
+        assert grids[0] == grids[1]
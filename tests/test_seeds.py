@@ -0,0 +1,46 @@
+import os
+import pickle
+
+from src.Maze import maze
+
+
+def test_seed_reproducible():
+    """
+    Tests that a seed always makes the same maze, for every generator
+    """
+    for generator in ("snaking", "kruskal", "wilson"):
+        first = maze.Maze("", 15, 2)
+        first.randomize(generator, seed=42)
+        second = maze.Maze("", 15, 2)
+        second.randomize(generator, seed=42)
+        other = maze.Maze("", 15, 2)
+        other.randomize(generator, seed=43)
+        assert first.grid == second.grid
+        assert first.grid != other.grid
+        assert first.recipe.seed == 42 and first.recipe.generator == generator
+
+
+def test_seed_only_storage(tmp_path):
+    """
+    Tests that an unedited generated maze saves just its recipe and is rebuilt
+    on load, while an edited one saves its whole grid
+    """
+    generated = maze.Maze("generated", 60, 1)
+    generated.randomize(seed=7)
+    filename = str(tmp_path / "generated.maze")
+    generated.save_to_file(filename=filename)
+    loaded = maze.Maze.load_from_file(filename)
+    assert loaded.grid == generated.grid
+    assert loaded.is_unedited()
+
+    edited = pickle.loads(pickle.dumps(generated))
+    edited.grid[0, 1] = 1 - edited.grid[0, 1]
+    assert not edited.is_unedited()
+    edited_filename = str(tmp_path / "edited.maze")
+    edited.save_to_file(filename=edited_filename)
+    assert maze.Maze.load_from_file(edited_filename).grid == edited.grid
+    assert os.path.getsize(filename) * 5 < os.path.getsize(edited_filename)
+
+    # Moving the end also counts as an edit
+    generated.end = (0, 59)
+    assert not generated.is_unedited()
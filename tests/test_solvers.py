@@ -0,0 +1,69 @@
+from src.Maze import maze, solvers
+
+
+def check_path(test_maze, path):
+    """
+    Checks that a path goes from start to end through neighboring paths
+    """
+    assert path[0] == test_maze.start and path[-1] == test_maze.end
+    for a, b in zip(path, path[1:]):
+        assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
+        assert test_maze.grid[b] != 1
+
+
+def test_solvers():
+    """
+    Tests that every solver solves generated mazes, agrees with A* and leaves
+    the maze alone
+    """
+    for generator in ("snaking", "backtracker", "kruskal"):
+        test_maze = maze.Maze("solvers", 15, 1)
+        test_maze.randomize(generator, seed=4)
+        before = bytes(test_maze.grid.cells)
+        shortest = len(solvers.solve("bfs", test_maze).path)
+        for name in solvers.SOLVERS:
+            result = solvers.solve(name, test_maze)
+            assert result.found
+            check_path(test_maze, result.path)
+            assert result.expanded > 0 and result.max_frontier > 0
+            # Every solver finds the one path through a perfect maze
+            assert len(result.path) == shortest
+        assert test_maze.grid.cells == before
+
+    blocked = maze.Maze("blocked", 6, 0)
+    blocked.grid[3] = [1] * 6
+    for name in solvers.SOLVERS:
+        result = solvers.solve(name, blocked)
+        assert not result.found and result.path == []
+
+
+def test_step_solver():
+    """
+    Tests stepping through a solver, marking every expanded node as it goes
+    """
+    test_maze = maze.Maze("steps", 10, 0)
+    test_maze.randomize("prim", seed=2)
+    state = solvers.start_solver("bidirectional", test_maze)
+    steps = 0
+    while solvers.step_solver(test_maze, state) is None:
+        steps += 1
+    result = state["result"]
+    assert result.found and result.expanded == steps
+    assert test_maze.grid[test_maze.end] == 2
+    # The end is marked too, unless the search from the end already expanded it
+    assert steps <= sum(value == 2 for value in test_maze.grid.cells) <= steps + 1
+    assert len(state["touched"]) == steps + 1
+
+    # Instant solving replays the same nodes, and advancing runs many at once
+    replayed = maze.Maze("steps", 10, 0)
+    replayed.randomize("prim", seed=2)
+    state = solvers.start_solver("bidirectional", replayed, instant=True)
+    assert solvers.advance_solver(replayed, state, 5) == (5, None)
+    ran, result = solvers.advance_solver(replayed, state, replayed.dim**2)
+    assert ran == steps - 4 and result == state["result"]
+    assert replayed.grid.cells == test_maze.grid.cells
+    try:
+        solvers.get_solver("teleport")
+        assert False
+    except ValueError:
+        pass
@@ -0,0 +1,135 @@
+import random
+
+import pytest
+
+from src.Maze import maze, maze_file, solvers, tiled_grid
+from src.Maze.grid import Grid
+from src.Maze.tiled_grid import TiledGrid
+
+
+def random_maze(dim, seed):
+    """
+    Returns a randomized maze with some paths marked, like a solver leaves them
+    @param dim: Maze dimension
+    @param seed: Seed to randomize with
+    """
+    test_maze = maze.Maze("Tiled", dim, 0)
+    test_maze.randomize("prim", seed=seed)
+    rng = random.Random(seed)
+    for _ in range(dim):
+        index = rng.randrange(dim * dim)
+        if test_maze.grid.get(index) == 0:
+            test_maze.grid.set(index, 2)
+    return test_maze
+
+
+def test_pack_tile():
+    """
+    Tests that packing and unpacking a tile gives back the same nodes
+    """
+    nodes = bytearray(random.Random(1).randrange(4) for _ in range(64))
+    packed = tiled_grid.pack_tile(nodes)
+    assert len(packed) == 16
+    assert tiled_grid.unpack_tile(packed) == nodes
+
+
+def test_tiled_grid_matches_grid(tmp_path):
+    """
+    Tests that a tiled grid with tiles that don't divide the grid reads the
+    same nodes, regions and neighbors as the grid it was made from
+    """
+    grid = random_maze(37, 2).grid
+    tiled = TiledGrid.from_grid(str(tmp_path / "test.tiled"), grid, tile=8)
+    assert tiled.to_grid() == grid
+    assert tiled.region(5, 30, 10, 7) == grid.region(5, 30, 10, 7)
+    assert tiled.sample(10) == grid.sample(10)
+    for index in range(37 * 37):
+        assert tiled.get(index) == tiled.peek(index) == grid.get(index)
+        assert tiled.neighbors(index) == grid.neighbors(index)
+        assert tiled.frontier(index) == grid.frontier(index)
+    tiled.close()
+
+
+def test_tiled_grid_saves_changes(tmp_path):
+    """
+    Tests that changes survive tiles being dropped from the cache and the file
+    being opened again, and that node types have to fit in 2 bits
+    """
+    filename = str(tmp_path / "test.tiled")
+    tiled = TiledGrid.create(filename, 20, fill=1, tile=4, max_tiles=2)
+    tiled.sample(5)
+    changed = {(0, 0): 0, (7, 13): 2, (19, 19): 3, (12, 4): 0}
+    for node, value in changed.items():
+        tiled[node] = value
+    assert tiled.wall_version == 4
+    assert len(tiled.tiles) == 2
+    # The overview was kept up to date by set
+    assert tiled.sample(5)[0] == 0
+    try:
+        tiled[3, 3] = 4
+        assert False
+    except ValueError:
+        pass
+    tiled.close()
+    with TiledGrid(filename, writable=False) as reopened:
+        for row in range(20):
+            for col in range(20):
+                assert reopened[row, col] == changed.get((row, col), 1)
+
+
+def test_tiled_maze_routes(tmp_path):
+    """
+    Tests that a maze opened from a tiled grid finds the same neighbors and
+    routes as the same maze in memory
+    """
+    test_maze = random_maze(25, 4)
+    filename = str(tmp_path / "route.tiled")
+    TiledGrid.from_grid(filename, test_maze.grid, tile=6).close()
+    tiled_maze = maze.Maze.open_tiled(filename, max_tiles=3)
+    assert tiled_maze.name == "route"
+    assert tiled_maze.end == (24, 24)
+    for row in range(25):
+        for col in range(25):
+            for path in (True, False):
+                assert tiled_maze.get_neighbors(
+                    row, col, path=path
+                ) == test_maze.get_neighbors(row, col, path=path)
+    assert tiled_maze.route_astar(
+        (0, 0), (24, 24), search_path=True
+    ) == test_maze.route_astar((0, 0), (24, 24), search_path=True)
+    tiled_maze.grid.close()
+
+
+def test_grid_region_and_sample():
+    """
+    Tests that a region and an overview of a grid pick out the right nodes
+    """
+    grid = Grid(6, cells=range(36))
+    assert grid.region(1, 2, 2, 3) == bytes([8, 9, 10, 14, 15, 16])
+    assert grid.sample(3) == bytes([0, 2, 4, 12, 14, 16, 24, 26, 28])
+    assert grid.sample(1) == bytes([0])
+
+
+def test_tiled_maze_rejects_whole_grid_operations(tmp_path):
+    """
+    Tests that what needs the whole grid in memory raises TypeError on a tiled
+    maze rather than failing part of the way through
+    """
+    filename = str(tmp_path / "whole.tiled")
+    TiledGrid.from_grid(filename, random_maze(12, 5).grid, tile=4).close()
+    tiled_maze = maze.Maze.open_tiled(filename)
+    for operation in (
+        tiled_maze.is_solvable,
+        tiled_maze.connectivity,
+        tiled_maze.distance_field,
+        tiled_maze.copy,
+        tiled_maze.randomize,
+        lambda: tiled_maze.save_to_file(filename=str(tmp_path / "whole.maze")),
+        lambda: maze_file.encode(tiled_maze),
+        lambda: solvers.solve("astar", tiled_maze),
+        lambda: solvers.start_solver("bfs", tiled_maze),
+    ):
+        with pytest.raises(TypeError, match="not supported on tiled mazes"):
+            operation()
+    assert not (tmp_path / "whole.maze").exists()
+    tiled_maze.grid.close()